@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+class TTLCache(Generic[Key, Value]):
+    """
+    :param maxsize:
+        Number of entries kept before the least recently used one is evicted.
+    :param ttl:
+        Seconds an entry stays valid after it was set.
+    :param clock:
+        Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be a positive integer.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+
+        self._data: OrderedDict[Key, tuple[float, Value]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Key) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Key) -> Value | None:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] <= self.clock():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+
+            return entry[1]
+
+    def set(self, key: Key, value: Value) -> None:
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
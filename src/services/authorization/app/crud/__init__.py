@@ -1,4 +1,5 @@
 from .direction import direction  # noqa: F401
 from .permission import permission  # noqa: F401
 from .role import role  # noqa: F401
+from .unit_of_work import unit_of_work  # noqa: F401
 from .user import user  # noqa: F401
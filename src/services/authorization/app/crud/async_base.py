@@ -0,0 +1,93 @@
+from collections.abc import Sequence
+from typing import Any, Generic
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import (
+    NOTIFY_STATEMENT,
+    CreateSchema,
+    Model,
+    Operation,
+    UpdateSchema,
+    WriteEventsMixin,
+)
+
+
+class AsyncCRUDBase(WriteEventsMixin, Generic[Model, CreateSchema, UpdateSchema]):
+    def __init__(self, model: type[Model], *, notify: bool = False) -> None:
+        self.model = model
+        self.notify = notify
+        self.write_listeners = []
+
+    async def get(self, db: AsyncSession, *, id: int | UUID) -> Model | None:
+        result = await db.execute(select(self.model).where(self.model.id == id))
+
+        return result.scalars().first()
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> list[Model]:
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+
+        return result.scalars().all()
+
+    async def get_multi_where_in(
+        self, db: AsyncSession, *, list_: Sequence[Any], column: str = "id"
+    ) -> list[Model]:
+        table = self.model.__table__  # type: ignore
+
+        if column not in table.c:
+            raise ValueError(f"{self.model.__name__} has no column {column!r}.")
+
+        result = await db.execute(select(self.model).where(table.c[column].in_(list_)))
+
+        return result.scalars().all()
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchema) -> Model:
+        obj_in_data = obj_in.dict()
+        db_obj = self.model(**obj_in_data)
+
+        db.add(db_obj)
+        await db.flush()
+        await self._commit(db, Operation.CREATE, [db_obj.id])
+        await db.refresh(db_obj)
+
+        return db_obj
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: Model, obj_in: UpdateSchema
+    ) -> Model:
+        if isinstance(obj_in, dict):
+            updated_data = obj_in
+        else:
+            updated_data = obj_in.dict(exclude_unset=True)
+
+        for field in db_obj.__table__.c.keys():  # type: ignore
+            if field in updated_data:
+                setattr(db_obj, field, updated_data[field])
+
+        db.add(db_obj)
+        await self._commit(db, Operation.UPDATE, [db_obj.id])
+        await db.refresh(db_obj)
+
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int | UUID) -> Model:
+        obj = await db.get(self.model, id)
+
+        await db.delete(obj)
+        await self._commit(db, Operation.REMOVE, [id])
+
+        return obj
+
+    async def _commit(
+        self, db: AsyncSession, operation: Operation, ids: Sequence[int | UUID]
+    ) -> None:
+        if self.notify and ids:
+            await db.execute(NOTIFY_STATEMENT, self._notifications(operation, ids))
+
+        await db.commit()
+
+        self.dispatch_write(operation, ids)
@@ -1,9 +1,39 @@
-from typing import Generic, TypeVar
+import base64
+import binascii
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from itertools import starmap
+from typing import Any, Generic, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Column,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    insert,
+    inspect,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Load, Session, configure_mappers
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.session import make_transient_to_detached
+from sqlalchemy.sql import Select
 
+from app.crud.loading import LoadPlan, load_options
+from app.crud.unit_of_work import current_unit_of_work
 from app.database.base_class import Base
 
 
@@ -11,47 +41,880 @@ Model = TypeVar("Model", bound=Base)
 CreateSchema = TypeVar("CreateSchema", bound=BaseModel)
 UpdateSchema = TypeVar("UpdateSchema", bound=BaseModel)
 
+T = TypeVar("T")
 
-class CRUDBase(Generic[Model, CreateSchema, UpdateSchema]):
-    def __init__(self, model: type[Model]) -> None:
+
+class Operation(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    REMOVE = "remove"
+
+
+WriteListener = Callable[[Operation, Sequence[int | UUID]], None]
+
+WRITES_CHANNEL = "crud_writes"
+# Keeps each NOTIFY payload well under the 8000 byte limit, even with UUID ids.
+NOTIFY_CHUNK_SIZE = 100
+NOTIFY_STATEMENT = text("SELECT pg_notify(:channel, :payload)")
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    if size < 1:
+        raise ValueError("Chunk size must be a positive integer.")
+
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps(values, default=str, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[Column]) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Malformed page cursor.") from exc
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Page cursor does not match the requested ordering.")
+
+    return [
+        column.type.python_type(value)
+        if value is not None and column.type.python_type is UUID
+        else value
+        for column, value in zip(columns, values)
+    ]
+
+
+def copy_text(value: Any) -> str:
+    """Serialize a bound value for COPY in text format."""
+    if value is None:
+        return "\\N"
+
+    if isinstance(value, bool):
+        literal = "t" if value else "f"
+    elif isinstance(value, tuple):
+        literal = record_text(value)
+    else:
+        literal = str(value)
+
+    return (
+        literal.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def record_text(values: Sequence[Any]) -> str:
+    """Serialize the fields of a composite value as a row literal."""
+    fields = []
+
+    for value in values:
+        if value is None:
+            fields.append("")
+        else:
+            literal = str(value).replace("\\", "\\\\").replace('"', '""')
+            fields.append(f'"{literal}"')
+
+    return f"({','.join(fields)})"
+
+
+def projection_fields(into: type) -> list[str]:
+    """Field names of a dataclass or pydantic model, in declaration order."""
+    if is_dataclass(into):
+        return [field.name for field in fields(into)]
+
+    if issubclass(into, BaseModel):
+        return list(into.__fields__)
+
+    raise TypeError(f"Cannot project rows into {into.__name__}.")
+
+
+@dataclass
+class Page(Generic[Model]):
+    items: list[Model]
+    next_cursor: str | None
+
+
+class WriteEventsMixin:
+    model: Any
+    notify: bool
+    write_listeners: list[WriteListener]
+
+    def add_write_listener(self, listener: WriteListener) -> None:
+        self.write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: WriteListener) -> None:
+        self.write_listeners.remove(listener)
+
+    def dispatch_write(self, operation: Operation, ids: Sequence[int | UUID]) -> None:
+        for listener in self.write_listeners:
+            listener(operation, ids)
+
+    def _notifications(
+        self, operation: Operation, ids: Sequence[int | UUID]
+    ) -> list[dict[str, str]]:
+        """
+        Build the parameters of NOTIFY_STATEMENT for a write. Executed in the
+        current transaction, Postgres only delivers them once it commits.
+        """
+        table = self.model.__table__.fullname
+
+        return [
+            {
+                "channel": WRITES_CHANNEL,
+                "payload": json.dumps(
+                    {"table": table, "operation": operation.value, "ids": chunk},
+                    default=str,
+                    separators=(",", ":"),
+                ),
+            }
+            for chunk in chunked(list(ids), NOTIFY_CHUNK_SIZE)
+        ]
+
+
+class CRUDBase(WriteEventsMixin, Generic[Model, CreateSchema, UpdateSchema]):
+    """
+    :param load_plan:
+        How ``get`` and ``get_multi`` load relationships, ``default_load_plan`` if
+        not set. Either method can be given its own plan.
+    :param returning:
+        Write with INSERT, UPDATE and DELETE ... RETURNING: ``create`` and
+        ``update`` read the written row back from their own statement instead of
+        refreshing it, ``update`` only sets the columns whose value changed, and
+        ``remove`` deletes by id without loading the row first.
+    """
+
+    default_load_plan: LoadPlan = {}
+
+    def __init__(
+        self,
+        model: type[Model],
+        *,
+        notify: bool = False,
+        load_plan: LoadPlan | None = None,
+        returning: bool = False,
+    ) -> None:
         self.model = model
+        self.notify = notify
+        self.write_listeners = []
+        self.load_plan = self.default_load_plan if load_plan is None else load_plan
+        self.returning = returning
+
+        self._lookups: dict[str, Select] = {}
+
+    def get(
+        self, db: Session, *, id: int | UUID, load_plan: LoadPlan | None = None
+    ) -> Model | None:
+        return self._get_by(db, "id", id, load_plan)
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        load_plan: LoadPlan | None = None,
+    ) -> list[Model]:
+        return (
+            db.query(self.model)
+            .options(*self._load_options(load_plan))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    def project(
+        self,
+        db: Session,
+        *,
+        into: type[T] | None = None,
+        columns: Sequence[str] | None = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> list[Any]:
+        """
+        Read rows without the ORM: a Core select runs on the connection of ``db``,
+        and the rows are returned as they are or converted ``into`` a dataclass,
+        filled positionally, or a pydantic model, validated from the row mapping.
+        Nothing is tracked by the session, so the results are read-only.
+
+        :param columns:
+            Columns to select, by default the fields of ``into`` or, without it,
+            every column of the table.
+        """
+        table = self.model.__table__  # type: ignore
+
+        if columns is None:
+            columns = table.c.keys() if into is None else projection_fields(into)
 
-    def get(self, db: Session, *, id: int | UUID) -> Model | None:
-        return db.query(self.model).filter(self.model.id == id).first()
+        unknown = [column for column in columns if column not in table.c]
 
-    def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> list[Model]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        if not columns or unknown:
+            raise ValueError(f"{self.model.__name__} has no columns {unknown!r}.")
+
+        query = (
+            select(*(table.c[column] for column in columns))
+            .order_by(*table.primary_key.columns)
+            .offset(skip)
+            .limit(limit)
+        )
+        # Passing the query lets a routing session send it to a replica.
+        result = db.connection(bind_arguments={"clause": query}).execute(query)
+
+        if into is None:
+            return result.all()
+
+        if is_dataclass(into):
+            return list(starmap(into, result))
+
+        return [into.parse_obj(row) for row in result.mappings()]  # type: ignore
+
+    def get_many(
+        self,
+        db: Session,
+        *,
+        ids: Iterable[Any],
+        by: str = "id",
+        chunk_size: int = 10_000,
+        load_plan: LoadPlan | None = None,
+    ) -> dict[Any, Model]:
+        """
+        Load the rows whose unique column ``by`` holds one of ``ids``, keyed by that
+        value in the order of ``ids``. Values without a row are left out.
+        """
+        column = self._unique_column(by, "look up")
+        ids = list(dict.fromkeys(ids))
+        # The values are bound as one array, so the statement is the same, and
+        # cached, whatever the number of values.
+        query = (
+            select(self.model)
+            .options(*self._load_options(load_plan))
+            .where(
+                column == any_(cast(bindparam("ids"), postgresql.ARRAY(column.type)))
+            )
+        )
+        found: dict[Any, Model] = {}
+
+        for chunk in chunked(ids, chunk_size):
+            found.update(
+                (getattr(db_obj, column.key), db_obj)
+                for db_obj in db.execute(query, {"ids": list(chunk)}).unique().scalars()
+            )
+
+        return {id: found[id] for id in ids if id in found}
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        after: str | None = None,
+        limit: int = 100,
+        order_by: str = "id",
+        descending: bool = False,
+    ) -> Page[Model]:
+        if limit < 1:
+            raise ValueError("Page limit must be a positive integer.")
+
+        columns = self._keyset_columns(order_by)
+
+        query = (
+            select(self.model)
+            .order_by(*(column.desc() if descending else column for column in columns))
+            .limit(limit + 1)
+        )
+
+        if after is not None:
+            values = decode_cursor(after, columns)
+
+            if len(columns) == 1:
+                key, value = columns[0], values[0]
+            else:
+                key, value = tuple_(*columns), tuple(values)
+
+            query = query.where(key < value if descending else key > value)
+
+        items = db.execute(query).scalars().all()
+
+        if len(items) <= limit:
+            return Page(items=items, next_cursor=None)
+
+        items = items[:limit]
+        last = items[-1]
+
+        return Page(
+            items=items,
+            next_cursor=encode_cursor(
+                [getattr(last, column.key) for column in columns]
+            ),
+        )
+
+    def iter_all(self, db: Session, *, batch_size: int = 1000) -> Iterator[Model]:
+        table = self.model.__table__  # type: ignore
+
+        result = db.execute(
+            select(self.model)
+            .order_by(*table.primary_key.columns)
+            .execution_options(yield_per=batch_size)
+        )
+
+        yield from result.scalars()
+
+    def iter_columns(
+        self, db: Session, *columns: str, batch_size: int = 1000
+    ) -> Iterator[Row]:
+        table = self.model.__table__  # type: ignore
+
+        unknown = [column for column in columns if column not in table.c]
+
+        if not columns or unknown:
+            raise ValueError(f"{self.model.__name__} has no columns {unknown!r}.")
+
+        result = db.execute(
+            select(*(table.c[column] for column in columns))
+            .order_by(*table.primary_key.columns)
+            .execution_options(yield_per=batch_size)
+        )
+
+        yield from result
 
     def create(self, db: Session, *, obj_in: CreateSchema) -> Model:
+        if self.returning:
+            return self._create_returning(db, obj_in)
+
         obj_in_data = obj_in.dict()
         db_obj = self.model(**obj_in_data)
 
         db.add(db_obj)
-        db.commit()
+        db.flush()
+        self._commit(db, Operation.CREATE, [db_obj.id])
         db.refresh(db_obj)
 
         return db_obj
 
+    def create_multi(
+        self, db: Session, *, objs_in: Sequence[CreateSchema], chunk_size: int = 1000
+    ) -> list[Model]:
+        table = self.model.__table__  # type: ignore
+        rows: list[Row | None] = [None] * len(objs_in)
+
+        for group in self._row_groups(objs_in).values():
+            for chunk in chunked(group, chunk_size):
+                result = db.execute(
+                    insert(table).values([row for _, row in chunk]).returning(*table.c)
+                )
+
+                for (index, _), row in zip(chunk, result):
+                    rows[index] = row
+
+        self._commit(db, Operation.CREATE, [row.id for row in rows])  # type: ignore
+
+        db_objs = self._from_rows(rows)  # type: ignore
+        db.add_all(db_objs)
+
+        return db_objs
+
+    def upsert(self, db: Session, *, obj_in: CreateSchema, on: str) -> Model:
+        return self.upsert_multi(db, objs_in=[obj_in], on=on)[0]
+
+    def upsert_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[CreateSchema],
+        on: str,
+        chunk_size: int = 1000,
+    ) -> list[Model]:
+        """
+        Insert rows, updating the existing row instead when the unique column ``on``
+        already holds the value, with one INSERT ... ON CONFLICT per batch. Rows
+        repeating an ``on`` value resolve to the last of them.
+        """
+        table = self.model.__table__  # type: ignore
+        column = self._unique_column(on)
+        groups = self._row_groups(objs_in)
+
+        # A statement cannot update the same row twice, so only the last row given
+        # for each value is written and the others share its result.
+        values: list[Any] = [None] * len(objs_in)
+        latest: dict[Any, int] = {}
+
+        for group in groups.values():
+            for index, row in group:
+                if on not in row:
+                    raise ValueError(f"Cannot upsert a row without {on!r}.")
+
+                values[index] = row[on]
+                latest[row[on]] = index
+
+        results: dict[int, Row] = {}
+
+        for keys, group in groups.items():
+            group = [(index, row) for index, row in group if latest[row[on]] == index]
+            statement = postgresql.insert(table)
+
+            # Setting the column to itself still returns the conflicting row when
+            # there is nothing else to update.
+            statement = statement.on_conflict_do_update(
+                index_elements=[column],
+                set_={
+                    key: statement.excluded[key]
+                    for key in [key for key in keys if key != on] or [on]
+                },
+            ).returning(*table.c, literal_column("xmax = 0").label("inserted"))
+
+            for chunk in chunked(group, chunk_size):
+                result = db.execute(statement.values([row for _, row in chunk]))
+                results.update(zip((index for index, _ in chunk), result))
+
+        writes = {
+            Operation.CREATE: [row.id for row in results.values() if row.inserted],
+            Operation.UPDATE: [row.id for row in results.values() if not row.inserted],
+        }
+        self._commit_writes(
+            db, {operation: ids for operation, ids in writes.items() if ids}
+        )
+
+        db_objs = dict(zip(results, self._from_rows(list(results.values()), db=db)))
+        db.add_all(db_objs.values())
+
+        return [db_objs[latest[value]] for value in values]
+
+    def copy_insert(
+        self, db: Session, *, rows: Sequence[Mapping[str, Any]], on: str
+    ) -> list[Any]:
+        """
+        Insert table rows with COPY FROM STDIN, skipping rows whose unique column
+        ``on`` holds a value already stored or repeated earlier in ``rows``. Rows
+        are copied into a temporary table first, so a conflict skips one row
+        instead of failing the COPY, and the primary keys of the rows inserted are
+        returned. Needs psycopg2.
+        """
+        table = self.model.__table__  # type: ignore
+        column = self._unique_column(on, "copy")
+        primary_key = table.primary_key.columns.values()[0]
+
+        if not rows:
+            return []
+
+        keys = [key for key in table.c.keys() if key in rows[0]]
+        dialect = db.get_bind().dialect
+        preparer = dialect.identifier_preparer
+        processors = [
+            table.c[key].type.dialect_impl(dialect).bind_processor(dialect)
+            for key in keys
+        ]
+
+        target = preparer.format_table(table)
+        staging = preparer.quote(f"copy_{table.name}")
+        columns = ", ".join(preparer.quote(table.c[key].name) for key in keys)
+
+        buffer = io.StringIO()
+
+        for row in rows:
+            values = [row[key] for key in keys]
+            buffer.write(
+                "\t".join(
+                    copy_text(value if process is None else process(value))
+                    for process, value in zip(processors, values)
+                )
+            )
+            buffer.write("\n")
+
+        buffer.seek(0)
+
+        connection = db.connection()
+        connection.exec_driver_sql(f"CREATE TEMPORARY TABLE {staging} (LIKE {target})")
+
+        statement = f"COPY {staging} ({columns}) FROM STDIN"
+
+        # The COPY runs on the driver cursor, so its errors are wrapped here as
+        # they are for statements executed through the connection.
+        try:
+            with connection.connection.cursor() as cursor:
+                cursor.copy_expert(statement, buffer)
+        except dialect.dbapi.Error as exc:
+            raise DBAPIError.instance(
+                statement, None, exc, dialect.dbapi.Error, dialect=dialect
+            ) from exc
+
+        ids = (
+            connection.exec_driver_sql(
+                f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging} "
+                f"ON CONFLICT ({preparer.quote(column.name)}) DO NOTHING "
+                f"RETURNING {preparer.quote(primary_key.name)}"
+            )
+            .scalars()
+            .all()
+        )
+        # Dropped right away, so it never outlives the types its columns use.
+        connection.exec_driver_sql(f"DROP TABLE {staging}")
+
+        if ids:
+            self._commit(db, Operation.CREATE, ids)
+
+        return ids
+
     def update(self, db: Session, *, db_obj: Model, obj_in: UpdateSchema) -> Model:
         if isinstance(obj_in, dict):
             updated_data = obj_in
         else:
             updated_data = obj_in.dict(exclude_unset=True)
 
+        if self.returning:
+            return self._update_returning(db, db_obj, updated_data)
+
         for field in db_obj.__table__.c.keys():  # type: ignore
             if field in updated_data:
                 setattr(db_obj, field, updated_data[field])
 
         db.add(db_obj)
-        db.commit()
+        self._commit(db, Operation.UPDATE, [db_obj.id])
         db.refresh(db_obj)
 
         return db_obj
 
-    def remove(self, db: Session, *, id: int | UUID) -> Model:
+    def update_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Mapping[int | UUID, UpdateSchema | dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> list[Model]:
+        columns = self.model.__table__.c.keys()  # type: ignore
+        mappings = []
+
+        for id, obj_in in objs_in.items():
+            if isinstance(obj_in, dict):
+                updated_data = obj_in
+            else:
+                updated_data = obj_in.dict(exclude_unset=True)
+
+            mapping = {
+                field: updated_data[field] for field in columns if field in updated_data
+            }
+            mapping["id"] = id
+            mappings.append(mapping)
+
+        ids: list[int | UUID] = []
+
+        for chunk in chunked(mappings, chunk_size):
+            # Unknown ids are skipped, as in remove_multi: bulk_update_mappings would
+            # fail on them with the earlier chunks written. The rows found are locked
+            # so they cannot be removed before the update.
+            found = set(
+                db.execute(
+                    select(self.model.id)
+                    .where(self.model.id.in_([mapping["id"] for mapping in chunk]))
+                    .with_for_update()
+                ).scalars()
+            )
+            chunk = [mapping for mapping in chunk if mapping["id"] in found]
+
+            if chunk:
+                db.bulk_update_mappings(self.model, chunk)
+                ids.extend(mapping["id"] for mapping in chunk)
+
+        if ids:
+            self._commit(db, Operation.UPDATE, ids)
+
+        db_objs: dict[int | UUID, Model] = {}
+
+        for chunk_ids in chunked(ids, chunk_size):
+            db_objs.update(
+                (db_obj.id, db_obj)
+                for db_obj in db.execute(
+                    select(self.model)
+                    .where(self.model.id.in_(chunk_ids))
+                    .execution_options(populate_existing=True)
+                ).scalars()
+            )
+
+        return [db_objs[id] for id in ids if id in db_objs]
+
+    def remove(self, db: Session, *, id: int | UUID) -> Model | None:
+        if self.returning:
+            db_objs = self.remove_multi(db, ids=[id])
+
+            return db_objs[0] if db_objs else None
+
         obj = db.query(self.model).get(id)
 
+        if obj is None:
+            return None
+
         db.delete(obj)
-        db.commit()
+        self._commit(db, Operation.REMOVE, [id])
 
         return obj
+
+    def remove_multi(
+        self, db: Session, *, ids: Sequence[int | UUID], chunk_size: int = 1000
+    ) -> list[Model]:
+        table = self.model.__table__  # type: ignore
+        rows: list[Row] = []
+
+        for chunk_ids in chunked(ids, chunk_size):
+            rows.extend(
+                db.execute(
+                    delete(self.model)
+                    .where(self.model.id.in_(chunk_ids))
+                    .returning(*table.c)
+                )
+            )
+
+        self._commit(db, Operation.REMOVE, [row.id for row in rows])
+
+        return self._from_rows(rows)
+
+    def _create_returning(self, db: Session, obj_in: CreateSchema) -> Model:
+        table = self.model.__table__  # type: ignore
+        ((_, values),) = next(iter(self._row_groups([obj_in]).values()))
+
+        row = db.execute(insert(table).values(values).returning(*table.c)).one()
+        self._commit(db, Operation.CREATE, [row.id])
+
+        # Added after the commit, which would expire the values just read.
+        (db_obj,) = self._from_rows([row], db=db)
+        db.add(db_obj)
+
+        return db_obj
+
+    def _update_returning(
+        self, db: Session, db_obj: Model, updated_data: Mapping[str, Any]
+    ) -> Model:
+        table = self.model.__table__  # type: ignore
+        state = inspect(db_obj)
+        changes = {}
+
+        # Compared with the committed values: an attribute set on the instance
+        # but not flushed yet is written as well, or it would never be.
+        for field in table.c.keys():
+            history = state.attrs[field].history
+            pending = bool(history.added or history.deleted)
+
+            if field in updated_data:
+                value = updated_data[field]
+
+                if pending or not history.unchanged or history.unchanged[0] != value:
+                    changes[field] = value
+            elif pending and history.added:
+                changes[field] = history.added[0]
+
+        if not changes:
+            return db_obj
+
+        row = db.execute(
+            update(table)
+            .where(table.c.id == db_obj.id)  # type: ignore
+            .values(changes)
+            .returning(*table.c)
+        ).one()
+        self._commit(db, Operation.UPDATE, [db_obj.id])  # type: ignore
+        self._set_committed(db_obj, row)
+
+        return db_obj
+
+    def _commit(
+        self, db: Session, operation: Operation, ids: Sequence[int | UUID]
+    ) -> None:
+        self._commit_writes(db, {operation: ids})
+
+    def _commit_writes(
+        self, db: Session, writes: Mapping[Operation, Sequence[int | UUID]]
+    ) -> None:
+        if self.notify:
+            notifications = [
+                notification
+                for operation, ids in writes.items()
+                for notification in self._notifications(operation, ids)
+            ]
+
+            if notifications:
+                db.execute(NOTIFY_STATEMENT, notifications)
+
+        uow = current_unit_of_work(db)
+
+        # Inside a unit of work, the commit and the listeners wait for its end.
+        if uow is not None:
+            db.flush()
+            uow.record(self, writes)
+            return
+
+        db.commit()
+
+        for operation, ids in writes.items():
+            self.dispatch_write(operation, ids)
+
+    def _get_by(
+        self,
+        db: Session,
+        column: str,
+        value: Any,
+        load_plan: LoadPlan | None = None,
+    ) -> Model | None:
+        """Load the row whose unique ``column`` holds ``value``."""
+        return (
+            db.execute(self._lookup(column, load_plan), {column: value})
+            .unique()
+            .scalars()
+            .first()
+        )
+
+    def _lookup(self, column: str, load_plan: LoadPlan | None = None) -> Select:
+        """
+        Select the model by ``column``, with the value as a bound parameter named
+        after it. With the default load plan the statement is built once per column
+        and reused, so a lookup neither builds a query nor computes its cache key
+        again.
+        """
+        if load_plan is not None:
+            return self._lookup_statement(column, load_plan)
+
+        statement = self._lookups.get(column)
+
+        if statement is None:
+            statement = self._lookup_statement(column, self.load_plan)
+            self._lookups[column] = statement
+
+        return statement
+
+    def _lookup_statement(self, column: str, load_plan: LoadPlan) -> Select:
+        table = self.model.__table__  # type: ignore
+
+        return (
+            select(self.model)
+            .options(*load_options(self.model, load_plan))
+            .where(table.c[column] == bindparam(column))
+        )
+
+    def _load_options(self, load_plan: LoadPlan | None) -> list[Load]:
+        return load_options(
+            self.model, self.load_plan if load_plan is None else load_plan
+        )
+
+    def _row_groups(
+        self, objs_in: Sequence[BaseModel]
+    ) -> dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]]:
+        """
+        Turn schemas into table rows, grouped by the keys they provide. A multi-row
+        VALUES clause takes its column list from the first row, so each group needs
+        its own statement.
+        """
+        table = self.model.__table__  # type: ignore
+        primary_keys = {column.key for column in table.primary_key}
+        groups: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+
+        for index, obj_in in enumerate(objs_in):
+            row = {
+                key: value
+                for key, value in obj_in.dict().items()
+                if key in table.c and not (value is None and key in primary_keys)
+            }
+            groups.setdefault(tuple(row), []).append((index, row))
+
+        return groups
+
+    def _unique_column(self, name: str, action: str = "upsert") -> Column:
+        table = self.model.__table__  # type: ignore
+
+        if name not in table.c:
+            raise ValueError(f"{self.model.__name__} has no column {name!r}.")
+
+        column = table.c[name]
+
+        if not (column.primary_key or column.unique):
+            raise ValueError(
+                f"Cannot {action} {self.model.__name__} on {name!r}: "
+                "the column is not unique."
+            )
+
+        return column
+
+    def _keyset_columns(self, order_by: str) -> list[Column]:
+        """
+        Resolve the columns a page is seeked on. Unique columns are enough on their
+        own; other indexed columns get the primary key appended as a tie-breaker.
+        Nullable columns are refused, as rows holding NULL never compare greater
+        than a cursor and would be left out of every page after the first.
+        """
+        table = self.model.__table__  # type: ignore
+
+        if order_by not in table.c:
+            raise ValueError(f"{self.model.__name__} has no column {order_by!r}.")
+
+        column = table.c[order_by]
+
+        if column.nullable:
+            raise ValueError(
+                f"Cannot paginate {self.model.__name__} by {order_by!r}: "
+                "the column is nullable."
+            )
+
+        if column.primary_key or column.unique:
+            return [column]
+
+        indexed = column.index or any(
+            index.columns.values()[0] is column for index in table.indexes
+        )
+
+        if not indexed:
+            raise ValueError(
+                f"Cannot paginate {self.model.__name__} by {order_by!r}: "
+                "the column is not indexed."
+            )
+
+        return [column, *table.primary_key.columns]
+
+    def _from_rows(self, rows: Sequence[Row], db: Session | None = None) -> list[Model]:
+        """
+        Build detached instances from full table rows, as if they had just been
+        loaded, so no refresh is needed to read them back. Instances already in the
+        identity map of ``db`` are refreshed from the rows instead.
+        """
+        configure_mappers()
+
+        mapper = self.model.__mapper__  # type: ignore
+        keys = self._column_keys()
+        db_objs = []
+
+        for row in rows:
+            db_obj: Any = None
+
+            if db is not None:
+                identity_key = mapper.identity_key_from_primary_key(
+                    [row._mapping[column] for column in mapper.primary_key]
+                )
+                db_obj = db.identity_map.get(identity_key)
+
+            loaded = db_obj is not None
+
+            if not loaded:
+                db_obj = mapper.class_manager.new_instance()
+
+            self._set_committed(db_obj, row, keys)
+
+            if not loaded:
+                make_transient_to_detached(db_obj)
+
+            db_objs.append(db_obj)
+
+        return db_objs
+
+    def _column_keys(self) -> list[str]:
+        """Attribute names of the table columns, in table order."""
+        mapper = self.model.__mapper__  # type: ignore
+        table = self.model.__table__  # type: ignore
+
+        return [mapper.get_property_by_column(column).key for column in table.c]
+
+    def _set_committed(
+        self, db_obj: Model, row: Row, keys: Sequence[str] | None = None
+    ) -> None:
+        """Set the columns of ``db_obj`` to a full table row, as if just loaded."""
+        for key, value in zip(keys or self._column_keys(), row):
+            set_committed_value(db_obj, key, value)
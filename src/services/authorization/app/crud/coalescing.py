@@ -0,0 +1,171 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.base import Model, chunked
+
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+class SingleFlight(Generic[Key, Value]):
+    """
+    Merges concurrent calls for the same key: the first caller runs the call and
+    every caller arriving while it is in flight awaits the same result.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Key, asyncio.Future[Value]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Key, call: Callable[[], Awaitable[Value]]) -> Value:
+        future = self._calls.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # A cancelled caller must not cancel the call the others are waiting on.
+        return await asyncio.shield(future)
+
+
+class BatchLoader(Generic[Key, Value]):
+    """
+    Collects the keys loaded within one tick of the event loop and loads them with
+    a single call of ``batch``, which returns the values found by key. Keys already
+    waiting for the next batch or being loaded by a running one share its result.
+
+    :param max_batch_size:
+        Keys passed to one call of ``batch``; larger batches are split.
+    """
+
+    def __init__(
+        self,
+        batch: Callable[[list[Key]], Awaitable[Mapping[Key, Value]]],
+        *,
+        max_batch_size: int = 1000,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self.batch = batch
+        self.max_batch_size = max_batch_size
+
+        self._pending: dict[Key, asyncio.Future[Value | None]] = {}
+        self._loading: dict[Key, asyncio.Future[Value | None]] = {}
+        self._scheduled = False
+
+    async def load(self, key: Key) -> Value | None:
+        future = self._pending.get(key) or self._loading.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Key]) -> list[Value | None]:
+        return await asyncio.gather(*(self.load(key) for key in keys))
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        self._loading.update(pending)
+
+        for keys in chunked(list(pending), self.max_batch_size):
+            asyncio.ensure_future(self._load({key: pending[key] for key in keys}))
+
+    async def _load(self, futures: dict[Key, asyncio.Future[Value | None]]) -> None:
+        try:
+            values = await self.batch(list(futures))
+        except Exception as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for key, future in futures.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        finally:
+            for key, future in futures.items():
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+
+
+class CoalescingReader(Generic[Model]):
+    """
+    Lookups of ``crud`` shared by concurrent requests. Identical lookups in flight
+    run once, and ``get`` calls made within one tick are answered by a single
+    ``WHERE id IN (...)`` query. Queries run on sessions of their own, so the
+    instances returned are detached and shared by every caller: treat them as
+    read-only.
+
+    :param session_factory:
+        Creates the sessions the queries run on, ``expire_on_commit`` disabled.
+    :param batch:
+        Batch ``get`` calls; when disabled identical ones are still merged.
+    """
+
+    def __init__(
+        self,
+        crud: AsyncCRUDBase[Model, Any, Any],
+        session_factory: Callable[[], AsyncSession],
+        *,
+        batch: bool = True,
+        max_batch_size: int = 1000,
+    ) -> None:
+        self.crud = crud
+        self.session_factory = session_factory
+
+        self.loader: BatchLoader[int | UUID, Model] | None = None
+
+        if batch:
+            self.loader = BatchLoader(self._get_batch, max_batch_size=max_batch_size)
+
+        self._gets: SingleFlight[int | UUID, Model | None] = SingleFlight()
+        self._wheres: SingleFlight[tuple[str, frozenset], list[Model]] = SingleFlight()
+
+    async def get(self, id: int | UUID) -> Model | None:
+        if self.loader is not None:
+            return await self.loader.load(id)
+
+        return await self._gets.do(id, lambda: self._get(id))
+
+    async def get_multi_where_in(
+        self, values: Iterable[Any], *, column: str = "id"
+    ) -> list[Model]:
+        values = frozenset(values)
+
+        return await self._wheres.do(
+            (column, values), lambda: self._get_multi_where_in(values, column)
+        )
+
+    async def _get(self, id: int | UUID) -> Model | None:
+        async with self.session_factory() as db:
+            return await self.crud.get(db, id=id)
+
+    async def _get_batch(self, ids: list[int | UUID]) -> dict[int | UUID, Model]:
+        db_objs = await self._get_multi_where_in(ids, "id")
+
+        return {db_obj.id: db_obj for db_obj in db_objs}
+
+    async def _get_multi_where_in(
+        self, values: Iterable[Any], column: str
+    ) -> list[Model]:
+        async with self.session_factory() as db:
+            return await self.crud.get_multi_where_in(
+                db, list_=list(values), column=column
+            )
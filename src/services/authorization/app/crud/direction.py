@@ -19,4 +19,4 @@ class CRUDDirection(CRUDBase[Direction, DirectionCreate, DirectionUpdate]):
     ...
 
 
-direction = CRUDDirection(Direction)
+direction = CRUDDirection(Direction, returning=True)
@@ -0,0 +1,56 @@
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Load
+
+
+# Relationship paths, dotted for nested relationships, mapped to a loading strategy,
+# e.g. {"role": "joined", "role.role_permission_associations": "selectin"}.
+LoadPlan = Mapping[str, str]
+
+STRATEGIES = {
+    "joined": "joinedload",
+    "selectin": "selectinload",
+    "select": "lazyload",
+    "raise": "raiseload",
+}
+
+
+def load_options(model: Any, plan: LoadPlan) -> list[Load]:
+    """
+    Turn a load plan into loader options for ``model``. Intermediate relationships
+    of a nested path keep their own strategy, so list them in the plan as well to
+    load them eagerly.
+    """
+    options = []
+
+    for path, strategy in plan.items():
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown loading strategy {strategy!r}, expected one of "
+                f"{list(STRATEGIES)}."
+            )
+
+        mapper = inspect(model)
+        option = Load(model)
+        keys = path.split(".")
+
+        for depth, key in enumerate(keys, 1):
+            if key not in mapper.relationships:
+                raise ValueError(
+                    f"{mapper.class_.__name__} has no relationship {key!r}."
+                )
+
+            attribute = getattr(mapper.class_, key)
+
+            if depth == len(keys):
+                option = getattr(option, STRATEGIES[strategy])(attribute)
+            else:
+                option = option.defaultload(attribute)
+
+            mapper = mapper.relationships[key].mapper
+
+        options.append(option)
+
+    return options
@@ -0,0 +1,150 @@
+import json
+import logging
+import select
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+from uuid import UUID
+
+from app.crud.base import WRITES_CHANNEL, CRUDBase, Operation
+from app.database.connection import listen_connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationListener:
+    """
+    Receive the write notifications published by CRUDs created with
+    ``notify=True`` and replay them through the write listeners of the matching
+    local CRUD, so caches in this process see writes made by other workers.
+
+    :param cruds:
+        CRUDs whose tables are followed.
+    :param connect:
+        Returns a dedicated DBAPI connection in autocommit mode.
+    :param reconnect_delay:
+        Seconds to wait before reconnecting after the connection is lost.
+    """
+
+    def __init__(
+        self,
+        cruds: Iterable[CRUDBase],
+        *,
+        channel: str = WRITES_CHANNEL,
+        connect: Callable[[], Any] = listen_connection,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self.cruds = {crud.model.__table__.fullname: crud for crud in cruds}
+        self.channel = channel
+        self.connect = connect
+        self.reconnect_delay = reconnect_delay
+
+        self.reset_listeners: list[Callable[[], None]] = []
+
+        self._connection: Any = None
+        self._listened = False
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_reset_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback run whenever notifications may have been missed,
+        i.e. on every reconnect after the first connection.
+        """
+        self.reset_listeners.append(listener)
+
+    def listen(self) -> Any:
+        self.close()
+
+        self._connection = self.connect()
+        self._connection.cursor().execute(f'LISTEN "{self.channel}"')
+
+        if self._listened:
+            for listener in self.reset_listeners:
+                listener()
+
+        self._listened = True
+
+        return self._connection
+
+    def poll(self, timeout: float = 1.0) -> int:
+        """
+        Wait up to ``timeout`` seconds for notifications and dispatch them.
+        Return the number of notifications handled.
+        """
+        connection = self._connection
+
+        if connection is None:
+            connection = self.listen()
+
+        if select.select([connection], [], [], timeout) == ([], [], []):
+            return 0
+
+        connection.poll()
+
+        count = 0
+
+        while connection.notifies:
+            notify = connection.notifies.pop(0)
+
+            if notify.channel == self.channel:
+                self.dispatch(notify.payload)
+                count += 1
+
+        return count
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            crud = self.cruds.get(data["table"])
+            operation = Operation(data["operation"])
+            ids = data["ids"]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed write notification: %r", payload)
+            return
+
+        if crud is None:
+            return
+
+        primary_key = next(iter(crud.model.__table__.primary_key.columns))
+
+        if primary_key.type.python_type is UUID:
+            ids = [UUID(id) for id in ids]
+
+        crud.dispatch_write(operation, ids)
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="notification-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        self.close()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+
+            self._connection = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll(timeout=0.5)
+            except Exception:
+                logger.exception("Write notification listener lost its connection.")
+
+                self.close()
+                self._stopped.wait(self.reconnect_delay)
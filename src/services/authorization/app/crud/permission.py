@@ -17,8 +17,11 @@ class PermissionUpdate(BaseModel):
 
 
 class CRUDPermission(CRUDBase[Permission, PermissionCreate, PermissionUpdate]):
+    def get_by_name(self, db: Session, *, name: str) -> Permission | None:
+        return self._get_by(db, "name", name)
+
     def get_multi_where_in(self, db: Session, *, list_: list[str]) -> list[Permission]:
-        return db.query(self.model).where(self.model.name.in_(list_)).all()
+        return list(self.get_many(db, ids=list_, by="name").values())
 
 
-permission = CRUDPermission(Permission)
+permission = CRUDPermission(Permission, notify=True, returning=True)
@@ -1,7 +1,13 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
 from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, select, true
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, Operation
 from app.models.permission import Permission
 from app.models.role import Role
 
@@ -23,6 +29,14 @@ class RoleUpdate(BaseModel):
 
 
 class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
+    default_load_plan = {
+        "role_permission_associations": "selectin",
+        "role_permission_associations.permission": "joined",
+    }
+
+    # Built on first use, once the association model is mapped.
+    _permission_names: Select | None = None
+
     def create(self, db: Session, *, obj_in: RoleCreate) -> Role:
         if obj_in.permissions is None:
             del obj_in.permissions
@@ -31,10 +45,128 @@ class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
         db_obj = self.model(**obj_in_data)
 
         db.add(db_obj)
-        db.commit()
+        db.flush()
+        self._commit(db, Operation.CREATE, [db_obj.id])
         db.refresh(db_obj)
 
         return db_obj
 
+    def get_by_name(self, db: Session, *, name: str) -> Role | None:
+        return self._get_by(db, "name", name)
+
+    def get_permission_names(self, db: Session, *, id: int) -> frozenset[str]:
+        if self._permission_names is None:
+            association, permission = self._association_models()
+            self._permission_names = (
+                select(permission.name)
+                .join_from(association, association.permission)
+                .where(association.role_id == bindparam("id"))
+            )
+
+        return frozenset(db.execute(self._permission_names, {"id": id}).scalars())
+
+    def grant(
+        self, db: Session, *, ids: Sequence[int], permission_names: Iterable[str]
+    ) -> int:
+        """
+        Grant the named permissions to every role in ``ids`` with a single
+        INSERT ... SELECT, skipping pairs that already exist. Return the number of
+        rows added.
+        """
+        permission_ids = self._permission_ids(db, permission_names)
+
+        added = self._insert_pairs(db, ids, permission_ids)
+        self._commit(db, Operation.UPDATE, ids)
+
+        return added
+
+    def revoke(
+        self, db: Session, *, ids: Sequence[int], permission_names: Iterable[str]
+    ) -> int:
+        """
+        Revoke the named permissions from every role in ``ids`` with a single
+        DELETE. Return the number of rows removed.
+        """
+        association, permission = self._association_models()
+        table = association.__table__
+
+        removed = db.execute(
+            delete(table).where(
+                table.c.role_id.in_(ids),
+                table.c.permission_id.in_(
+                    select(permission.id).where(
+                        permission.name.in_(list(permission_names))
+                    )
+                ),
+            )
+        ).rowcount
+        self._commit(db, Operation.UPDATE, ids)
+
+        return removed
+
+    def sync_permissions(
+        self, db: Session, *, ids: Sequence[int], permission_names: Iterable[str]
+    ) -> tuple[int, int]:
+        """
+        Make the named permissions the exact permission set of every role in
+        ``ids``. Return the number of rows added and removed.
+        """
+        association, _ = self._association_models()
+        table = association.__table__
+        permission_ids = self._permission_ids(db, permission_names)
+
+        removed = db.execute(
+            delete(table).where(
+                table.c.role_id.in_(ids),
+                table.c.permission_id.not_in(permission_ids),
+            )
+        ).rowcount
+        added = self._insert_pairs(db, ids, permission_ids)
+        self._commit(db, Operation.UPDATE, ids)
+
+        return added, removed
+
+    def _association_models(self) -> tuple[Any, Any]:
+        association = self.model.role_permission_associations.property.mapper.class_
+        permission = association.permission.property.mapper.class_
+
+        return association, permission
+
+    def _permission_ids(self, db: Session, names: Iterable[str]) -> list[int]:
+        _, permission = self._association_models()
+        wanted = set(names)
+
+        permission_ids = dict(
+            db.execute(
+                select(permission.name, permission.id).where(
+                    permission.name.in_(list(wanted))
+                )
+            ).all()
+        )
+        unknown = wanted - permission_ids.keys()
+
+        if unknown:
+            raise ValueError(f"Unknown permissions {sorted(unknown)!r}.")
+
+        return list(permission_ids.values())
+
+    def _insert_pairs(
+        self, db: Session, ids: Sequence[int], permission_ids: Sequence[int]
+    ) -> int:
+        association, permission = self._association_models()
+        table = association.__table__
+
+        pairs = (
+            select(self.model.id, permission.id)
+            .join(permission, true())
+            .where(self.model.id.in_(ids), permission.id.in_(permission_ids))
+        )
+
+        return db.execute(
+            postgresql.insert(table)
+            .from_select([table.c.role_id, table.c.permission_id], pairs)
+            .on_conflict_do_nothing()
+        ).rowcount
+
 
-role = CRUDRole(Role)
+role = CRUDRole(Role, notify=True)
@@ -0,0 +1,77 @@
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+
+UNIT_OF_WORK = "unit_of_work"
+
+
+class UnitOfWork:
+    """
+    Writes of CRUDs on ``db`` made inside ``unit_of_work``. They are only flushed,
+    and their write listeners run once the unit of work has committed.
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.writes: list[tuple[Any, Mapping[Any, Sequence[int | UUID]]]] = []
+
+    def record(self, crud: Any, writes: Mapping[Any, Sequence[int | UUID]]) -> None:
+        self.writes.append((crud, writes))
+
+    @contextmanager
+    def savepoint(self) -> Iterator["UnitOfWork"]:
+        """
+        Run the block in a SAVEPOINT: if it raises, only its writes are rolled
+        back, and the exception is raised again.
+        """
+        mark = len(self.writes)
+
+        try:
+            with self.db.begin_nested():
+                yield self
+        except BaseException:
+            del self.writes[mark:]
+            raise
+
+    def dispatch(self) -> None:
+        for crud, writes in self.writes:
+            for operation, ids in writes.items():
+                crud.dispatch_write(operation, ids)
+
+
+def current_unit_of_work(db: Session) -> UnitOfWork | None:
+    return db.info.get(UNIT_OF_WORK)
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[UnitOfWork]:
+    """
+    Make the CRUD writes on ``db`` in the block one transaction, committed when
+    the block exits and rolled back if it raises. Inside another unit of work the
+    block runs in a savepoint of it instead.
+    """
+    current = current_unit_of_work(db)
+
+    if current is not None:
+        with current.savepoint():
+            yield current
+
+        return
+
+    uow = UnitOfWork(db)
+    db.info[UNIT_OF_WORK] = uow
+
+    try:
+        yield uow
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        del db.info[UNIT_OF_WORK]
+
+    uow.dispatch()
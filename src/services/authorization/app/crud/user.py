@@ -1,7 +1,18 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
 from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app.crud.base import CRUDBase
+from app.crud.loading import LoadPlan
+from app.database.views import MaterializedView
 from app.models.user import User
+from app.security import PasswordHasher, password_hasher
 
 
 class UserCreate(BaseModel):
@@ -23,9 +34,200 @@ class UserUpdate(BaseModel):
         orm_mode = True
 
 
-# TODO: add create method with hashable password
+@dataclass(frozen=True, slots=True)
+class UserRow:
+    """Read-only projection of a user for ``project``, without the password."""
+
+    id: UUID
+    email: str
+    full_name: tuple
+    role_id: int
+    direction_id: int | None
+    is_active: bool
+
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
-    ...
+    """
+    :param hasher:
+        Hashes passwords before they are stored. Without one passwords are stored
+        as given.
+    :param permission_view:
+        Materialized view of user permission names to answer permission checks
+        from, instead of joining the role permissions.
+    """
+
+    default_load_plan = {"role": "joined", "direction": "joined"}
+
+    def __init__(
+        self,
+        model: type[User],
+        *,
+        notify: bool = False,
+        load_plan: LoadPlan | None = None,
+        returning: bool = False,
+        hasher: PasswordHasher | None = None,
+        permission_view: MaterializedView | None = None,
+    ) -> None:
+        super().__init__(model, notify=notify, load_plan=load_plan, returning=returning)
+
+        self.hasher = hasher
+        self.permission_view = permission_view
+
+    def get_by_email(self, db: Session, *, email: str) -> User | None:
+        return self._get_by(db, "email", email)
+
+    def has_permission(self, db: Session, *, id: UUID, permission_name: str) -> bool:
+        query = self._permission_names(id)
+
+        return db.execute(
+            select(query.where(query.selected_columns[0] == permission_name).exists())
+        ).scalar_one()
+
+    def permissions_for_user(self, db: Session, *, id: UUID) -> frozenset[str]:
+        return frozenset(db.execute(self._permission_names(id)).scalars())
+
+    def _permission_names(self, id: UUID) -> Select:
+        """
+        Select the permission names of an active user with one join over the user,
+        role_permission and permission indexes, or from the permission view.
+        """
+        if self.permission_view is not None:
+            view = self.permission_view.table
+
+            return select(view.c.name).where(view.c.user_id == id)
+
+        role = self.model.role.property.mapper.class_
+        association = role.role_permission_associations.property.mapper.class_
+        permission = association.permission.property.mapper.class_
+
+        return (
+            select(permission.name)
+            .join_from(
+                self.model,
+                association,
+                association.role_id == self.model.role_id,
+            )
+            .join(association.permission)
+            .where(self.model.id == id, self.model.is_active.is_(True))
+        )
+
+    def create(self, db: Session, *, obj_in: UserCreate) -> User:
+        if self.hasher is not None:
+            obj_in = obj_in.copy(update={"password": self.hasher.hash(obj_in.password)})
+
+        return super().create(db, obj_in=obj_in)
+
+    def create_multi(
+        self, db: Session, *, objs_in: Sequence[UserCreate], chunk_size: int = 1000
+    ) -> list[User]:
+        if self.hasher is not None:
+            hashes = self.hasher.hash_many([obj_in.password for obj_in in objs_in])
+            objs_in = [
+                obj_in.copy(update={"password": hash})
+                for obj_in, hash in zip(objs_in, hashes)
+            ]
+
+        return super().create_multi(db, objs_in=objs_in, chunk_size=chunk_size)
+
+    def upsert_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[UserCreate],
+        on: str,
+        chunk_size: int = 1000,
+    ) -> list[User]:
+        if self.hasher is not None:
+            hashes = self.hasher.hash_many([obj_in.password for obj_in in objs_in])
+            objs_in = [
+                obj_in.copy(update={"password": hash})
+                for obj_in, hash in zip(objs_in, hashes)
+            ]
+
+        return super().upsert_multi(db, objs_in=objs_in, on=on, chunk_size=chunk_size)
+
+    def update(
+        self, db: Session, *, db_obj: User, obj_in: UserUpdate | dict[str, Any]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            updated_data = obj_in
+        else:
+            updated_data = obj_in.dict(exclude_unset=True)
+
+        password = updated_data.get("password")
+
+        # Schemas built with from_orm carry the stored hash back unchanged.
+        if self.hasher is not None and password and password != db_obj.password:
+            updated_data = {**updated_data, "password": self.hasher.hash(password)}
+
+        return super().update(db, db_obj=db_obj, obj_in=updated_data)  # type: ignore
+
+    def update_multi(
+        self,
+        db: Session,
+        *,
+        objs_in: Mapping[int | UUID, UserUpdate | dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> list[User]:
+        if self.hasher is not None:
+            updated_data = {
+                id: obj_in
+                if isinstance(obj_in, dict)
+                else obj_in.dict(exclude_unset=True)
+                for id, obj_in in objs_in.items()
+            }
+            passwords = {
+                id: data["password"]
+                for id, data in updated_data.items()
+                if data.get("password")
+            }
+            # As in update, a stored hash carried back unchanged is not hashed again.
+            stored = dict(
+                db.execute(
+                    select(self.model.id, self.model.password).where(
+                        self.model.id.in_(passwords)
+                    )
+                ).all()
+            )
+            ids = [
+                id for id, password in passwords.items() if password != stored.get(id)
+            ]
+            hashes = self.hasher.hash_many([passwords[id] for id in ids])
+
+            for id, hash in zip(ids, hashes):
+                updated_data[id] = {**updated_data[id], "password": hash}
+
+            objs_in = updated_data
+
+        return super().update_multi(db, objs_in=objs_in, chunk_size=chunk_size)
+
+    def authenticate(self, db: Session, *, email: str, password: str) -> User | None:
+        """
+        Return the active user with these credentials. A hash made with outdated
+        argon2 parameters is replaced on a successful login.
+        """
+        if self.hasher is None:
+            raise RuntimeError("CRUDUser needs a password hasher to authenticate.")
+
+        db_obj = self.get_by_email(db, email=email)
+
+        if db_obj is None or not db_obj.is_active:
+            # Spend the same time as a wrong password, so the response does not
+            # tell which emails exist.
+            self.hasher.verify(self.hasher.dummy_hash, password)
+            return None
+
+        valid, new_hash = self.hasher.verify_and_update(db_obj.password, password)
+
+        if not valid:
+            return None
+
+        if new_hash is not None:
+            db_obj = super().update(
+                db, db_obj=db_obj, obj_in={"password": new_hash}  # type: ignore
+            )
+
+        return db_obj
 
 
-user = CRUDUser(User)
+user = CRUDUser(User, notify=True, returning=True, hasher=password_hasher)
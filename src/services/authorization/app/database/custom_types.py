@@ -1,17 +1,68 @@
-from collections.abc import Callable, Sequence
-from typing import NamedTuple
-
-from psycopg2.extras import register_composite
-from sqlalchemy import MetaData, event
+import operator
+import weakref
+from collections import namedtuple
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, NamedTuple
+
+from psycopg2 import ProgrammingError
+from psycopg2.extensions import register_type
+from psycopg2.extras import CompositeCaster, register_composite
+from sqlalchemy import Column, MetaData, Table
 from sqlalchemy.engine import Connection, Dialect
 from sqlalchemy.exc import InterfaceError
 from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import _ConnectionRecord
 from sqlalchemy.schema import _CreateDropBase
 from sqlalchemy.sql.compiler import DDLCompiler
 from sqlalchemy.sql.sqltypes import SchemaType
 from sqlalchemy.types import UserDefinedType
 
-from app.database.connection import engine
+
+SUPPORTED_DRIVERS = ("psycopg2", "asyncpg")
+
+# Casters looked up from the catalog, by qualified type name. The OIDs they hold are
+# valid for the whole process, so new connections skip the catalog lookup.
+_casters: dict[str, CompositeCaster] = {}
+_composite_types: "weakref.WeakSet[CompositeType]" = weakref.WeakSet()
+
+
+def tuple_getter(keys: Sequence[Hashable]) -> Callable[[Any], tuple]:
+    """Return a callable picking ``keys`` out of its argument as a tuple."""
+    if len(keys) == 1:
+        (key,) = keys
+
+        return lambda value: (value[key],)
+
+    return operator.itemgetter(*keys)
+
+
+def register_caster(caster: CompositeCaster, scope: Any = None) -> None:
+    register_type(caster.typecaster, scope)
+
+    if caster.array_typecaster is not None:
+        register_type(caster.array_typecaster, scope)
+
+
+def register_composite_types(
+    dbapi_connection: Any, connection_record: _ConnectionRecord
+) -> None:
+    """
+    Pool ``connect`` listener registering every known composite type on a new
+    psycopg2 connection. Types not created yet are skipped.
+    """
+    names = {composite.qualified_name for composite in list(_composite_types)}
+
+    for name in sorted(names):
+        caster = _casters.get(name)
+
+        if caster is not None:
+            register_caster(caster, dbapi_connection)
+            continue
+
+        try:
+            _casters[name] = register_composite(name, dbapi_connection)
+        except ProgrammingError:
+            pass
 
 
 class CreateCompositeType(_CreateDropBase):
@@ -29,7 +80,6 @@ class DropCompositeType(_CreateDropBase):
 # TODO: add filter by composite type
 # TODO: add creation of composite type in composite type
 # TODO: add checks composite type in other tables
-# TODO: add event.remove
 # FIXME: add column nullable check
 class CompositeType(UserDefinedType, SchemaType):
     """
@@ -39,52 +89,83 @@ class CompositeType(UserDefinedType, SchemaType):
         List of columns that this composite type consists of
     """
 
-    def __init__(self, name: str, columns: list | tuple) -> None:
-        if engine.dialect.driver != "psycopg2":
-            raise InterfaceError(
-                None,
-                None,
-                "'psycopg2' driver is required in order to use CompositeType.",
-            )
+    cache_ok = True
 
+    def __init__(self, name: str, columns: list | tuple) -> None:
         SchemaType.__init__(self, name=name, inherit_schema=True)
 
-        self.columns = columns
-
-        event.listen(MetaData, "before_create", self.before_create)
-        event.listen(MetaData, "after_drop", self.after_drop)
+        # A tuple keeps the type hashable, so statements using it can be cached.
+        self.columns = tuple(columns)
+        self.column_names = tuple(column.name for column in self.columns)
+        self.type_tuple = namedtuple(name, self.column_names)  # type: ignore
 
     @property
     def python_type(self) -> type:
         return tuple
 
+    @property
+    def qualified_name(self) -> str:
+        return self.name if self.schema is None else f"{self.schema}.{self.name}"
+
     def get_col_spec(self) -> str:
-        return self.name
+        return self.qualified_name
 
     def bind_processor(self, dialect: Dialect) -> Callable[[Sequence], tuple]:
+        self.check_driver(dialect)
+
+        size = len(self.column_names)
+        from_mapping = tuple_getter(self.column_names)
+        from_sequence = tuple_getter(range(size))
+
         def process(value: Sequence) -> tuple:
             if value is None:
                 return None
 
+            if value.__class__ is tuple and len(value) == size:
+                return value  # type: ignore
+
             if isinstance(value, dict):
-                value = tuple(value[column.name] for column in self.columns)
-            else:
-                value = tuple(value[index] for index in range(len(self.columns)))
+                return from_mapping(value)
 
-            return value
+            return from_sequence(value)
 
         return process
 
     def result_processor(
         self, dialect: Dialect, coltype: int
-    ) -> Callable[[NamedTuple], NamedTuple]:
-        def process(value: NamedTuple) -> NamedTuple:
+    ) -> Callable[[tuple], NamedTuple] | None:
+        self.check_driver(dialect)
+
+        # psycopg2 decodes registered composites to named tuples itself, so no
+        # per-row processing is needed. asyncpg returns records that only support
+        # item access.
+        if dialect.driver != "asyncpg":
+            return None
+
+        type_tuple = self.type_tuple
+
+        def process_record(value: tuple) -> NamedTuple:
             if value is None:
                 return None
 
-            return value
+            return type_tuple(*value)
 
-        return process
+        return process_record
+
+    def _set_table(self, column: Column, table: Table) -> None:
+        super()._set_table(column, table)
+
+        # Only types used by a table have their final schema.
+        _composite_types.add(self)
+
+    def check_driver(self, dialect: Dialect) -> None:
+        if dialect.driver not in SUPPORTED_DRIVERS:
+            raise InterfaceError(
+                None,
+                None,
+                f"One of {SUPPORTED_DRIVERS} drivers is required in order to use "
+                "CompositeType.",
+            )
 
     def create(self, bind: Connection, checkfirst: bool = True) -> None:
         if checkfirst and not bind.dialect.has_type(
@@ -97,9 +178,15 @@ class CompositeType(UserDefinedType, SchemaType):
     ) -> None:
         self.create(connection)
 
-        register_composite(
-            name=self.name, conn_or_curs=connection.connection.connection, globally=True
-        )
+        # Connections already in the pools were opened before the type existed and
+        # missed the connect listener, so a type created at runtime is registered
+        # globally.
+        if connection.dialect.driver == "psycopg2":
+            _casters[self.qualified_name] = register_composite(
+                name=self.qualified_name,
+                conn_or_curs=connection.connection.connection,
+                globally=True,
+            )
 
     def drop(self, bind: Connection, checkfirst: bool = True) -> None:
         if checkfirst and bind.dialect.has_type(bind, self.name, schema=self.schema):
@@ -108,8 +195,25 @@ class CompositeType(UserDefinedType, SchemaType):
     def after_drop(
         self, target: MetaData, connection: Connection, **kwargs: dict
     ) -> None:
-        if self.schema == target.schema:
-            self.drop(connection)
+        self.drop(connection)
+
+        _casters.pop(self.qualified_name, None)
+
+    # SchemaType attaches these to the metadata of the table using the type, so
+    # only that metadata creates and drops it.
+    def _on_metadata_create(
+        self, target: MetaData, bind: Connection, **kwargs: dict
+    ) -> None:
+        self.before_create(target, bind)
+
+    def _on_table_create(self, target: Table, bind: Connection, **kwargs: dict) -> None:
+        if not kwargs.get("_is_metadata_operation", False):
+            self.before_create(target.metadata, bind)
+
+    def _on_metadata_drop(
+        self, target: MetaData, bind: Connection, **kwargs: dict
+    ) -> None:
+        self.after_drop(target, bind)
 
     @compiles(CreateCompositeType)
     def visit_create_composite_type(
@@ -0,0 +1,57 @@
+import logging
+from collections import Counter
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.session import ORMExecuteState
+
+
+logger = logging.getLogger(__name__)
+
+
+class NPlusOneError(RuntimeError):
+    pass
+
+
+class LazyLoadDetector:
+    """
+    ``do_orm_execute`` listener counting the lazy loads each session runs, per
+    relationship. Sessions live for one request, so a relationship lazily loaded
+    more than ``threshold`` times is an N+1 pattern that a load plan should cover.
+
+    :param threshold:
+        Lazy loads of one relationship a session may run before it is reported.
+    :param raise_error:
+        Raise NPlusOneError instead of logging a warning.
+    """
+
+    def __init__(self, threshold: int = 10, *, raise_error: bool = False) -> None:
+        self.threshold = threshold
+        self.raise_error = raise_error
+
+    def __call__(self, orm_execute_state: ORMExecuteState) -> None:
+        # Set for lazy loads only, not for eager loads run alongside the parent.
+        if orm_execute_state.lazy_loaded_from is None:
+            return
+
+        relationship = orm_execute_state.loader_strategy_path[-1]
+        name = f"{relationship.parent.class_.__name__}.{relationship.key}"
+
+        counts = self.counts(orm_execute_state.session)
+        counts[name] += 1
+
+        if counts[name] != self.threshold + 1:
+            return
+
+        message = (
+            f"{name} was lazily loaded more than {self.threshold} times in one "
+            "session, add it to the load plan."
+        )
+
+        if self.raise_error:
+            raise NPlusOneError(message)
+
+        logger.warning(message)
+
+    @staticmethod
+    def counts(session: Session) -> Counter[str]:
+        return session.info.setdefault("lazy_loads", Counter())
@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters of an instrumented pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+
+        self.metrics.record_wait(time.perf_counter() - start)
+
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+
+        return pool
+
+    def stats(self) -> dict[str, Any]:
+        metrics = self.metrics
+
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "wait_total": metrics.wait_total,
+            "wait_max": metrics.wait_max,
+            "wait_avg": metrics.wait_total / metrics.checkouts
+            if metrics.checkouts
+            else 0.0,
+        }
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    ...
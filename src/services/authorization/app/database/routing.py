@@ -0,0 +1,164 @@
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql import Select
+
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("round_robin", "least_connections")
+
+
+class ReplicaPool:
+    """
+    Read replicas to spread reads over. Replicas are checked at most every
+    ``check_interval`` seconds, on the next ``choose``: a replica that cannot be
+    reached or lags the primary by more than ``max_lag`` seconds is skipped until
+    a later check finds it usable again.
+
+    :param strategy:
+        ``round_robin``, or ``least_connections`` to pick the replica with the
+        fewest connections checked out of its pool.
+    :param max_lag:
+        Seconds of replication lag a replica may have and still serve reads.
+    """
+
+    # Seconds since the last replayed transaction, zero for a replica that has
+    # replayed everything it received and for a server that is not a replica.
+    LAG_QUERY = text(
+        "SELECT CASE"
+        " WHEN NOT pg_is_in_recovery() THEN 0"
+        " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+        " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        " END"
+    )
+
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        *,
+        strategy: str = "round_robin",
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown replica strategy {strategy!r}, expected one of "
+                f"{list(STRATEGIES)}."
+            )
+
+        self.engines = list(engines)
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.clock = clock
+
+        self.available = list(self.engines)
+
+        self._counter = itertools.count()
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+    def choose(self) -> Engine | None:
+        """Return a replica to read from, None if none is usable."""
+        checked_at = self._checked_at
+
+        if checked_at is None or self.clock() - checked_at >= self.check_interval:
+            # One caller runs the checks, the others keep using the last result.
+            if self._lock.acquire(blocking=False):
+                try:
+                    self.check()
+                finally:
+                    self._lock.release()
+
+        available = self.available
+
+        if not available:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(available, key=lambda engine: engine.pool.checkedout())
+
+        return available[next(self._counter) % len(available)]
+
+    def check(self) -> list[Engine]:
+        self.available = [engine for engine in self.engines if self._usable(engine)]
+        self._checked_at = self.clock()
+
+        return self.available
+
+    def _usable(self, engine: Engine) -> bool:
+        try:
+            with engine.connect() as connection:
+                lag = connection.execute(self.LAG_QUERY).scalar()
+        except DBAPIError as exc:
+            logger.warning("Replica %s is unavailable: %s", engine.url, exc)
+            return False
+
+        if lag is not None and lag > self.max_lag:
+            logger.warning("Replica %s lags by %.1f s.", engine.url, lag)
+            return False
+
+        return True
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from replicas and writes to the primary. Each transaction
+    reads from one replica until the session writes; from then on the session
+    reads from the primary as well, so it sees its own writes, including those it
+    committed and replicas may not have replayed yet, until it is closed.
+    Statements the session cannot tell are reads, such as text() or SELECT ...
+    FOR UPDATE, count as writes.
+
+    :param replicas:
+        Where reads go, the primary when no replica is usable.
+    """
+
+    def __init__(
+        self, *, primary: Engine, replicas: ReplicaPool, **kwargs: Any
+    ) -> None:
+        super().__init__(**{**kwargs, "bind": primary})
+
+        self.primary = primary
+        self.replicas = replicas
+
+        self._replica: Engine | None = None
+        self._wrote = False
+
+        event.listen(self, "after_transaction_end", self._transaction_ended)
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if self._wrote or self._flushing or not self._is_read(clause):
+            self._wrote = True
+            return self.primary
+
+        if self._replica is None:
+            self._replica = self.replicas.choose() or self.primary
+
+        return self._replica
+
+    def close(self) -> None:
+        super().close()
+
+        self._replica = None
+        self._wrote = False
+
+    @staticmethod
+    def _is_read(clause: Any) -> bool:
+        return isinstance(clause, Select) and clause._for_update_arg is None
+
+    def _transaction_ended(
+        self, session: Session, transaction: SessionTransaction
+    ) -> None:
+        if transaction.parent is None:
+            self._replica = None
@@ -0,0 +1,86 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import Select
+
+
+class MaterializedView:
+    """
+    A Postgres materialized view over ``selectable``, queried through ``table``.
+    Views are not created with the metadata; call ``create`` where they are used.
+
+    :param unique:
+        Columns of the unique index that allows refreshing the view concurrently,
+        without blocking readers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        selectable: Select,
+        *,
+        unique: Sequence[str],
+        schema: str | None = None,
+    ) -> None:
+        self.selectable = selectable
+        self.unique = tuple(unique)
+        self.table = Table(
+            name,
+            MetaData(schema=schema),
+            *(
+                Column(column.key, column.type)
+                for column in selectable.selected_columns
+            ),
+        )
+
+    def create(self, bind: Connection | Engine) -> None:
+        preparer = bind.dialect.identifier_preparer
+        query = self.selectable.compile(
+            dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+        columns = ", ".join(preparer.quote(column) for column in self.unique)
+        index = preparer.quote(f"uq_{self.table.name}")
+
+        self._execute(
+            bind,
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {self.qualified_name(bind)} "
+            f"AS {query}",
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {index} "
+            f"ON {self.qualified_name(bind)} ({columns})",
+        )
+
+    def drop(self, bind: Connection | Engine) -> None:
+        self._execute(
+            bind, f"DROP MATERIALIZED VIEW IF EXISTS {self.qualified_name(bind)}"
+        )
+
+    def refresh(self, bind: Connection | Engine, *, concurrently: bool = True) -> None:
+        self._execute(
+            bind,
+            "REFRESH MATERIALIZED VIEW "
+            f"{'CONCURRENTLY ' if concurrently else ''}{self.qualified_name(bind)}",
+        )
+
+    def refresh_on_writes(self, bind: Connection | Engine, *cruds: Any) -> None:
+        """
+        Refresh the view after every committed write of ``cruds``. Each refresh
+        recomputes the whole view on the writing thread, so this suits tables
+        written rarely, not bulk loads.
+        """
+        for crud in cruds:
+            crud.add_write_listener(lambda operation, ids: self.refresh(bind))
+
+    def qualified_name(self, bind: Connection | Engine) -> str:
+        return bind.dialect.identifier_preparer.format_table(self.table)
+
+    def _execute(self, bind: Connection | Engine, *statements: str) -> None:
+        if isinstance(bind, Engine):
+            with bind.begin() as connection:
+                self._execute(connection, *statements)
+
+            return
+
+        for statement in statements:
+            bind.exec_driver_sql(statement)
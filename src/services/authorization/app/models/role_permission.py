@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.database.base_class import Base
@@ -15,5 +15,8 @@ class RolePermissionAssociation(Base):
     role = relationship("Role", back_populates="role_permission_associations")
     permission = relationship("Permission")
 
+    # The primary key covers lookups by role, this one lookups by permission.
+    __table_args__ = (Index(None, "permission_id", "role_id"),)
+
     def __init__(self, permission: Permission) -> None:
         self.permission = permission
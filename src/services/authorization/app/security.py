@@ -0,0 +1,148 @@
+import asyncio
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Any, TypeVar
+
+import argon2
+from argon2.exceptions import InvalidHash, VerificationError
+
+from app.config import PasswordHashSettings, password_hash_settings
+
+
+T = TypeVar("T")
+
+Parameters = tuple[int, int, int, int, int]
+
+
+@lru_cache
+def _hasher(parameters: Parameters) -> argon2.PasswordHasher:
+    time_cost, memory_cost, parallelism, hash_len, salt_len = parameters
+
+    return argon2.PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        hash_len=hash_len,
+        salt_len=salt_len,
+    )
+
+
+# Module level so they can be sent to a process pool.
+def _hash(parameters: Parameters, password: str) -> str:
+    return _hasher(parameters).hash(password)
+
+
+def _verify(parameters: Parameters, hash: str, password: str) -> bool:
+    try:
+        return _hasher(parameters).verify(hash, password)
+    except (VerificationError, InvalidHash):
+        return False
+
+
+def _verify_and_update(
+    parameters: Parameters, hash: str, password: str
+) -> tuple[bool, str | None]:
+    if not _verify(parameters, hash, password):
+        return False, None
+
+    hasher = _hasher(parameters)
+
+    if hasher.check_needs_rehash(hash):
+        return True, hasher.hash(password)
+
+    return True, None
+
+
+class PasswordHasher:
+    """
+    Runs argon2 hashing and verification on a bounded worker pool, so a login
+    or registration burst cannot occupy more than ``workers`` cores.
+    """
+
+    def __init__(
+        self,
+        settings: PasswordHashSettings = password_hash_settings,
+        executor: Executor | None = None,
+    ) -> None:
+        self.settings = settings
+        self.parameters: Parameters = (
+            settings.time_cost,
+            settings.memory_cost,
+            settings.parallelism,
+            settings.hash_len,
+            settings.salt_len,
+        )
+        self.workers = settings.workers or os.cpu_count() or 1
+
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        # Created lazily so importing the module does not start workers.
+        if self._executor is None:
+            if self.settings.executor == "process":
+                self._executor = ProcessPoolExecutor(self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="password-hasher"
+                )
+
+        return self._executor
+
+    @cached_property
+    def dummy_hash(self) -> str:
+        """
+        Hash to verify against when there is no stored hash, so a login for an
+        unknown user takes as long as one with a wrong password.
+        """
+        return self.hash(os.urandom(16).hex())
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def hash_many(self, passwords: Sequence[str]) -> list[str]:
+        return list(
+            self.executor.map(_hash, [self.parameters] * len(passwords), passwords)
+        )
+
+    def verify(self, hash: str, password: str) -> bool:
+        return self._run(_verify, hash, password)
+
+    def check_needs_rehash(self, hash: str) -> bool:
+        return _hasher(self.parameters).check_needs_rehash(hash)
+
+    def verify_and_update(self, hash: str, password: str) -> tuple[bool, str | None]:
+        """
+        Verify a password and, if it matches a hash made with outdated parameters,
+        also return a new hash to store in its place.
+        """
+        return self._run(_verify_and_update, hash, password)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password)
+
+    async def verify_async(self, hash: str, password: str) -> bool:
+        return await self._run_async(_verify, hash, password)
+
+    async def verify_and_update_async(
+        self, hash: str, password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run_async(_verify_and_update, hash, password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return self.executor.submit(func, self.parameters, *args).result()
+
+    async def _run_async(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self.executor, func, self.parameters, *args)
+
+
+password_hasher = PasswordHasher()
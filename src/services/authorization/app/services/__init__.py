@@ -0,0 +1 @@
+from .permission_resolver import permission_resolver  # noqa: F401
@@ -0,0 +1,291 @@
+import struct
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.base import Operation
+from app.crud.permission import CRUDPermission
+from app.crud.role import CRUDRole
+from app.crud.user import CRUDUser
+
+
+MAGIC = b"AUTHZ"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<5sBIII")
+_ROLE = struct.Struct("<qI")
+_USER = struct.Struct("<16sq")
+
+
+@dataclass(frozen=True)
+class AuthorizationSnapshot:
+    """
+    The authorization model reduced to integers: every permission name has a bit
+    index, every role is a bitset of its permissions and every active user maps to
+    a role, so a check is one bit test. Users are keyed by the bytes of their id,
+    which load without building a UUID per user.
+    """
+
+    permissions: dict[str, int] = field(default_factory=dict)
+    roles: dict[int, int] = field(default_factory=dict)
+    users: dict[bytes, int] = field(default_factory=dict)
+
+    def role_has_permission(self, role_id: int, permission_name: str) -> bool:
+        index = self.permissions.get(permission_name)
+
+        if index is None:
+            return False
+
+        return bool(self.roles.get(role_id, 0) >> index & 1)
+
+    def user_has_permission(self, user_id: UUID, permission_name: str) -> bool:
+        role_id = self.users.get(user_id.bytes)
+
+        if role_id is None:
+            return False
+
+        return self.role_has_permission(role_id, permission_name)
+
+    def permissions_for_role(self, role_id: int) -> frozenset[str]:
+        bits = self.roles.get(role_id, 0)
+
+        return frozenset(
+            name for name, index in self.permissions.items() if bits >> index & 1
+        )
+
+    def dumps(self) -> bytes:
+        size = max(self.permissions.values(), default=-1) + 1
+        names = [""] * size
+
+        for name, index in self.permissions.items():
+            names[index] = name
+
+        permissions = "\0".join(names).encode()
+        parts = [
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                len(permissions),
+                len(self.roles),
+                len(self.users),
+            ),
+            permissions,
+        ]
+
+        for role_id, bits in self.roles.items():
+            data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+            parts += [_ROLE.pack(role_id, len(data)), data]
+
+        parts += [
+            _USER.pack(user_id, role_id) for user_id, role_id in self.users.items()
+        ]
+
+        return b"".join(parts)
+
+    @classmethod
+    def loads(cls, data: bytes) -> "AuthorizationSnapshot":
+        try:
+            magic, version, size, roles_count, users_count = _HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise ValueError("Truncated authorization snapshot.") from exc
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not an authorization snapshot of a supported version.")
+
+        view = memoryview(data)
+        offset = _HEADER.size
+
+        names = bytes(view[offset : offset + size]).decode().split("\0")
+        permissions = {name: index for index, name in enumerate(names) if name}
+        offset += size
+
+        roles = {}
+
+        for _ in range(roles_count):
+            try:
+                role_id, length = _ROLE.unpack_from(view, offset)
+            except struct.error as exc:
+                raise ValueError("Truncated authorization snapshot.") from exc
+
+            offset += _ROLE.size
+            roles[role_id] = int.from_bytes(view[offset : offset + length], "little")
+            offset += length
+
+        users_end = offset + users_count * _USER.size
+
+        if users_end != len(data):
+            raise ValueError("Truncated authorization snapshot.")
+
+        users: dict[bytes, int] = dict(
+            _USER.iter_unpack(view[offset:users_end])  # type: ignore
+        )
+
+        return cls(permissions=permissions, roles=roles, users=users)
+
+
+class SnapshotBuilder:
+    """
+    Builds an AuthorizationSnapshot from the role, permission and user tables and
+    keeps it current. Once a snapshot is built, the write listeners of the CRUDs
+    record what changed, and ``refresh`` reloads only that into a new snapshot, so
+    readers holding the previous one are never affected. Before the first build
+    nothing is recorded, as the build loads everything anyway.
+    """
+
+    def __init__(
+        self, role: CRUDRole, permission: CRUDPermission, user: CRUDUser
+    ) -> None:
+        self.role = role
+        self.permission = permission
+        self.user = user
+
+        self.snapshot = AuthorizationSnapshot()
+        # Bit index and name of every permission id. Indexes of removed permissions
+        # are only reused by a full build.
+        self._indexes: dict[int, int] = {}
+        self._names: dict[int, str] = {}
+
+        self._lock = threading.Lock()
+        self._built = False
+        self._recording = False
+        self._roles: set[int] = set()
+        self._permissions: set[int] = set()
+        self._users: set[UUID] = set()
+
+        role.add_write_listener(self._role_written)
+        permission.add_write_listener(self._permission_written)
+        user.add_write_listener(self._user_written)
+
+    @property
+    def stale(self) -> bool:
+        return not self._built or bool(self._roles or self._permissions or self._users)
+
+    def build(self, db: Session) -> AuthorizationSnapshot:
+        with self._lock:
+            self._roles.clear()
+            self._permissions.clear()
+            self._users.clear()
+            # Set before loading, so writes made during the build are refreshed.
+            self._recording = True
+
+        self._indexes = {}
+        self._names = {}
+
+        self.snapshot = AuthorizationSnapshot(
+            permissions=self._load_permissions(db, None),
+            roles=self._load_roles(db, None),
+            users=self._load_users(db, None),
+        )
+        self._built = True
+
+        return self.snapshot
+
+    def refresh(self, db: Session) -> AuthorizationSnapshot:
+        """Apply the writes recorded since the last build or refresh."""
+        if not self._built:
+            return self.build(db)
+
+        with self._lock:
+            role_ids, self._roles = self._roles, set()
+            permission_ids, self._permissions = self._permissions, set()
+            user_ids, self._users = self._users, set()
+
+        if not (role_ids or permission_ids or user_ids):
+            return self.snapshot
+
+        snapshot = self.snapshot
+        changes: dict[str, Any] = {}
+
+        if permission_ids:
+            changes["permissions"] = self._load_permissions(db, permission_ids)
+
+        if role_ids:
+            roles = dict(snapshot.roles)
+
+            for role_id in role_ids:
+                roles.pop(role_id, None)
+
+            roles.update(self._load_roles(db, role_ids))
+            changes["roles"] = roles
+
+        if user_ids:
+            users = dict(snapshot.users)
+
+            for user_id in user_ids:
+                users.pop(user_id.bytes, None)
+
+            users.update(self._load_users(db, user_ids))
+            changes["users"] = users
+
+        self.snapshot = replace(snapshot, **changes)
+
+        return self.snapshot
+
+    def _load_permissions(self, db: Session, ids: set[int] | None) -> dict[str, int]:
+        permission = self.permission.model
+        permissions = select(permission.id, permission.name).order_by(permission.id)
+
+        if ids is not None:
+            permissions = permissions.where(permission.id.in_(list(ids)))
+
+            for id in ids:
+                self._names.pop(id, None)
+
+        for id, name in db.execute(permissions):
+            self._indexes.setdefault(id, len(self._indexes))
+            self._names[id] = name
+
+        return {name: self._indexes[id] for id, name in self._names.items()}
+
+    def _load_roles(self, db: Session, ids: set[int] | None) -> dict[int, int]:
+        role = self.role.model
+        association = role.role_permission_associations.property.mapper.class_
+
+        roles = select(role.id)
+
+        if ids is not None:
+            roles = roles.where(role.id.in_(list(ids)))
+
+        bitsets = {role_id: 0 for role_id in db.execute(roles).scalars()}
+        pairs = select(association.role_id, association.permission_id).where(
+            association.role_id.in_(roles.scalar_subquery())
+        )
+
+        for role_id, permission_id in db.execute(pairs):
+            index = self._indexes.get(permission_id)
+
+            if index is not None:
+                bitsets[role_id] |= 1 << index
+
+        return bitsets
+
+    def _load_users(self, db: Session, ids: set[UUID] | None) -> dict[bytes, int]:
+        user = self.user.model
+        users = select(user.id, user.role_id).where(user.is_active.is_(True))
+
+        if ids is not None:
+            users = users.where(user.id.in_(list(ids)))
+
+        return {user_id.bytes: role_id for user_id, role_id in db.execute(users)}
+
+    def _role_written(self, operation: Operation, ids: Sequence[int | UUID]) -> None:
+        with self._lock:
+            if self._recording:
+                self._roles.update(ids)  # type: ignore
+
+    def _permission_written(
+        self, operation: Operation, ids: Sequence[int | UUID]
+    ) -> None:
+        with self._lock:
+            if self._recording:
+                self._permissions.update(ids)  # type: ignore
+
+    def _user_written(self, operation: Operation, ids: Sequence[int | UUID]) -> None:
+        with self._lock:
+            if self._recording:
+                self._users.update(ids)  # type: ignore
@@ -0,0 +1,123 @@
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.cache import TTLCache
+from app.crud.base import Operation
+from app.crud.permission import CRUDPermission
+from app.crud.role import CRUDRole
+from app.crud.user import CRUDUser
+
+
+class PermissionResolver:
+    """
+    Answers permission checks from an in-process cache of permission names per
+    role, kept fresh by the write listeners of the role, permission and user CRUDs.
+
+    :param maxsize:
+        Number of roles and users kept in each cache.
+    :param ttl:
+        Seconds a resolved entry is trusted before it is loaded again.
+    """
+
+    def __init__(
+        self,
+        role: CRUDRole,
+        permission: CRUDPermission,
+        user: CRUDUser,
+        *,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+    ) -> None:
+        self.role = role
+        self.permission = permission
+        self.user = user
+
+        self.roles: TTLCache[int, frozenset[str]] = TTLCache(maxsize, ttl)
+        self.users: TTLCache[UUID, int] = TTLCache(maxsize, ttl)
+
+        # Bumped on every invalidation so a load that raced with a write is not
+        # stored over the newer state.
+        self._generation = 0
+
+        role.add_write_listener(self._role_written)
+        permission.add_write_listener(self._permission_written)
+        user.add_write_listener(self._user_written)
+
+    def permissions_for_role(self, db: Session, role_id: int) -> frozenset[str]:
+        permissions = self.roles.get(role_id)
+
+        if permissions is None:
+            generation = self._generation
+            permissions = self.role.get_permission_names(db, id=role_id)
+
+            if generation == self._generation:
+                self.roles.set(role_id, permissions)
+
+        return permissions
+
+    def role_for_user(self, db: Session, user_id: UUID) -> int | None:
+        role_id = self.users.get(user_id)
+
+        if role_id is None:
+            generation = self._generation
+            role_id = db.execute(
+                select(self.user.model.role_id).where(
+                    self.user.model.id == user_id, self.user.model.is_active
+                )
+            ).scalar_one_or_none()
+
+            if role_id is not None and generation == self._generation:
+                self.users.set(user_id, role_id)
+
+        return role_id
+
+    def role_has_permission(
+        self, db: Session, role_id: int, permission_name: str
+    ) -> bool:
+        return permission_name in self.permissions_for_role(db, role_id)
+
+    def user_has_permission(
+        self, db: Session, user_id: UUID, permission_name: str
+    ) -> bool:
+        role_id = self.role_for_user(db, user_id)
+
+        if role_id is None:
+            return False
+
+        return permission_name in self.permissions_for_role(db, role_id)
+
+    def invalidate_role(self, role_id: int) -> None:
+        self._generation += 1
+        self.roles.invalidate(role_id)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self._generation += 1
+        self.users.invalidate(user_id)
+
+    def invalidate_all(self) -> None:
+        self._generation += 1
+        self.roles.clear()
+        self.users.clear()
+
+    def _role_written(self, operation: Operation, ids: Sequence[int | UUID]) -> None:
+        for id in ids:
+            self.invalidate_role(id)  # type: ignore
+
+    def _permission_written(
+        self, operation: Operation, ids: Sequence[int | UUID]
+    ) -> None:
+        # Any role may hold a renamed or removed permission.
+        if operation is not Operation.CREATE:
+            self._generation += 1
+            self.roles.clear()
+
+    def _user_written(self, operation: Operation, ids: Sequence[int | UUID]) -> None:
+        for id in ids:
+            self.invalidate_user(id)  # type: ignore
+
+
+permission_resolver = PermissionResolver(crud.role, crud.permission, crud.user)
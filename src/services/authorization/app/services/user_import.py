@@ -0,0 +1,291 @@
+"""
+Import users from a CSV or NDJSON file.
+
+    python -m app.services.user_import users.csv --rejects users.rejects.ndjson
+
+Records hold ``email``, ``password``, ``role`` and ``direction`` names and either
+a ``full_name`` object or ``first_name``, ``last_name`` and ``middle_name``.
+Records that cannot be imported are written to the rejects file, one JSON object
+per line with the line number, the record and the reason, and the import goes on.
+"""
+import argparse
+import csv
+import json
+import re
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud.direction import CRUDDirection
+from app.crud.role import CRUDRole
+from app.crud.unit_of_work import UnitOfWork, unit_of_work
+from app.crud.user import CRUDUser, UserCreate
+from app.models.user import regex_email
+
+
+FULL_NAME_FIELDS = ("first_name", "last_name", "middle_name")
+
+# Line number, then the record or, for an unreadable line, the error.
+Record = tuple[int, dict[str, Any] | None, str | None]
+
+
+def read_csv(file: TextIO) -> Iterator[Record]:
+    reader = csv.DictReader(file)
+
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+def read_ndjson(file: TextIO) -> Iterator[Record]:
+    for line_num, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_num, None, f"Malformed JSON: {exc}"
+            continue
+
+        if not isinstance(record, dict):
+            yield line_num, None, "Expected a JSON object."
+            continue
+
+        yield line_num, record, None
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.seconds if self.seconds else 0.0
+
+
+class UserImporter:
+    """
+    Loads users in batches: each batch is validated with UserCreate, its role and
+    direction names are resolved from maps loaded once, its passwords are hashed
+    on the worker pool of the user CRUD's hasher and its rows are written with a
+    single COPY and committed together.
+
+    :param batch_size:
+        Records validated, hashed and copied together.
+    """
+
+    def __init__(
+        self,
+        user: CRUDUser,
+        role: CRUDRole,
+        direction: CRUDDirection,
+        *,
+        batch_size: int = 5000,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+
+        self.user = user
+        self.role = role
+        self.direction = direction
+        self.batch_size = batch_size
+
+        self._email = re.compile(regex_email)
+
+    def run(
+        self, db: Session, records: Iterable[Record], rejects: TextIO
+    ) -> ImportReport:
+        report = ImportReport()
+        start = time.perf_counter()
+
+        roles = self._names(db, self.role.model)
+        directions = self._names(db, self.direction.model)
+        records = iter(records)
+
+        while batch := list(islice(records, self.batch_size)):
+            report.read += len(batch)
+            valid: list[tuple[int, dict[str, Any], UserCreate]] = []
+
+            for line_num, record, error in batch:
+                obj_in = None
+
+                if record is not None:
+                    obj_in, error = self._validate(record, roles, directions)
+
+                if record is None or obj_in is None:
+                    self._reject(rejects, line_num, record, str(error))
+                    report.rejected += 1
+                else:
+                    valid.append((line_num, record, obj_in))
+
+            rows = self._rows([obj_in for _, _, obj_in in valid])
+
+            with unit_of_work(db) as uow:
+                errors = self._copy(db, uow, rows)
+
+            for (line_num, record, _), error in zip(valid, errors):
+                if error is None:
+                    report.imported += 1
+                else:
+                    self._reject(rejects, line_num, record, error)
+                    report.rejected += 1
+
+        report.seconds = time.perf_counter() - start
+
+        return report
+
+    def _validate(
+        self,
+        record: dict[str, Any],
+        roles: dict[str, int],
+        directions: dict[str, int],
+    ) -> tuple[UserCreate | None, str | None]:
+        role_id = roles.get(record.get("role"))  # type: ignore
+        direction = record.get("direction") or None
+        direction_id = None
+
+        if role_id is None:
+            return None, f"Unknown role {record.get('role')!r}."
+
+        if direction is not None:
+            direction_id = directions.get(direction)
+
+            if direction_id is None:
+                return None, f"Unknown direction {direction!r}."
+
+        full_name = record.get("full_name")
+
+        if full_name is None:
+            full_name = {field: record.get(field) for field in FULL_NAME_FIELDS}
+
+        try:
+            obj_in = UserCreate(
+                email=record.get("email"),
+                password=record.get("password"),
+                full_name=full_name,
+                role_id=role_id,
+                direction_id=direction_id,
+            )
+        except ValidationError as exc:
+            return None, "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in exc.errors()
+            )
+
+        # Checked here, as a row failing the table's check costs retrying its
+        # batch. fullmatch, as $ would also match before a trailing newline.
+        if not self._email.fullmatch(obj_in.email):
+            return None, f"Invalid email {obj_in.email!r}."
+
+        return obj_in, None
+
+    def _rows(self, objs_in: list[UserCreate]) -> list[dict[str, Any]]:
+        passwords = [obj_in.password for obj_in in objs_in]
+
+        if self.user.hasher is not None:
+            passwords = self.user.hasher.hash_many(passwords)
+
+        return [
+            {
+                **obj_in.dict(),
+                "id": uuid.uuid4(),
+                "password": password,
+                "is_active": True,
+            }
+            for obj_in, password in zip(objs_in, passwords)
+        ]
+
+    def _copy(
+        self, db: Session, uow: UnitOfWork, rows: list[dict[str, Any]]
+    ) -> list[str | None]:
+        """
+        Copy rows in a savepoint, returning why each row was not imported or None
+        if it was. When the database rejects a row, the COPY fails as a whole and
+        the rows are copied again in halves, until only the failing rows are left.
+        """
+        if not rows:
+            return []
+
+        try:
+            with uow.savepoint():
+                inserted = set(self.user.copy_insert(db, rows=rows, on="email"))
+        except (IntegrityError, DataError) as exc:
+            if len(rows) == 1:
+                return [str(exc.orig).strip().splitlines()[0]]
+
+            middle = len(rows) // 2
+
+            return self._copy(db, uow, rows[:middle]) + self._copy(
+                db, uow, rows[middle:]
+            )
+
+        return [
+            None if row["id"] in inserted else "Email already exists." for row in rows
+        ]
+
+    @staticmethod
+    def _names(db: Session, model: Any) -> dict[str, int]:
+        return dict(db.execute(select(model.name, model.id)).all())  # type: ignore
+
+    @staticmethod
+    def _reject(
+        rejects: TextIO, line_num: int, record: dict[str, Any] | None, error: str
+    ) -> None:
+        if record is not None and "password" in record:
+            record = {**record, "password": "***"}
+
+        rejects.write(
+            json.dumps(
+                {"line": line_num, "record": record, "error": error}, default=str
+            )
+            + "\n"
+        )
+
+
+def main() -> None:
+    from app import crud
+    from app.database.connection import Session
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=list(READERS))
+    parser.add_argument("--rejects")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    format = args.format or args.path.rsplit(".", 1)[-1]
+
+    if format not in READERS:
+        parser.error("Cannot tell the format from the file name, use --format.")
+
+    importer = UserImporter(
+        crud.user, crud.role, crud.direction, batch_size=args.batch_size
+    )
+
+    with open(args.path, newline="") as file, open(
+        args.rejects or f"{args.path}.rejects.ndjson", "w"
+    ) as rejects, Session() as db:
+        report = importer.run(db, READERS[format](file), rejects)
+
+    print(
+        f"{report.read} read, {report.imported} imported, {report.rejected} "
+        f"rejected in {report.seconds:.1f} s ({report.rows_per_second:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time bit-test permission checks on an AuthorizationSnapshot, and how long a
+snapshot of a synthetic directory takes to serialize and load.
+
+    python -m benchmarks.authorization_snapshot --users 100000
+"""
+import argparse
+import random
+import timeit
+import uuid
+
+from app.services.authorization_snapshot import AuthorizationSnapshot
+from benchmarks.common import timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--permissions", type=int, default=500)
+    parser.add_argument("--roles", type=int, default=200)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    snapshot = AuthorizationSnapshot(
+        permissions={f"permission_{index}": index for index in range(args.permissions)},
+        roles={
+            role_id: rng.getrandbits(args.permissions) for role_id in range(args.roles)
+        },
+        users={
+            uuid.uuid4().bytes: rng.randrange(args.roles) for _ in range(args.users)
+        },
+    )
+    user_id = uuid.UUID(bytes=next(iter(snapshot.users)))
+
+    seconds = timeit.timeit(
+        "snapshot.user_has_permission(user_id, 'permission_250')",
+        globals={"snapshot": snapshot, "user_id": user_id},
+        number=args.number,
+    )
+    print(f"user_has_permission       {seconds / args.number * 1e9:>10.0f} ns/check")
+
+    data = snapshot.dumps()
+    print(f"dumps                     {timed(snapshot.dumps) * 1e3:>10.1f} ms")
+    print(
+        "loads                     "
+        f"{timed(lambda: AuthorizationSnapshot.loads(data)) * 1e3:>10.1f} ms"
+    )
+    print(f"size                      {len(data) / 1024:>10.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the per-row CRUDBase write path with the batched *_multi methods.
+
+    python -m benchmarks.bulk_write --rows 20000
+"""
+import argparse
+
+from pydantic import BaseModel
+from sqlalchemy import Column, String
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from benchmarks.common import Base, get_engine, report, schema, timed
+
+
+class Item(Base):
+    name = Column(String, nullable=False)
+
+
+class ItemCreate(BaseModel):
+    name: str
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    crud = CRUDBase(Item)
+    objs_in = [ItemCreate(name=f"item-{index}") for index in range(args.rows)]
+
+    with schema(engine), Session(engine, future=True) as db:
+
+        def create() -> None:
+            for obj_in in objs_in:
+                crud.create(db, obj_in=obj_in)
+
+        report("create (per row)", args.rows, timed(create))
+
+        items: list[Item] = []
+
+        def create_multi() -> None:
+            items.extend(
+                crud.create_multi(db, objs_in=objs_in, chunk_size=args.chunk_size)
+            )
+
+        report("create_multi", args.rows, timed(create_multi))
+
+        def update() -> None:
+            for item in items:
+                crud.update(db, db_obj=item, obj_in={"name": item.name + "-1"})
+
+        report("update (per row)", args.rows, timed(update))
+
+        def update_multi() -> None:
+            crud.update_multi(
+                db,
+                objs_in={item.id: {"name": f"item-{item.id}"} for item in items},
+                chunk_size=args.chunk_size,
+            )
+
+        report("update_multi", args.rows, timed(update_multi))
+
+        ids = [item.id for item in items]
+        half = len(ids) // 2
+
+        def remove() -> None:
+            for id in ids[:half]:
+                crud.remove(db, id=id)
+
+        report("remove (per row)", half, timed(remove))
+
+        def remove_multi() -> None:
+            crud.remove_multi(db, ids=ids[half:], chunk_size=args.chunk_size)
+
+        report("remove_multi", len(ids) - half, timed(remove_multi))
+
+
+if __name__ == "__main__":
+    main()
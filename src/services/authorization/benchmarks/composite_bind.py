@@ -0,0 +1,60 @@
+"""
+Time the CompositeType bind processor over full_name values, against the previous
+generator based implementation.
+
+    python -m benchmarks.composite_bind --binds 1000000
+"""
+import argparse
+from collections.abc import Callable, Sequence
+
+from sqlalchemy.dialects.postgresql import psycopg2
+
+from app.models import User
+from benchmarks.common import report, timed
+
+
+def previous_bind_processor(columns: Sequence) -> Callable[[Sequence], tuple]:
+    def process(value: Sequence) -> tuple:
+        if value is None:
+            return None
+
+        if isinstance(value, dict):
+            value = tuple(value[column.name] for column in columns)
+        else:
+            value = tuple(value[index] for index in range(len(columns)))
+
+        return value
+
+    return process
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--binds", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    full_name = User.__table__.c.full_name.type
+    processors = {
+        "previous": previous_bind_processor(full_name.columns),
+        "itemgetter": full_name.bind_processor(psycopg2.dialect()),
+    }
+    values = {
+        "dict": {
+            "first_name": "Ivan",
+            "last_name": "Ivanov",
+            "middle_name": "Ivanovich",
+        },
+        "list": ["Ivan", "Ivanov", "Ivanovich"],
+        "tuple": ("Ivan", "Ivanov", "Ivanovich"),
+    }
+
+    for kind, value in values.items():
+        batch = [value] * args.binds
+
+        for name, process in processors.items():
+            seconds = timed(lambda: [process(item) for item in batch])
+            report(f"{name} {kind}", args.binds, seconds)
+
+
+if __name__ == "__main__":
+    main()
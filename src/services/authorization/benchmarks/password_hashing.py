@@ -0,0 +1,58 @@
+"""
+Report argon2 hashes/sec for the configured parameters (PASSWORD_HASH_* variables),
+inline on one core and through the PasswordHasher worker pool.
+
+    python -m benchmarks.password_hashing --hashes 200
+"""
+import argparse
+import asyncio
+import os
+
+from app.config import PasswordHashSettings
+from app.security import PasswordHasher, _hash
+from benchmarks.common import timed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hashes", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args()
+
+    settings = PasswordHashSettings(workers=args.workers, executor=args.executor)
+    hasher = PasswordHasher(settings)
+    passwords = [f"password-{index}" for index in range(args.hashes)]
+
+    print(
+        f"argon2id time_cost={settings.time_cost} memory_cost={settings.memory_cost} "
+        f"parallelism={settings.parallelism}, {hasher.workers} {args.executor} workers"
+    )
+
+    def report(name: str, seconds: float, cores: int) -> None:
+        rate = args.hashes / seconds
+        print(f"{name:<24} {rate:>10.1f} hashes/s {rate / cores:>10.1f} hashes/s/core")
+
+    seconds = timed(
+        lambda: [_hash(hasher.parameters, password) for password in passwords]
+    )
+    report("inline", seconds, 1)
+
+    hasher.hash(passwords[0])  # start the workers outside the measurement
+
+    report("pool hash_many", timed(lambda: hasher.hash_many(passwords)), hasher.workers)
+
+    async def hash_async() -> None:
+        await asyncio.gather(*(hasher.hash_async(password) for password in passwords))
+
+    report(
+        "pool hash_async",
+        timed(lambda: asyncio.run(hash_async())),
+        hasher.workers,
+    )
+
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare loading a page of users as ORM instances with get_multi against the Core
+projections of project: rows, a slots dataclass and a pydantic model. Reports
+objects per second and the memory the loaded objects hold per row.
+
+    python -m benchmarks.projection --rows 100000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import Column, String, text
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.database.custom_types import CompositeType
+from benchmarks.common import Base, get_engine, schema
+
+
+class Account(Base):
+    email = Column(String, nullable=False)
+    full_name = Column(
+        CompositeType(
+            "benchmark_full_name",
+            [
+                Column("first_name", String),
+                Column("last_name", String),
+                Column("middle_name", String),
+            ],
+        ),
+        nullable=False,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AccountRow:
+    id: int
+    email: str
+    full_name: tuple
+
+
+class AccountModel(BaseModel):
+    id: int
+    email: str
+    full_name: tuple[str, str, str]
+
+
+def measure(
+    load: Callable[[Session], list[Any]], engine: Any
+) -> tuple[int, float, int]:
+    with Session(engine, future=True) as db:
+        # Warm up the connection and the statement caches.
+        load(db)
+        db.expunge_all()
+        gc.collect()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        objects = load(db)
+        seconds = time.perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return len(objects), seconds, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    table = Account.__table__
+    crud = CRUDBase(Account)
+
+    loads: dict[str, Callable[[Session], list[Any]]] = {
+        "get_multi (ORM)": lambda db: crud.get_multi(db, limit=args.rows),
+        "project (Row)": lambda db: crud.project(db, limit=args.rows),
+        "project (slots dataclass)": lambda db: crud.project(
+            db, into=AccountRow, limit=args.rows
+        ),
+        "project (pydantic)": lambda db: crud.project(
+            db, into=AccountModel, limit=args.rows
+        ),
+    }
+
+    with schema(engine):
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"INSERT INTO {table.schema}.{table.name} (email, full_name) "
+                    "SELECT 'user' || n || '@planner.planner', "
+                    "ROW('First' || n, 'Last' || n, 'Middle' || n)"
+                    f"::{table.schema}.benchmark_full_name "
+                    "FROM generate_series(1, :rows) AS n"
+                ),
+                {"rows": args.rows},
+            )
+
+        for name, load in loads.items():
+            count, seconds, size = measure(load, engine)
+
+            print(
+                f"{name:<28} {count:>8} rows {count / seconds:>10.0f} objects/s "
+                f"{size / count:>8.0f} B/row"
+            )
+
+
+if __name__ == "__main__":
+    main()
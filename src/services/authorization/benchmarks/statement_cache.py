@@ -0,0 +1,124 @@
+"""
+Time the Python side of a lookup by id: building the query, its cache key and
+loading the row, over a stubbed DBAPI connection that answers without a server.
+
+    python -m benchmarks.statement_cache --calls 100000
+"""
+import argparse
+import timeit
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.models import Permission
+
+
+# Answers to the queries the dialect runs when it first connects.
+INITIALIZE = {
+    "select pg_catalog.version()": "PostgreSQL 16.0",
+    "select current_schema()": "dev",
+    "show transaction isolation level": "read committed",
+    "show standard_conforming_strings": "on",
+}
+
+
+class StubCursor:
+    def __init__(self, connection: "StubConnection") -> None:
+        self.connection = connection
+        self.description: list[tuple] | None = None
+        self.rowcount = -1
+        self._rows: list[Sequence[Any]] = []
+
+    def execute(self, statement: str, parameters: Any = None) -> None:
+        if statement in INITIALIZE:
+            self.description = [("value", 25, None, None, None, None, None)]
+            self._rows = [(INITIALIZE[statement],)]
+        else:
+            self.description = [
+                (column, 25, None, None, None, None, None)
+                for column in self.connection.columns
+            ]
+            self._rows = [self.connection.row]
+
+        self.rowcount = len(self._rows)
+
+    def fetchone(self) -> Sequence[Any] | None:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size: int = 1) -> list[Sequence[Any]]:
+        rows, self._rows = self._rows[:size], self._rows[size:]
+
+        return rows
+
+    def fetchall(self) -> list[Sequence[Any]]:
+        rows, self._rows = self._rows, []
+
+        return rows
+
+    def close(self) -> None:
+        pass
+
+
+class StubConnection:
+    server_version = 160000
+
+    def __init__(self, row: Sequence[Any], columns: Sequence[str]) -> None:
+        self.row = row
+        self.columns = columns
+        self.notices: list[str] = []
+
+    def cursor(self, *args: Any, **kwargs: Any) -> StubCursor:
+        return StubCursor(self)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    columns = [column.name for column in Permission.__table__.c]
+    row = [{"id": 1, "name": "read_user"}[column] for column in columns]
+
+    engine = create_engine(
+        "postgresql+psycopg2://",
+        creator=lambda: StubConnection(row, columns),
+        use_native_uuid=False,
+        use_native_hstore=False,
+        future=True,
+    )
+    crud = CRUDBase(Permission)
+
+    lookups = {
+        "query().filter().first()": lambda db: db.query(Permission)
+        .filter(Permission.id == 1)
+        .first(),
+        "select() per call": lambda db: db.execute(
+            select(Permission).where(Permission.id == 1)
+        )
+        .scalars()
+        .first(),
+        "CRUDBase.get (prebuilt)": lambda db: crud.get(db, id=1),
+    }
+
+    with Session(engine) as db:
+        for name, lookup in lookups.items():
+            assert lookup(db).name == "read_user"
+
+            seconds = timeit.timeit(lambda: lookup(db), number=args.calls)
+            print(f"{name:<28} {seconds / args.calls * 1e6:>8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare peak memory of materialising a table with get_multi against streaming it
+with iter_all / iter_columns. Each mode runs in its own process so the peak RSS
+of one does not leak into the next.
+
+    python -m benchmarks.streaming_read --rows 1000000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+from sqlalchemy import Column, String, text
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from benchmarks.common import Base, get_engine, schema
+
+
+class Account(Base):
+    email = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+
+
+def run(mode: str, rows: int, batch_size: int, queue: multiprocessing.Queue) -> None:
+    engine = get_engine()
+    crud = CRUDBase(Account)
+    count = 0
+
+    start = time.perf_counter()
+
+    with Session(engine, future=True) as db:
+        if mode == "get_multi":
+            count = len(crud.get_multi(db, limit=rows))
+        elif mode == "iter_all":
+            for _ in crud.iter_all(db, batch_size=batch_size):
+                count += 1
+        else:
+            for _ in crud.iter_columns(db, "id", "email", batch_size=batch_size):
+                count += 1
+
+    seconds = time.perf_counter() - start
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    queue.put((count, seconds, max_rss))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    table = Account.__table__
+
+    with schema(engine):
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"INSERT INTO {table.schema}.{table.name} (email, name) "
+                    "SELECT 'user' || n || '@planner.planner', 'user ' || n "
+                    "FROM generate_series(1, :rows) AS n"
+                ),
+                {"rows": args.rows},
+            )
+
+        engine.dispose()
+        context = multiprocessing.get_context("spawn")
+
+        for mode in ("get_multi", "iter_all", "iter_columns"):
+            queue = context.Queue()
+            process = context.Process(
+                target=run, args=(mode, args.rows, args.batch_size, queue)
+            )
+            process.start()
+            count, seconds, max_rss = queue.get()
+            process.join()
+
+            print(
+                f"{mode:<16} {count:>9} rows {seconds:>8.2f} s "
+                f"{count / seconds:>10.0f} rows/s {max_rss / 1024:>8.1f} MiB peak RSS"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Time a multi-step admin operation, creating a role, granting it permissions and
+creating its users, with a commit per CRUD call against one unit of work.
+
+    python -m benchmarks.unit_of_work --operations 200
+"""
+import argparse
+import time
+from collections.abc import Callable
+
+from pydantic import BaseModel
+from sqlalchemy import Column, ForeignKey, String, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, relationship
+
+from app.crud.base import CRUDBase
+from app.crud.role import CRUDRole, RoleCreate
+from app.crud.unit_of_work import unit_of_work
+from benchmarks.common import Base, get_engine, schema
+
+
+class Permission(Base):
+    name = Column(String, unique=True, nullable=False)
+
+
+class RolePermission(Base):
+    id = None
+    role_id = Column(ForeignKey("benchmark_role.id"), primary_key=True)
+    permission_id = Column(ForeignKey("benchmark_permission.id"), primary_key=True)
+
+    role = relationship("Role", back_populates="role_permission_associations")
+    permission = relationship("Permission")
+
+
+class Role(Base):
+    name = Column(String, unique=True, nullable=False)
+
+    role_permission_associations = relationship("RolePermission", back_populates="role")
+
+
+class Account(Base):
+    email = Column(String, nullable=False)
+    role_id = Column(ForeignKey("benchmark_role.id"), nullable=False)
+
+
+class PermissionCreate(BaseModel):
+    name: str
+
+
+class AccountCreate(BaseModel):
+    email: str
+    role_id: int
+
+
+PERMISSIONS = ["create_user", "read_user", "update_user", "remove_user"]
+
+
+def admin_operation(
+    role: CRUDRole, account: CRUDBase, users: int
+) -> Callable[[Session, int], None]:
+    def run(db: Session, index: int) -> None:
+        db_role = role.create(db, obj_in=RoleCreate(name=f"role_{index}"))
+        role.grant(db, ids=[db_role.id], permission_names=PERMISSIONS[:2])
+        role.grant(db, ids=[db_role.id], permission_names=PERMISSIONS[2:])
+
+        for user in range(users):
+            account.create(
+                db,
+                obj_in=AccountCreate(
+                    email=f"user_{index}_{user}@planner.planner", role_id=db_role.id
+                ),
+            )
+
+    return run
+
+
+def measure(
+    engine: Engine, operation: Callable[[Session, int], None], count: int, uow: bool
+) -> tuple[float, int]:
+    commits = []
+
+    def record(conn: object) -> None:
+        commits.append(conn)
+
+    event.listen(engine, "commit", record)
+
+    start = time.perf_counter()
+
+    with Session(engine, future=True) as db:
+        for index in range(count):
+            if uow:
+                with unit_of_work(db):
+                    operation(db, index)
+            else:
+                operation(db, index)
+
+    seconds = time.perf_counter() - start
+    event.remove(engine, "commit", record)
+
+    return seconds, len(commits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--users", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = get_engine()
+    permission = CRUDBase(Permission)
+    operation = admin_operation(CRUDRole(Role), CRUDBase(Account), args.users)
+
+    for mode, uow in (("commit per call", False), ("unit of work", True)):
+        with schema(engine):
+            with Session(engine, future=True) as db:
+                permission.create_multi(
+                    db, objs_in=[PermissionCreate(name=name) for name in PERMISSIONS]
+                )
+
+            seconds, commits = measure(engine, operation, args.operations, uow)
+
+        print(
+            f"{mode:<16} {args.operations / seconds:>8.0f} operations/s "
+            f"{seconds / args.operations * 1e3:>8.2f} ms/operation "
+            f"{commits / args.operations:>5.1f} commits/operation"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,26 @@ def init_database(request, connection, Base):
     request.addfinalizer(teardown)
 
 
+@pytest.fixture
+def commit_tables(request, engine):
+    """
+    Create the tables of a metadata in committed transactions of their own, for
+    tests whose sessions or connections cannot see the uncommitted tables of the
+    shared connection. They are dropped after the test.
+    """
+
+    def commit_tables(metadata: MetaData) -> None:
+        metadata.create_all(engine)
+
+        def teardown():
+            close_all_sessions()
+            metadata.drop_all(engine)
+
+        request.addfinalizer(teardown)
+
+    return commit_tables
+
+
 @pytest.fixture(scope="session")
 def db(connection) -> Generator:
     Session = sessionmaker(bind=connection)
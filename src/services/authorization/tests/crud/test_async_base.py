@@ -0,0 +1,165 @@
+import asyncio
+import uuid
+from collections.abc import Generator
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.base import Operation
+from app.database.custom_types import CompositeType
+
+
+@pytest.fixture(scope="module")
+def User(Base):
+    class User(Base):
+        __tablename__ = "async_user"
+
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        email = Column(String, nullable=False)
+        full_name = Column(
+            CompositeType(
+                "async_full_name",
+                [
+                    Column("first_name", String),
+                    Column("last_name", String),
+                    Column("middle_name", String),
+                ],
+            ),
+            nullable=False,
+        )
+
+    return User
+
+
+@pytest.fixture(autouse=True)
+def init_database(commit_tables, Base, User):
+    commit_tables(Base.metadata)
+
+
+@pytest.fixture
+def run(engine) -> Generator:
+    async_engine = create_async_engine(
+        engine.url.set(drivername="postgresql+asyncpg"), future=True
+    )
+
+    def run(test):
+        async def main():
+            async with AsyncSession(
+                async_engine, expire_on_commit=False, future=True
+            ) as db:
+                return await test(db)
+
+        return asyncio.run(main())
+
+    yield run
+
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def base(User):
+    return AsyncCRUDBase(model=User)
+
+
+class UserCreate(BaseModel):
+    id: uuid.UUID | None
+    email: str
+    full_name: dict[str, str] | tuple
+
+
+class UserUpdate(BaseModel):
+    email: str
+
+
+def test_create(run, base: AsyncCRUDBase):
+    id = uuid.uuid4()
+
+    user_in = UserCreate(
+        id=id,
+        email="test@planner.planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+    )
+
+    user = run(lambda db: base.create(db, obj_in=user_in))
+
+    assert user.id == id
+    assert user.email == "test@planner.planner"
+    assert user.full_name.first_name == "FirstTest"
+    assert user.full_name.middle_name == "MiddleTest"
+
+
+def test_get(run, base: AsyncCRUDBase):
+    user_in = UserCreate(
+        email="test@planner.planner",
+        full_name={
+            "first_name": "FirstTest",
+            "last_name": "LastTest",
+            "middle_name": "MiddleTest",
+        },
+    )
+
+    async def test(db):
+        user = await base.create(db, obj_in=user_in)
+        db.expunge_all()
+
+        return await base.get(db, id=user.id)
+
+    get_user = run(test)
+
+    assert get_user
+    assert get_user.email == "test@planner.planner"
+    assert get_user.full_name.last_name == "LastTest"
+
+
+def test_get_multi(run, base: AsyncCRUDBase):
+    async def test(db):
+        for email in ("test@planner.planner", "test_two@planner.planner"):
+            await base.create(
+                db, obj_in=UserCreate(email=email, full_name=("First", "Last", ""))
+            )
+
+        return await base.get_multi(db)
+
+    users = run(test)
+
+    assert [user.email for user in users] == [
+        "test@planner.planner",
+        "test_two@planner.planner",
+    ]
+
+
+def test_update(run, base: AsyncCRUDBase):
+    user_in = UserCreate(email="test@planner.planner", full_name=("First", "Last", ""))
+
+    async def test(db):
+        user = await base.create(db, obj_in=user_in)
+
+        return await base.update(
+            db, db_obj=user, obj_in=UserUpdate(email="update@planner.planner")
+        )
+
+    user = run(test)
+
+    assert user.email == "update@planner.planner"
+
+
+def test_remove(run, base: AsyncCRUDBase):
+    user_in = UserCreate(email="test@planner.planner", full_name=("First", "Last", ""))
+    events = []
+    base.add_write_listener(lambda operation, ids: events.append(operation))
+
+    async def test(db):
+        user = await base.create(db, obj_in=user_in)
+        remove_user = await base.remove(db, id=user.id)
+
+        return user, remove_user, await base.get(db, id=user.id)
+
+    user, remove_user, get_user = run(test)
+
+    assert remove_user.id == user.id
+    assert get_user is None
+    assert events == [Operation.CREATE, Operation.REMOVE]
@@ -2,7 +2,7 @@ import uuid
 
 import pytest
 from pydantic import BaseModel
-from sqlalchemy import Column, String
+from sqlalchemy import Boolean, Column, String, event, true
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session, close_all_sessions
 
@@ -14,6 +14,8 @@ def User(Base):
     class User(Base):
         id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
         email = Column(String, nullable=False)
+        nickname = Column(String, index=True)
+        is_active = Column(Boolean, nullable=False, server_default=true())
 
     return User
 
@@ -34,6 +36,20 @@ def base(User):
     return CRUDBase(model=User)
 
 
+@pytest.fixture
+def statements(db: Session):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split(None, 1)[0])
+
+    event.listen(db.get_bind(), "before_cursor_execute", count)
+
+    yield statements
+
+    event.remove(db.get_bind(), "before_cursor_execute", count)
+
+
 class UserCreate(BaseModel):
     id: uuid.UUID | None
     email: str
@@ -65,6 +81,151 @@ def test_get(db: Session, base: CRUDBase):
     assert get_user.email == "test@planner.planner"
 
 
+def test_project(db: Session, base: CRUDBase):
+    users = base.create_multi(
+        db,
+        objs_in=[
+            UserCreate(email=f"user_{index}@planner.planner") for index in range(3)
+        ],
+    )
+    users.sort(key=lambda user: user.id)
+    db.expunge_all()
+
+    rows = base.project(db, columns=["id", "email"], skip=1, limit=1)
+
+    assert [tuple(row) for row in rows] == [(users[1].id, users[1].email)]
+    assert [row.email for row in base.project(db)] == [user.email for user in users]
+    assert len(db.identity_map) == 0
+
+
+def test_project_unknown(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError):
+        base.project(db, columns=["password"])
+
+    with pytest.raises(TypeError):
+        base.project(db, into=dict)
+
+
+def test_get_reuses_statement(db: Session, base: CRUDBase):
+    users = base.create_multi(
+        db,
+        objs_in=[UserCreate(email="test@planner.planner") for _ in range(2)],
+    )
+    statement = base._lookup("id")
+
+    assert [base.get(db, id=user.id) for user in users] == users
+    assert base._lookup("id") is statement
+    # Statements for another load plan are not cached.
+    assert base._lookup("id", {}) is not base._lookup("id", {})
+
+
+def test_get_many(db: Session, base: CRUDBase):
+    users = base.create_multi(
+        db,
+        objs_in=[
+            UserCreate(email=f"user_{index}@planner.planner") for index in range(5)
+        ],
+    )
+    ids = [users[3].id, uuid.uuid4(), users[0].id, users[3].id, users[1].id]
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", count)
+
+    try:
+        get_users = base.get_many(db, ids=ids, chunk_size=2)
+        base.get_many(db, ids=ids[:1])
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", count)
+
+    assert list(get_users) == [users[3].id, users[0].id, users[1].id]
+    assert get_users[users[0].id].email == "user_0@planner.planner"
+    # One statement per chunk, the same text whatever the number of ids.
+    assert len(statements) == 3
+    assert len(set(statements)) == 1
+    assert "= ANY (CAST(" in statements[0]
+
+
+@pytest.mark.parametrize(
+    "returning, expected",
+    [
+        (
+            False,
+            {
+                "create": ["INSERT", "SELECT"],
+                "update": ["UPDATE", "SELECT"],
+                "unchanged": ["SELECT"],
+                "remove": ["SELECT", "DELETE"],
+            },
+        ),
+        (
+            True,
+            {
+                "create": ["INSERT"],
+                "update": ["UPDATE"],
+                "unchanged": [],
+                "remove": ["DELETE"],
+            },
+        ),
+    ],
+)
+def test_statements_per_write(
+    db: Session, User, statements: list[str], returning: bool, expected
+):
+    base = CRUDBase(model=User, returning=returning)
+    executed = {}
+
+    user = base.create(db, obj_in=UserCreate(email="test@planner.planner"))
+    executed["create"] = statements[:]
+
+    # Server defaults are read back with the row.
+    assert user.is_active is True
+
+    statements.clear()
+    user = base.update(db, db_obj=user, obj_in={"email": "update@planner.planner"})
+    executed["update"] = statements[:]
+
+    assert user.email == "update@planner.planner"
+
+    statements.clear()
+    user = base.update(
+        db, db_obj=user, obj_in={"email": "update@planner.planner", "is_active": True}
+    )
+    executed["unchanged"] = statements[:]
+
+    id = user.id
+    db.expire(user)
+    statements.clear()
+    user = base.remove(db, id=id)
+    executed["remove"] = statements[:]
+
+    assert user.id == id
+    assert base.get(db, id=id) is None
+    assert executed == expected
+
+
+@pytest.mark.parametrize("returning", [False, True])
+def test_update_set_attribute(db: Session, User, returning: bool):
+    base = CRUDBase(model=User, returning=returning)
+
+    user = base.create(db, obj_in=UserCreate(email="test@planner.planner"))
+    user.email = "update@planner.planner"
+    user.is_active = False
+
+    user = base.update(db, db_obj=user, obj_in={"email": "update@planner.planner"})
+    db.expire(user)
+
+    assert user.email == "update@planner.planner"
+    assert user.is_active is False
+
+
+def test_get_many_not_unique(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError, match="not unique"):
+        base.get_many(db, ids=["test@planner.planner"], by="email")
+
+
 def test_get_multi(db: Session, base: CRUDBase):
     user_in_one = UserCreate(email="test@planner.planner")
     user_in_two = UserCreate(email="test@planner.planner")
@@ -100,6 +261,26 @@ def test_update_schema(db: Session, base: CRUDBase):
     assert user.email == "update@planner.planner"
 
 
+@pytest.mark.parametrize("returning", [False, True])
+def test_update_detached(db: Session, User, returning: bool):
+    base = CRUDBase(model=User, returning=returning)
+
+    user = base.create(db, obj_in=UserCreate(email="test@planner.planner"))
+    db.expunge(user)
+
+    user = base.update(db, db_obj=user, obj_in={"email": "update@planner.planner"})
+
+    assert user.email == "update@planner.planner"
+    assert base.get(db, id=user.id).email == "update@planner.planner"
+
+
+@pytest.mark.parametrize("returning", [False, True])
+def test_remove_missing(db: Session, User, returning: bool):
+    base = CRUDBase(model=User, returning=returning)
+
+    assert base.remove(db, id=uuid.uuid4()) is None
+
+
 def test_remove(db: Session, base: CRUDBase):
     id = uuid.uuid4()
 
@@ -111,3 +292,163 @@ def test_remove(db: Session, base: CRUDBase):
 
     assert remove_user.id == user.id
     assert get_user is None
+
+
+def test_create_multi(db: Session, base: CRUDBase):
+    id = uuid.uuid4()
+
+    users_in = [
+        UserCreate(id=id, email="test@planner.planner"),
+        UserCreate(email="test_two@planner.planner"),
+        UserCreate(email="test_three@planner.planner"),
+    ]
+
+    users = base.create_multi(db, objs_in=users_in, chunk_size=2)
+
+    assert len(users) == 3
+    assert users[0].id == id
+    assert [user.email for user in users] == [user_in.email for user_in in users_in]
+    assert base.get(db, id=users[2].id) is users[2]
+
+
+def test_update_multi(db: Session, base: CRUDBase):
+    users_in = [
+        UserCreate(email="test@planner.planner"),
+        UserCreate(email="test_two@planner.planner"),
+    ]
+
+    user_one, user_two = base.create_multi(db, objs_in=users_in)
+
+    users = base.update_multi(
+        db,
+        objs_in={
+            user_two.id: {"email": "update_two@planner.planner"},
+            user_one.id: UserUpdate(email="update@planner.planner"),
+        },
+        chunk_size=1,
+    )
+
+    assert [user.id for user in users] == [user_two.id, user_one.id]
+    assert users[0].email == "update_two@planner.planner"
+    assert users[1].email == "update@planner.planner"
+
+
+def test_update_multi_missing(db: Session, base: CRUDBase):
+    user_one, user_two = base.create_multi(
+        db,
+        objs_in=[
+            UserCreate(email="test@planner.planner"),
+            UserCreate(email="test_two@planner.planner"),
+        ],
+    )
+
+    users = base.update_multi(
+        db,
+        objs_in={
+            user_one.id: {"email": "update@planner.planner"},
+            uuid.uuid4(): {"email": "missing@planner.planner"},
+            user_two.id: {"email": "update_two@planner.planner"},
+        },
+        chunk_size=2,
+    )
+
+    assert [user.id for user in users] == [user_one.id, user_two.id]
+    assert base.get(db, id=user_two.id).email == "update_two@planner.planner"
+    assert base.update_multi(db, objs_in={uuid.uuid4(): {"email": "x"}}) == []
+
+
+def test_remove_multi(db: Session, base: CRUDBase):
+    users_in = [
+        UserCreate(email="test@planner.planner"),
+        UserCreate(email="test_two@planner.planner"),
+        UserCreate(email="test_three@planner.planner"),
+    ]
+
+    users = base.create_multi(db, objs_in=users_in)
+    ids = [users[0].id, users[2].id]
+
+    remove_users = base.remove_multi(db, ids=ids)
+
+    assert {user.id for user in remove_users} == set(ids)
+    assert base.get(db, id=ids[0]) is None
+    assert base.get(db, id=users[1].id)
+
+
+def test_get_page(db: Session, base: CRUDBase):
+    users_in = [UserCreate(email=f"test_{index}@planner.planner") for index in range(5)]
+
+    base.create_multi(db, objs_in=users_in)
+
+    first_page = base.get_page(db, limit=2)
+    second_page = base.get_page(db, after=first_page.next_cursor, limit=2)
+    last_page = base.get_page(db, after=second_page.next_cursor, limit=2)
+
+    ids = [user.id for user in first_page.items + second_page.items + last_page.items]
+
+    assert len(first_page.items) == 2
+    assert len(last_page.items) == 1
+    assert last_page.next_cursor is None
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 5
+
+
+def test_get_page_descending(db: Session, base: CRUDBase):
+    users_in = [UserCreate(email=f"test_{index}@planner.planner") for index in range(3)]
+
+    base.create_multi(db, objs_in=users_in)
+
+    first_page = base.get_page(db, limit=2, descending=True)
+    last_page = base.get_page(
+        db, after=first_page.next_cursor, limit=2, descending=True
+    )
+
+    ids = [user.id for user in first_page.items + last_page.items]
+
+    assert ids == sorted(ids, reverse=True)
+
+
+def test_get_page_not_indexed(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError):
+        base.get_page(db, order_by="email")
+
+
+def test_get_page_nullable(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError, match="nullable"):
+        base.get_page(db, order_by="nickname")
+
+
+def test_get_page_limit(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError):
+        base.get_page(db, limit=0)
+
+
+def test_get_page_malformed_cursor(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError):
+        base.get_page(db, after="not a cursor")
+
+
+def test_iter_all(db: Session, base: CRUDBase):
+    users_in = [UserCreate(email=f"test_{index}@planner.planner") for index in range(5)]
+
+    users = base.create_multi(db, objs_in=users_in)
+
+    iter_users = list(base.iter_all(db, batch_size=2))
+
+    assert [user.id for user in iter_users] == sorted(user.id for user in users)
+
+
+def test_iter_columns(db: Session, base: CRUDBase):
+    users_in = [UserCreate(email=f"test_{index}@planner.planner") for index in range(5)]
+
+    base.create_multi(db, objs_in=users_in)
+
+    rows = list(base.iter_columns(db, "email", batch_size=2))
+
+    assert sorted(row.email for row in rows) == sorted(
+        user_in.email for user_in in users_in
+    )
+
+
+def test_iter_columns_unknown(db: Session, base: CRUDBase):
+    with pytest.raises(ValueError):
+        list(base.iter_columns(db, "name"))
@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, String, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.coalescing import BatchLoader, CoalescingReader, SingleFlight
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        __tablename__ = "coalesced_role"
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String, nullable=False, unique=True)
+
+    return Role
+
+
+@pytest.fixture(autouse=True)
+def init_database(commit_tables, engine, Base, Role):
+    commit_tables(Base.metadata)
+
+    with engine.begin() as connection:
+        connection.execute(
+            Role.__table__.insert(),
+            [{"id": id, "name": f"role_{id}"} for id in range(1, 11)],
+        )
+
+
+@pytest.fixture
+def run(engine):
+    async_engine = create_async_engine(
+        engine.url.set(drivername="postgresql+asyncpg"), future=True
+    )
+    statements = []
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def session_factory():
+        return AsyncSession(async_engine, expire_on_commit=False, future=True)
+
+    def run(test):
+        statements.clear()
+
+        return asyncio.run(test(session_factory)), statements
+
+    yield run
+
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def crud(Role):
+    return AsyncCRUDBase(model=Role)
+
+
+def test_single_flight():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+        return len(calls)
+
+    async def test():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", call) for _ in range(10)))
+
+        assert len(flight) == 0
+
+        return results + [await flight.do("key", call)]
+
+    assert asyncio.run(test()) == [1] * 10 + [2]
+
+
+def test_batch_loader():
+    batches = []
+
+    async def batch(keys):
+        batches.append(keys)
+
+        return {key: key * 2 for key in keys if key != 3}
+
+    async def test():
+        loader = BatchLoader(batch, max_batch_size=2)
+
+        return await loader.load_many([1, 2, 1, 3, 4])
+
+    assert asyncio.run(test()) == [2, 4, 2, None, 8]
+    assert batches == [[1, 2], [3, 4]]
+
+
+def test_batch_loader_in_flight():
+    batches = []
+    release = None
+
+    async def batch(keys):
+        batches.append(keys)
+        await release.wait()
+
+        return {key: key * 2 for key in keys}
+
+    async def test():
+        nonlocal release
+        release = asyncio.Event()
+        loader = BatchLoader(batch)
+
+        first = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The batch loading key 1 is running, so this load waits for it.
+        second = asyncio.ensure_future(loader.load_many([1, 2]))
+        await asyncio.sleep(0)
+        release.set()
+
+        results = [await first, await second]
+        after = await loader.load(1)
+
+        return results, after
+
+    assert asyncio.run(test()) == ([2, [2, 4]], 2)
+    assert batches == [[1], [2], [1]]
+
+
+def test_batch_loader_error():
+    async def batch(keys):
+        raise RuntimeError("Database unavailable.")
+
+    async def test():
+        loader = BatchLoader(batch)
+
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), return_exceptions=True
+        )
+
+    assert [str(error) for error in asyncio.run(test())] == [
+        "Database unavailable.",
+        "Database unavailable.",
+    ]
+
+
+def test_get_batched(run, crud):
+    async def test(session_factory):
+        reader = CoalescingReader(crud, session_factory)
+
+        return await asyncio.gather(*(reader.get(id) for id in [1, 2, 2, 3, 11] * 20))
+
+    roles, statements = run(test)
+
+    assert [role and role.name for role in roles[:5]] == [
+        "role_1",
+        "role_2",
+        "role_2",
+        "role_3",
+        None,
+    ]
+    assert roles[1] is roles[2] is roles[6]
+    assert len(statements) == 1
+    assert " IN " in statements[0]
+
+
+def test_get_merged(run, crud):
+    async def test(session_factory):
+        reader = CoalescingReader(crud, session_factory, batch=False)
+
+        return await asyncio.gather(*(reader.get(id) for id in [1, 2] * 20))
+
+    roles, statements = run(test)
+
+    assert {role.name for role in roles} == {"role_1", "role_2"}
+    assert len(statements) == 2
+
+
+def test_get_multi_where_in(run, crud):
+    async def test(session_factory):
+        reader = CoalescingReader(crud, session_factory)
+
+        return await asyncio.gather(
+            *(
+                reader.get_multi_where_in(names, column="name")
+                for names in [["role_1", "role_2"], ["role_2", "role_1"]] * 10
+            )
+        )
+
+    results, statements = run(test)
+
+    assert all(
+        sorted(role.name for role in roles) == ["role_1", "role_2"] for roles in results
+    )
+    assert len(statements) == 1
+
+
+def test_get_multi_where_in_unknown_column(run, crud):
+    async def test(session_factory):
+        async with session_factory() as db:
+            await crud.get_multi_where_in(db, list_=[1], column="missing")
+
+    with pytest.raises(ValueError):
+        run(test)
@@ -0,0 +1,171 @@
+import time
+import uuid
+from collections.abc import Generator
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase, Operation
+from app.crud.notifications import NotificationListener
+from app.database.connection import listen_connection
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        __tablename__ = "notification_role"
+
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Role
+
+
+@pytest.fixture(scope="module")
+def User(Base):
+    class User(Base):
+        __tablename__ = "notification_user"
+
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        email = Column(String, nullable=False)
+
+    return User
+
+
+@pytest.fixture(autouse=True)
+def init_database(commit_tables, Base, Role, User):
+    commit_tables(Base.metadata)
+
+
+@pytest.fixture
+def db(engine) -> Generator:
+    with Session(engine, future=True) as db:
+        yield db
+
+
+class RoleCreate(BaseModel):
+    name: str
+
+
+class UserCreate(BaseModel):
+    email: str
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[tuple[Operation, list]] = []
+
+    def __call__(self, operation, ids) -> None:
+        self.events.append((operation, list(ids)))
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def listener(engine, Role, User, recorder):
+    # CRUDs of another worker: they only receive what the writer publishes.
+    role = CRUDBase(Role)
+    user = CRUDBase(User)
+    role.add_write_listener(recorder)
+    user.add_write_listener(recorder)
+
+    listener = NotificationListener(
+        [role, user], connect=lambda: listen_connection(engine)
+    )
+    listener.listen()
+
+    yield listener
+
+    listener.stop()
+
+
+def test_publish_create_update_remove(
+    db: Session, Role, listener: NotificationListener, recorder: Recorder
+):
+    crud = CRUDBase(Role, notify=True)
+
+    role = crud.create(db, obj_in=RoleCreate(name="admin"))
+    crud.update(db, db_obj=role, obj_in={"name": "user"})
+    crud.remove(db, id=role.id)
+
+    assert listener.poll(timeout=1) == 3
+    assert recorder.events == [
+        (Operation.CREATE, [role.id]),
+        (Operation.UPDATE, [role.id]),
+        (Operation.REMOVE, [role.id]),
+    ]
+
+
+def test_publish_multi_uuid(
+    db: Session, User, listener: NotificationListener, recorder: Recorder
+):
+    crud = CRUDBase(User, notify=True)
+
+    users_in = [
+        UserCreate(email=f"test_{index}@planner.planner") for index in range(250)
+    ]
+    users = crud.create_multi(db, objs_in=users_in)
+
+    assert listener.poll(timeout=1) == 3
+    assert [id for _, ids in recorder.events for id in ids] == [
+        user.id for user in users
+    ]
+
+
+def test_without_notify(
+    db: Session, Role, listener: NotificationListener, recorder: Recorder
+):
+    crud = CRUDBase(Role)
+
+    crud.create(db, obj_in=RoleCreate(name="admin"))
+
+    assert listener.poll(timeout=0.1) == 0
+    assert recorder.events == []
+
+
+def test_rollback_is_not_published(
+    db: Session, Role, listener: NotificationListener, recorder: Recorder
+):
+    crud = CRUDBase(Role, notify=True)
+
+    crud.create(db, obj_in=RoleCreate(name="admin"))
+
+    with pytest.raises(Exception):
+        crud.create(db, obj_in=RoleCreate(name="admin"))
+
+    db.rollback()
+
+    assert listener.poll(timeout=1) == 1
+    assert len(recorder.events) == 1
+
+
+def test_reset_on_reconnect(listener: NotificationListener):
+    resets = []
+    listener.add_reset_listener(lambda: resets.append(True))
+
+    listener.listen()
+
+    assert resets == [True]
+
+
+def test_background_thread(
+    db: Session, Role, listener: NotificationListener, recorder: Recorder
+):
+    crud = CRUDBase(Role, notify=True)
+
+    listener.start()
+    crud.create(db, obj_in=RoleCreate(name="admin"))
+
+    deadline = time.monotonic() + 5
+
+    while not recorder.events and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    listener.stop()
+
+    assert recorder.events[0][0] is Operation.CREATE
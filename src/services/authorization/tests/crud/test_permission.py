@@ -47,6 +47,13 @@ def test_get(db: Session, crud: CRUDPermission):
     assert get_permission.name == "view_users"
 
 
+def test_get_by_name(db: Session, crud: CRUDPermission):
+    permission = crud.create(db, obj_in=PermissionCreate(name="view_users"))
+
+    assert crud.get_by_name(db, name="view_users") is permission
+    assert crud.get_by_name(db, name="create_users") is None
+
+
 def test_get_multi(db: Session, crud: CRUDPermission):
     permission_in_one = PermissionCreate(name="view_users")
     permission_in_two = PermissionCreate(name="create_users")
@@ -77,6 +84,52 @@ def test_get_multi_where_in(db: Session, crud: CRUDPermission):
     assert permissions_db[1].name in permissions
 
 
+def test_get_page(db: Session, crud: CRUDPermission):
+    names = ["create_users", "read_users", "remove_users", "update_users"]
+
+    crud.create_multi(db, objs_in=[PermissionCreate(name=name) for name in names])
+
+    first_page = crud.get_page(db, limit=3, order_by="name")
+    last_page = crud.get_page(
+        db, after=first_page.next_cursor, limit=3, order_by="name"
+    )
+
+    assert [permission.name for permission in first_page.items] == names[:3]
+    assert [permission.name for permission in last_page.items] == names[3:]
+    assert last_page.next_cursor is None
+
+
+def test_upsert_multi(db: Session, crud: CRUDPermission):
+    existing = crud.create(db, obj_in=PermissionCreate(name="view_users"))
+
+    permissions = crud.upsert_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name="create_users"),
+            PermissionCreate(name="view_users"),
+            PermissionCreate(name="create_users"),
+        ],
+        on="name",
+    )
+
+    assert [permission.name for permission in permissions] == [
+        "create_users",
+        "view_users",
+        "create_users",
+    ]
+    assert permissions[0] is permissions[2]
+    assert permissions[1] is existing
+    assert len(crud.get_multi(db)) == 2
+
+
+def test_upsert_not_unique(db: Session, crud: CRUDPermission):
+    with pytest.raises(ValueError):
+        crud.upsert(db, obj_in=PermissionCreate(name="view_users"), on="id")
+
+    with pytest.raises(ValueError):
+        crud.upsert(db, obj_in=PermissionCreate(name="view_users"), on="title")
+
+
 def test_update(db: Session, crud: CRUDPermission):
     permission_in = PermissionCreate(name="view_users")
 
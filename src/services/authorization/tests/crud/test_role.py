@@ -124,6 +124,13 @@ def test_get(db: Session, crud: CRUDRole):
     assert get_role.name == "admin"
 
 
+def test_get_by_name(db: Session, crud: CRUDRole):
+    role = crud.create(db, obj_in=RoleCreate(name="admin"))
+
+    assert crud.get_by_name(db, name="admin") is role
+    assert crud.get_by_name(db, name="user") is None
+
+
 def test_get_multi(db: Session, crud: CRUDRole):
     role_in_one = RoleCreate(name="admin")
     role_in_two = RoleCreate(name="user")
@@ -160,3 +167,54 @@ def test_remove(db: Session, crud: CRUDRole):
 
     assert remove_role.id == role.id
     assert get_role is None
+
+
+def test_grant_revoke(db: Session, crud: CRUDRole, crud_permission: CRUDPermission):
+    crud_permission.create_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name=name)
+            for name in ("create_user", "read_user", "remove_user")
+        ],
+    )
+    admin = crud.create(db, obj_in=RoleCreate(name="admin"))
+    user = crud.create(db, obj_in=RoleCreate(name="user"))
+
+    added = crud.grant(
+        db, ids=[admin.id, user.id], permission_names=["create_user", "read_user"]
+    )
+
+    assert added == 4
+    assert crud.grant(db, ids=[admin.id], permission_names=["read_user"]) == 0
+    assert crud.get_permission_names(db, id=user.id) == {"create_user", "read_user"}
+
+    removed = crud.revoke(db, ids=[user.id], permission_names=["create_user"])
+
+    assert removed == 1
+    assert crud.get_permission_names(db, id=user.id) == {"read_user"}
+    assert crud.get_permission_names(db, id=admin.id) == {"create_user", "read_user"}
+
+    with pytest.raises(ValueError):
+        crud.grant(db, ids=[admin.id], permission_names=["unknown"])
+
+
+def test_sync_permissions(db: Session, crud: CRUDRole, crud_permission: CRUDPermission):
+    crud_permission.create_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name=name)
+            for name in ("create_user", "read_user", "remove_user")
+        ],
+    )
+    role = crud.create(db, obj_in=RoleCreate(name="admin"))
+    crud.grant(db, ids=[role.id], permission_names=["create_user", "read_user"])
+
+    changes = crud.sync_permissions(
+        db, ids=[role.id], permission_names=["read_user", "remove_user"]
+    )
+
+    assert changes == (1, 1)
+    assert crud.get_permission_names(db, id=role.id) == {"read_user", "remove_user"}
+
+    assert crud.sync_permissions(db, ids=[role.id], permission_names=[]) == (0, 2)
+    assert crud.get_permission_names(db, id=role.id) == frozenset()
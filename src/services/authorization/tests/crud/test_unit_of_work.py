@@ -0,0 +1,119 @@
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, String, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase, Operation
+from app.crud.unit_of_work import unit_of_work
+
+
+@pytest.fixture(scope="module")
+def Item(Base):
+    class Item(Base):
+        __tablename__ = "uow_item"
+
+        name = Column(String, nullable=False, unique=True)
+
+    return Item
+
+
+@pytest.fixture(autouse=True)
+def init_database(commit_tables, Base, Item):
+    commit_tables(Base.metadata)
+
+
+@pytest.fixture
+def commits(engine):
+    commits = []
+
+    def count(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", count)
+
+    yield commits
+
+    event.remove(engine, "commit", count)
+
+
+@pytest.fixture
+def crud(Item):
+    return CRUDBase(model=Item)
+
+
+@pytest.fixture
+def events(crud):
+    events = []
+    crud.add_write_listener(lambda operation, ids: events.append((operation, ids)))
+
+    return events
+
+
+class ItemCreate(BaseModel):
+    name: str
+
+
+def names(engine, Item):
+    with Session(engine, future=True) as db:
+        return db.execute(select(Item.name).order_by(Item.id)).scalars().all()
+
+
+def test_commit_per_call(engine, Item, crud, commits):
+    with Session(engine, future=True) as db:
+        for name in ("one", "two", "three"):
+            crud.create(db, obj_in=ItemCreate(name=name))
+
+    assert len(commits) == 3
+
+
+def test_single_commit(engine, Item, crud, commits, events):
+    with Session(engine, future=True) as db:
+        with unit_of_work(db):
+            one = crud.create(db, obj_in=ItemCreate(name="one"))
+            crud.create_multi(
+                db, objs_in=[ItemCreate(name="two"), ItemCreate(name="three")]
+            )
+            crud.update(db, db_obj=one, obj_in={"name": "first"})
+
+            assert commits == []
+            assert events == []
+
+    assert len(commits) == 1
+    assert [operation for operation, _ in events] == [
+        Operation.CREATE,
+        Operation.CREATE,
+        Operation.UPDATE,
+    ]
+    assert names(engine, Item) == ["first", "two", "three"]
+
+
+def test_rollback(engine, Item, crud, commits, events):
+    with Session(engine, future=True) as db:
+        with pytest.raises(RuntimeError):
+            with unit_of_work(db):
+                crud.create(db, obj_in=ItemCreate(name="one"))
+                raise RuntimeError()
+
+    assert commits == []
+    assert events == []
+    assert names(engine, Item) == []
+
+
+def test_savepoint(engine, Item, crud, commits, events):
+    with Session(engine, future=True) as db:
+        with unit_of_work(db) as uow:
+            crud.create(db, obj_in=ItemCreate(name="one"))
+
+            with pytest.raises(IntegrityError):
+                with uow.savepoint():
+                    crud.create(db, obj_in=ItemCreate(name="two"))
+                    crud.create(db, obj_in=ItemCreate(name="one"))
+
+            # A nested unit of work is a savepoint of the outer one.
+            with unit_of_work(db):
+                crud.create(db, obj_in=ItemCreate(name="three"))
+
+    assert len(commits) == 1
+    assert len(events) == 2
+    assert names(engine, Item) == ["one", "three"]
@@ -1,13 +1,28 @@
 import uuid
 
 import pytest
-from sqlalchemy import Boolean, CheckConstraint, Column, ForeignKey, Integer, String
+from pydantic import BaseModel
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    select,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Session, close_all_sessions, relationship
 
+from app.config import PasswordHashSettings
+from app.crud.permission import CRUDPermission, PermissionCreate
 from app.crud.role import CRUDRole, RoleCreate
-from app.crud.user import CRUDUser, UserCreate, UserUpdate
+from app.crud.user import CRUDUser, UserCreate, UserRow, UserUpdate
 from app.database.custom_types import CompositeType
+from app.database.views import MaterializedView
+from app.security import PasswordHasher
 
 
 @pytest.fixture(scope="module")
@@ -48,10 +63,40 @@ def Role(Base):
         name = Column(String, unique=True, index=True, nullable=False)
 
         users = relationship("User", back_populates="role")
+        role_permission_associations = relationship(
+            "RolePermissionAssociation", back_populates="role"
+        )
 
     return Role
 
 
+@pytest.fixture(scope="module")
+def Permission(Base):
+    class Permission(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Permission
+
+
+@pytest.fixture(scope="module")
+def RolePermissionAssociation(Base, Role, Permission):
+    class RolePermissionAssociation(Base):
+        __tablename__ = "role_permission"
+
+        id = None
+        role_id = Column(ForeignKey("role.id"), primary_key=True)
+        permission_id = Column(ForeignKey("permission.id"), primary_key=True)
+
+        role = relationship("Role", back_populates="role_permission_associations")
+        permission = relationship("Permission")
+
+        __table_args__ = (
+            Index("ix_role_permission_permission_id", "permission_id", "role_id"),
+        )
+
+    return RolePermissionAssociation
+
+
 # FIXME: temp solution
 @pytest.fixture(scope="module")
 def Direction(Base):
@@ -64,7 +109,9 @@ def Direction(Base):
 
 
 @pytest.fixture(autouse=True)
-def init_database(request, connection, Base, User, Role, Direction):
+def init_database(
+    request, connection, Base, User, Role, Direction, RolePermissionAssociation
+):
     Base.metadata.create_all(connection)
 
     def teardown():
@@ -79,11 +126,91 @@ def crud(User):
     return CRUDUser(model=User)
 
 
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(
+        PasswordHashSettings(time_cost=1, memory_cost=8, parallelism=1, workers=2)
+    )
+
+    yield hasher
+
+    hasher.shutdown()
+
+
+@pytest.fixture
+def crud_hashed(User, hasher):
+    return CRUDUser(model=User, hasher=hasher)
+
+
 @pytest.fixture
 def crud_role(Role):
     return CRUDRole(Role)
 
 
+@pytest.fixture
+def crud_permission(Permission):
+    return CRUDPermission(Permission)
+
+
+@pytest.fixture
+def permission_user(
+    db: Session, crud: CRUDUser, crud_role: CRUDRole, crud_permission: CRUDPermission
+):
+    crud_permission.create_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name=name)
+            for name in ("create_user", "read_user", "remove_user")
+        ],
+    )
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+    crud_role.grant(db, ids=[role.id], permission_names=["create_user", "read_user"])
+
+    return crud.create(
+        db,
+        obj_in=UserCreate(
+            email="test@planner.planner",
+            password="planner",
+            full_name=("FirstTest", "LastTest", "MiddleTest"),
+            role_id=role.id,
+        ),
+    )
+
+
+def plan_nodes(plan: dict):
+    yield plan
+
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+class UserSummary(BaseModel):
+    email: str
+    full_name: tuple[str, str, str]
+
+
+def test_project(db: Session, crud: CRUDUser, permission_user):
+    (row,) = crud.project(db, into=UserRow)
+
+    assert row == UserRow(
+        id=permission_user.id,
+        email="test@planner.planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=permission_user.role_id,
+        direction_id=None,
+        is_active=True,
+    )
+    assert row.full_name.middle_name == "MiddleTest"
+    assert not hasattr(row, "__dict__")
+
+    assert crud.project(db, into=UserSummary) == [
+        UserSummary(
+            email="test@planner.planner",
+            full_name=("FirstTest", "LastTest", "MiddleTest"),
+        )
+    ]
+
+
 def test_create(db: Session, crud: CRUDUser, crud_role: CRUDRole):
     role_in = RoleCreate(name="admin")
 
@@ -153,6 +280,43 @@ def test_get_multi(db: Session, crud: CRUDUser, crud_role: CRUDRole):
     assert users[1].email == "test_two@planner.planner"
 
 
+def test_get_multi_load_plan(
+    db: Session, crud: CRUDUser, crud_role: CRUDRole, User, Role
+):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    crud.create_multi(
+        db,
+        objs_in=[
+            UserCreate(
+                email=f"test_{index}@planner.planner",
+                password="planner",
+                full_name=("FirstTest", "LastTest", "MiddleTest"),
+                role_id=role.id,
+            )
+            for index in range(2)
+        ],
+    )
+    db.expunge_all()
+
+    users = crud.get_multi(db)
+
+    assert all("role" in user.__dict__ for user in users)
+    assert users[0].role is users[1].role
+
+    db.expunge_all()
+
+    roles = crud_role.get_multi(db, load_plan={"users": "selectin"})
+
+    assert len(roles[0].__dict__["users"]) == 2
+
+    with pytest.raises(ValueError):
+        crud.get_multi(db, load_plan={"role": "eager"})
+
+    with pytest.raises(ValueError):
+        crud.get_multi(db, load_plan={"role.permissions": "joined"})
+
+
 def test_update(db: Session, crud: CRUDUser, crud_role: CRUDRole):
     role_in = RoleCreate(name="admin")
 
@@ -192,3 +356,281 @@ def test_remove(db: Session, crud: CRUDUser, crud_role: CRUDRole):
 
     assert remove_user.id == user.id
     assert get_user is None
+
+
+def test_create_multi(db: Session, crud: CRUDUser, crud_role: CRUDRole):
+    role_in = RoleCreate(name="admin")
+
+    role = crud_role.create(db, obj_in=role_in)
+
+    users_in = [
+        UserCreate(
+            email=f"test_{index}@planner.planner",
+            password="planner",
+            full_name=("FirstTest", "LastTest", "MiddleTest"),
+            role_id=role.id,
+        )
+        for index in range(3)
+    ]
+
+    users = crud.create_multi(db, objs_in=users_in)
+
+    assert [user.email for user in users] == [user_in.email for user_in in users_in]
+    assert users[0].full_name.first_name == "FirstTest"
+    assert users[0].is_active
+    assert users[0].role.name == "admin"
+
+
+def test_upsert(db: Session, crud_hashed: CRUDUser, crud_role: CRUDRole):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    user_in = UserCreate(
+        email="test@planner.planner",
+        password="planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=role.id,
+    )
+
+    user = crud_hashed.upsert(db, obj_in=user_in, on="email")
+    upserted = crud_hashed.upsert(
+        db,
+        obj_in=user_in.copy(update={"full_name": ("First", "Last", "Middle")}),
+        on="email",
+    )
+
+    assert upserted is user
+    assert user.full_name.first_name == "First"
+    assert user.password != "planner"
+    assert crud_hashed.authenticate(
+        db, email="test@planner.planner", password="planner"
+    )
+
+
+def test_create_hashed(
+    db: Session, crud_hashed: CRUDUser, crud_role: CRUDRole, hasher: PasswordHasher
+):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    user_in = UserCreate(
+        email="test@planner.planner",
+        password="planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=role.id,
+    )
+
+    user = crud_hashed.create(db, obj_in=user_in)
+    users = crud_hashed.create_multi(
+        db, objs_in=[user_in.copy(update={"email": "test_two@planner.planner"})]
+    )
+
+    assert user.password != "planner"
+    assert hasher.verify(user.password, "planner")
+    assert hasher.verify(users[0].password, "planner")
+
+
+def test_update_hashed(
+    db: Session, crud_hashed: CRUDUser, crud_role: CRUDRole, hasher: PasswordHasher
+):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    user_in = UserCreate(
+        email="test@planner.planner",
+        password="planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=role.id,
+    )
+
+    user_db = crud_hashed.create(db, obj_in=user_in)
+    hash = user_db.password
+
+    user_in = UserUpdate.from_orm(user_db)
+    user_in.email = "update@planner.planner"
+
+    user = crud_hashed.update(db, db_obj=user_db, obj_in=user_in)
+
+    assert user.password == hash
+
+    user = crud_hashed.update(db, db_obj=user, obj_in={"password": "changed"})
+
+    assert hasher.verify(user.password, "changed")
+
+
+def test_update_multi_hashed(
+    db: Session, crud_hashed: CRUDUser, crud_role: CRUDRole, hasher: PasswordHasher
+):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    users = crud_hashed.create_multi(
+        db,
+        objs_in=[
+            UserCreate(
+                email=f"test_{index}@planner.planner",
+                password="planner",
+                full_name=("FirstTest", "LastTest", "MiddleTest"),
+                role_id=role.id,
+            )
+            for index in range(2)
+        ],
+    )
+    hash = users[1].password
+
+    users = crud_hashed.update_multi(
+        db,
+        objs_in={
+            users[0].id: {"password": "changed"},
+            users[1].id: UserUpdate.from_orm(users[1]),
+        },
+    )
+
+    assert users[0].password.startswith("$argon2")
+    assert hasher.verify(users[0].password, "changed")
+    assert users[1].password == hash
+
+
+def test_authenticate(db: Session, crud_hashed: CRUDUser, crud_role: CRUDRole):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    user_in = UserCreate(
+        email="test@planner.planner",
+        password="planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=role.id,
+    )
+
+    user = crud_hashed.create(db, obj_in=user_in)
+
+    assert crud_hashed.authenticate(db, email=user.email, password="planner") is user
+    assert crud_hashed.authenticate(db, email=user.email, password="wrong") is None
+    assert (
+        crud_hashed.authenticate(db, email="none@planner.planner", password="") is None
+    )
+
+
+def test_authenticate_unknown_email_verifies(
+    db: Session, crud_hashed: CRUDUser, hasher: PasswordHasher, monkeypatch
+):
+    verified = []
+    verify = hasher.verify
+
+    def record(hash: str, password: str) -> bool:
+        verified.append(hash)
+        return verify(hash, password)
+
+    monkeypatch.setattr(hasher, "verify", record)
+
+    assert (
+        crud_hashed.authenticate(db, email="none@planner.planner", password="x") is None
+    )
+    assert verified == [hasher.dummy_hash]
+
+
+def test_authenticate_rehash(db: Session, User, crud_hashed: CRUDUser, crud_role):
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+
+    user_in = UserCreate(
+        email="test@planner.planner",
+        password="planner",
+        full_name=("FirstTest", "LastTest", "MiddleTest"),
+        role_id=role.id,
+    )
+
+    user = crud_hashed.create(db, obj_in=user_in)
+    hash = user.password
+
+    stronger = PasswordHasher(
+        PasswordHashSettings(time_cost=2, memory_cost=8, parallelism=1, workers=1)
+    )
+    crud = CRUDUser(model=User, hasher=stronger)
+
+    user = crud.authenticate(db, email=user.email, password="planner")
+
+    assert user
+    assert user.password != hash
+    assert not stronger.check_needs_rehash(user.password)
+
+    stronger.shutdown()
+
+
+def test_permissions_for_user(db: Session, crud: CRUDUser, permission_user):
+    assert crud.permissions_for_user(db, id=permission_user.id) == {
+        "create_user",
+        "read_user",
+    }
+    assert crud.has_permission(db, id=permission_user.id, permission_name="read_user")
+    assert not crud.has_permission(
+        db, id=permission_user.id, permission_name="remove_user"
+    )
+
+    crud.update(db, db_obj=permission_user, obj_in={"is_active": False})
+
+    assert not crud.has_permission(
+        db, id=permission_user.id, permission_name="read_user"
+    )
+    assert crud.permissions_for_user(db, id=permission_user.id) == frozenset()
+
+
+def test_has_permission_uses_indexes(db: Session, crud: CRUDUser, permission_user):
+    query = crud._permission_names(permission_user.id)
+    statement = select(
+        query.where(query.selected_columns[0] == "read_user").exists()
+    ).compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+
+    # The tables are tiny, so rule sequential scans out to see which indexes the
+    # query can be served by.
+    db.execute(text("SET enable_seqscan = off"))
+    (plan,) = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar_one()
+    db.execute(text("RESET enable_seqscan"))
+
+    scans = {
+        node["Relation Name"]: node["Node Type"]
+        for node in plan_nodes(plan["Plan"])
+        if "Relation Name" in node
+    }
+
+    assert set(scans) == {"user", "role_permission", "permission"}
+    assert all(node_type.startswith("Index") for node_type in scans.values())
+
+
+def test_permission_view(
+    db: Session,
+    User,
+    Permission,
+    RolePermissionAssociation,
+    crud_role: CRUDRole,
+    permission_user,
+):
+    view = MaterializedView(
+        "user_permission",
+        select(User.id.label("user_id"), Permission.name)
+        .join_from(
+            User,
+            RolePermissionAssociation,
+            RolePermissionAssociation.role_id == User.role_id,
+        )
+        .join(RolePermissionAssociation.permission)
+        .where(User.is_active.is_(True)),
+        unique=("user_id", "name"),
+        schema="dev",
+    )
+    crud = CRUDUser(User, permission_view=view)
+    connection = db.connection()
+
+    view.create(connection)
+    view.refresh_on_writes(connection, crud_role)
+
+    try:
+        assert crud.has_permission(
+            db, id=permission_user.id, permission_name="read_user"
+        )
+
+        crud_role.grant(
+            db, ids=[permission_user.role_id], permission_names=["remove_user"]
+        )
+
+        assert crud.permissions_for_user(db, id=permission_user.id) == {
+            "create_user",
+            "read_user",
+            "remove_user",
+        }
+    finally:
+        view.drop(connection)
@@ -0,0 +1,211 @@
+import uuid
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import Session, close_all_sessions, relationship
+
+from app.crud.permission import CRUDPermission, PermissionCreate, PermissionUpdate
+from app.crud.role import CRUDRole
+from app.crud.user import CRUDUser
+from app.services.authorization_snapshot import AuthorizationSnapshot, SnapshotBuilder
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+        role_permission_associations = relationship(
+            "RolePermissionAssociation", back_populates="role"
+        )
+
+        permissions = association_proxy("role_permission_associations", "permission")
+
+    return Role
+
+
+@pytest.fixture(scope="module")
+def Permission(Base):
+    class Permission(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Permission
+
+
+@pytest.fixture(scope="module")
+def RolePermissionAssociation(Base):
+    class RolePermissionAssociation(Base):
+        __tablename__ = "role_permission"
+
+        id = None
+        role_id = Column(ForeignKey("role.id"), primary_key=True)
+        permission_id = Column(ForeignKey("permission.id"), primary_key=True)
+
+        role = relationship("Role", back_populates="role_permission_associations")
+        permission = relationship("Permission")
+
+        def __init__(self, permission) -> None:
+            self.permission = permission
+
+    return RolePermissionAssociation
+
+
+@pytest.fixture(scope="module")
+def User(Base):
+    class User(Base):
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        email = Column(String, nullable=False)
+        role_id = Column(Integer, ForeignKey("role.id"), nullable=False)
+        is_active = Column(Boolean, nullable=False, default=True)
+
+    return User
+
+
+@pytest.fixture(autouse=True)
+def init_database(
+    request, connection, Base, Role, Permission, RolePermissionAssociation, User
+):
+    Base.metadata.create_all(connection)
+
+    def teardown():
+        close_all_sessions()
+        Base.metadata.drop_all(connection)
+
+    request.addfinalizer(teardown)
+
+
+@pytest.fixture
+def crud_role(Role):
+    return CRUDRole(Role)
+
+
+@pytest.fixture
+def crud_permission(Permission):
+    return CRUDPermission(Permission)
+
+
+@pytest.fixture
+def crud_user(User):
+    return CRUDUser(User)
+
+
+@pytest.fixture
+def builder(crud_role, crud_permission, crud_user):
+    return SnapshotBuilder(crud_role, crud_permission, crud_user)
+
+
+class RoleCreate(BaseModel):
+    id: int | None
+    name: str
+    permissions: list | None
+
+
+class UserCreate(BaseModel):
+    email: str
+    role_id: int
+    is_active: bool = True
+
+
+@pytest.fixture
+def role(db: Session, crud_role: CRUDRole, crud_permission: CRUDPermission):
+    crud_permission.create_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name="create_user"),
+            PermissionCreate(name="read_user"),
+            PermissionCreate(name="remove_user"),
+        ],
+    )
+    role = crud_role.create(db, obj_in=RoleCreate(name="admin"))
+    crud_role.grant(db, ids=[role.id], permission_names=["create_user", "read_user"])
+
+    return role
+
+
+@pytest.fixture
+def user(db: Session, crud_user: CRUDUser, role):
+    return crud_user.create(
+        db, obj_in=UserCreate(email="test@planner.planner", role_id=role.id)
+    )
+
+
+def test_build(db: Session, builder: SnapshotBuilder, crud_user: CRUDUser, role, user):
+    inactive_user = crud_user.create(
+        db,
+        obj_in=UserCreate(
+            email="inactive@planner.planner", role_id=role.id, is_active=False
+        ),
+    )
+
+    snapshot = builder.build(db)
+
+    assert snapshot.permissions_for_role(role.id) == {"create_user", "read_user"}
+    assert snapshot.role_has_permission(role.id, "read_user")
+    assert not snapshot.role_has_permission(role.id, "remove_user")
+    assert not snapshot.role_has_permission(role.id, "unknown")
+    assert snapshot.user_has_permission(user.id, "create_user")
+    assert not snapshot.user_has_permission(inactive_user.id, "create_user")
+    assert not snapshot.user_has_permission(uuid.uuid4(), "create_user")
+    assert not builder.stale
+
+
+def test_writes_before_build(
+    db: Session, builder: SnapshotBuilder, crud_user: CRUDUser, role, user
+):
+    # Nothing is recorded until there is a snapshot to refresh.
+    assert not (builder._roles or builder._permissions or builder._users)
+
+    builder.build(db)
+    crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+
+    assert builder._users == {user.id}
+
+
+def test_dumps_loads(db: Session, builder: SnapshotBuilder, user):
+    snapshot = builder.build(db)
+
+    assert AuthorizationSnapshot.loads(snapshot.dumps()) == snapshot
+    assert AuthorizationSnapshot.loads(AuthorizationSnapshot().dumps()) == (
+        AuthorizationSnapshot()
+    )
+
+    with pytest.raises(ValueError):
+        AuthorizationSnapshot.loads(snapshot.dumps()[:-1])
+
+    with pytest.raises(ValueError):
+        AuthorizationSnapshot.loads(b"snapshot")
+
+
+def test_refresh(
+    db: Session,
+    builder: SnapshotBuilder,
+    crud_role: CRUDRole,
+    crud_permission: CRUDPermission,
+    crud_user: CRUDUser,
+    role,
+    user,
+):
+    snapshot = builder.build(db)
+
+    crud_permission.create(db, obj_in=PermissionCreate(name="export_users"))
+    crud_role.sync_permissions(
+        db, ids=[role.id], permission_names=["read_user", "export_users"]
+    )
+    permission_db = crud_permission.get_multi_where_in(db, list_=["read_user"])[0]
+    crud_permission.update(
+        db, db_obj=permission_db, obj_in=PermissionUpdate(name="view_user")
+    )
+    crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+
+    assert builder.stale
+
+    refreshed = builder.refresh(db)
+
+    assert refreshed.permissions_for_role(role.id) == {"view_user", "export_users"}
+    assert not refreshed.user_has_permission(user.id, "view_user")
+    assert snapshot.user_has_permission(user.id, "read_user")
+    assert refreshed == builder.build(db)
+    assert builder.refresh(db) is builder.snapshot
@@ -0,0 +1,197 @@
+import uuid
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import Session, close_all_sessions, relationship
+
+from app.crud.permission import CRUDPermission, PermissionCreate, PermissionUpdate
+from app.crud.role import CRUDRole, RoleUpdate
+from app.crud.user import CRUDUser
+from app.services.permission_resolver import PermissionResolver
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+        role_permission_associations = relationship(
+            "RolePermissionAssociation", back_populates="role"
+        )
+
+        permissions = association_proxy("role_permission_associations", "permission")
+
+    return Role
+
+
+@pytest.fixture(scope="module")
+def Permission(Base):
+    class Permission(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Permission
+
+
+@pytest.fixture(scope="module")
+def RolePermissionAssociation(Base):
+    class RolePermissionAssociation(Base):
+        __tablename__ = "role_permission"
+
+        id = None
+        role_id = Column(ForeignKey("role.id"), primary_key=True)
+        permission_id = Column(ForeignKey("permission.id"), primary_key=True)
+
+        role = relationship("Role", back_populates="role_permission_associations")
+        permission = relationship("Permission")
+
+        def __init__(self, permission) -> None:
+            self.permission = permission
+
+    return RolePermissionAssociation
+
+
+@pytest.fixture(scope="module")
+def User(Base):
+    class User(Base):
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        email = Column(String, nullable=False)
+        role_id = Column(Integer, ForeignKey("role.id"), nullable=False)
+        is_active = Column(Boolean, nullable=False, default=True)
+
+    return User
+
+
+@pytest.fixture(autouse=True)
+def init_database(
+    request, connection, Base, Role, Permission, RolePermissionAssociation, User
+):
+    Base.metadata.create_all(connection)
+
+    def teardown():
+        close_all_sessions()
+        Base.metadata.drop_all(connection)
+
+    request.addfinalizer(teardown)
+
+
+@pytest.fixture
+def crud_role(Role):
+    return CRUDRole(Role)
+
+
+@pytest.fixture
+def crud_permission(Permission):
+    return CRUDPermission(Permission)
+
+
+@pytest.fixture
+def crud_user(User):
+    return CRUDUser(User)
+
+
+@pytest.fixture
+def resolver(crud_role, crud_permission, crud_user):
+    return PermissionResolver(crud_role, crud_permission, crud_user)
+
+
+class RoleCreate(BaseModel):
+    id: int | None
+    name: str
+    permissions: list | None
+
+
+class UserCreate(BaseModel):
+    email: str
+    role_id: int
+    is_active: bool = True
+
+
+@pytest.fixture
+def role(db: Session, crud_role: CRUDRole, crud_permission: CRUDPermission):
+    crud_permission.create_multi(
+        db,
+        objs_in=[
+            PermissionCreate(name="create_user"),
+            PermissionCreate(name="read_user"),
+            PermissionCreate(name="remove_user"),
+        ],
+    )
+
+    permissions_db = crud_permission.get_multi_where_in(
+        db, list_=["create_user", "read_user"]
+    )
+
+    return crud_role.create(
+        db, obj_in=RoleCreate(name="admin", permissions=permissions_db)
+    )
+
+
+def test_role_has_permission(db: Session, resolver: PermissionResolver, role):
+    assert resolver.permissions_for_role(db, role.id) == {"create_user", "read_user"}
+    assert resolver.role_has_permission(db, role.id, "read_user")
+    assert not resolver.role_has_permission(db, role.id, "remove_user")
+
+
+def test_role_permissions_cached(db: Session, resolver: PermissionResolver, role):
+    resolver.permissions_for_role(db, role.id)
+
+    assert resolver.role_has_permission(None, role.id, "read_user")  # type: ignore
+
+
+def test_user_has_permission(
+    db: Session, resolver: PermissionResolver, crud_user: CRUDUser, role
+):
+    user = crud_user.create(
+        db, obj_in=UserCreate(email="test@planner.planner", role_id=role.id)
+    )
+    inactive_user = crud_user.create(
+        db,
+        obj_in=UserCreate(
+            email="inactive@planner.planner", role_id=role.id, is_active=False
+        ),
+    )
+
+    assert resolver.user_has_permission(db, user.id, "create_user")
+    assert not resolver.user_has_permission(db, user.id, "remove_user")
+    assert not resolver.user_has_permission(db, inactive_user.id, "create_user")
+    assert not resolver.user_has_permission(db, uuid.uuid4(), "create_user")
+
+
+def test_invalidate_on_role_write(
+    db: Session, resolver: PermissionResolver, crud_role: CRUDRole, role
+):
+    resolver.permissions_for_role(db, role.id)
+
+    crud_role.update(db, db_obj=role, obj_in=RoleUpdate(name="user"))
+
+    assert role.id not in resolver.roles
+
+
+def test_invalidate_on_permission_write(
+    db: Session, resolver: PermissionResolver, crud_permission: CRUDPermission, role
+):
+    resolver.permissions_for_role(db, role.id)
+
+    permission_db = crud_permission.get_multi_where_in(db, list_=["read_user"])[0]
+    crud_permission.update(
+        db, db_obj=permission_db, obj_in=PermissionUpdate(name="view_user")
+    )
+
+    assert resolver.permissions_for_role(db, role.id) == {"create_user", "view_user"}
+
+
+def test_invalidate_on_user_write(
+    db: Session, resolver: PermissionResolver, crud_user: CRUDUser, role
+):
+    user = crud_user.create(
+        db, obj_in=UserCreate(email="test@planner.planner", role_id=role.id)
+    )
+
+    assert resolver.user_has_permission(db, user.id, "create_user")
+
+    crud_user.update(db, db_obj=user, obj_in={"is_active": False})
+
+    assert not resolver.user_has_permission(db, user.id, "create_user")
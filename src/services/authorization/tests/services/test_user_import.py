@@ -0,0 +1,276 @@
+import io
+import json
+import uuid
+
+import pytest
+from sqlalchemy import Boolean, CheckConstraint, Column, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import close_all_sessions
+
+from app.config import PasswordHashSettings
+from app.crud.base import CRUDBase, copy_text, record_text
+from app.crud.direction import CRUDDirection
+from app.crud.role import CRUDRole
+from app.crud.user import CRUDUser
+from app.database.custom_types import CompositeType
+from app.models.user import regex_email
+from app.security import PasswordHasher
+from app.services.user_import import UserImporter, read_csv, read_ndjson
+
+
+@pytest.fixture(scope="module")
+def User(Base):
+    class User(Base):
+        id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+        email = Column(String, unique=True, index=True, nullable=False)
+        password = Column(String, nullable=False)
+        full_name = Column(
+            CompositeType(
+                "full_name",
+                [
+                    Column("first_name", String),
+                    Column("last_name", String),
+                    Column("middle_name", String),
+                ],
+            ),
+            nullable=False,
+        )
+        role_id = Column(Integer, ForeignKey("role.id"), nullable=False)
+        direction_id = Column(Integer, ForeignKey("direction.id"))
+        is_active = Column(Boolean, nullable=False, default=True)
+
+        __table_args__ = (
+            CheckConstraint(f"email ~ '{regex_email}'", name="email"),
+            # Not checked by the importer, so rows failing it reach the database.
+            CheckConstraint("(full_name).last_name <> ''", name="last_name"),
+        )
+
+    return User
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Role
+
+
+@pytest.fixture(scope="module")
+def Direction(Base):
+    class Direction(Base):
+        name = Column(String, unique=True, index=True, nullable=False)
+
+    return Direction
+
+
+@pytest.fixture(autouse=True)
+def init_database(request, connection, Base, User, Role, Direction):
+    Base.metadata.create_all(connection)
+
+    connection.execute(Role.__table__.insert(), [{"name": "admin"}, {"name": "user"}])
+    connection.execute(Direction.__table__.insert(), [{"name": "backend"}])
+
+    def teardown():
+        close_all_sessions()
+        Base.metadata.drop_all(connection)
+
+    request.addfinalizer(teardown)
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(
+        PasswordHashSettings(time_cost=1, memory_cost=8, parallelism=1, workers=2)
+    )
+
+    yield hasher
+
+    hasher.shutdown()
+
+
+@pytest.fixture
+def importer(User, Role, Direction, hasher):
+    return UserImporter(
+        CRUDUser(User, hasher=hasher),
+        CRUDRole(Role),
+        CRUDDirection(Direction),
+        batch_size=2,
+    )
+
+
+def test_copy_text():
+    assert copy_text(None) == "\\N"
+    assert copy_text(True) == "t"
+    assert copy_text("a\tb\\c\nd") == "a\\tb\\\\c\\nd"
+    assert copy_text(("A", None, "")) == '("A",,"")'
+
+
+def test_record_text():
+    assert record_text(['say "hi"', "back\\slash"]) == '("say ""hi""","back\\\\slash")'
+
+
+def test_copy_insert(db, User, Role):
+    crud = CRUDBase(User)
+    role_id = db.execute(Role.__table__.select()).first().id
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "email": email,
+            "password": "tab\tand\nnewline",
+            "full_name": ("O'Brien", 'Say "hi"', None),
+            "role_id": role_id,
+            "is_active": True,
+        }
+        for email in ["a@planner.planner", "b@planner.planner", "a@planner.planner"]
+    ]
+
+    assert crud.copy_insert(db, rows=rows, on="email") == [
+        rows[0]["id"],
+        rows[1]["id"],
+    ]
+    assert crud.copy_insert(db, rows=rows[:1], on="email") == []
+
+    user = crud.get(db, id=rows[0]["id"])
+
+    assert user.password == "tab\tand\nnewline"
+    assert tuple(user.full_name) == ("O'Brien", 'Say "hi"', None)
+
+
+def test_copy_insert_error(db, User, Role):
+    role_id = db.execute(Role.__table__.select()).first().id
+    row = {
+        "id": uuid.uuid4(),
+        "email": "a@planner.planner",
+        "password": None,
+        "full_name": ("A", "B", "C"),
+        "role_id": role_id,
+        "is_active": True,
+    }
+
+    # Raised by the COPY itself, as the temporary table keeps NOT NULL.
+    with pytest.raises(IntegrityError):
+        with db.begin_nested():
+            CRUDBase(User).copy_insert(db, rows=[row], on="email")
+
+
+def test_copy_insert_requires_unique_column(db, User):
+    with pytest.raises(ValueError):
+        CRUDBase(User).copy_insert(db, rows=[], on="password")
+
+
+def test_read_csv():
+    file = io.StringIO(
+        "email,password,first_name,last_name,middle_name,role,direction\n"
+        "a@planner.planner,secret,A,B,C,user,\n"
+    )
+
+    assert list(read_csv(file)) == [
+        (
+            2,
+            {
+                "email": "a@planner.planner",
+                "password": "secret",
+                "first_name": "A",
+                "last_name": "B",
+                "middle_name": "C",
+                "role": "user",
+                "direction": "",
+            },
+            None,
+        )
+    ]
+
+
+def test_read_ndjson():
+    file = io.StringIO('{"email": "a@planner.planner"}\n\nnot json\n[1]\n')
+    records = list(read_ndjson(file))
+
+    assert records[0] == (1, {"email": "a@planner.planner"}, None)
+    assert [(line, record) for line, record, _ in records[1:]] == [
+        (3, None),
+        (4, None),
+    ]
+    assert all(error is not None for _, _, error in records[1:])
+
+
+def test_import(db, User, importer, hasher):
+    full_name = {"first_name": "A", "last_name": "B", "middle_name": "C"}
+    records = [
+        {"email": "a@planner.planner", "password": "secret", "role": "user"},
+        {"email": "b@planner.planner", "password": "secret", "role": "nobody"},
+        {
+            "email": "c@planner.planner",
+            "password": "secret",
+            "role": "admin",
+            "direction": "backend",
+        },
+        {"email": "not an email", "password": "secret", "role": "user"},
+        {"email": "a@planner.planner", "password": "secret", "role": "user"},
+        {"email": "d@planner.planner", "role": "user"},
+    ]
+    rejects = io.StringIO()
+
+    report = importer.run(
+        db,
+        [
+            (line, {**record, "full_name": full_name}, None)
+            for line, record in enumerate(records, 1)
+        ]
+        + [(7, None, "Malformed JSON.")],
+        rejects,
+    )
+
+    assert (report.read, report.imported, report.rejected) == (7, 2, 5)
+
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+
+    assert sorted(reject["line"] for reject in rejected) == [2, 4, 5, 6, 7]
+    assert all(
+        reject["record"] is None or reject["record"].get("password") in (None, "***")
+        for reject in rejected
+    )
+
+    users = CRUDBase(User).get_many(
+        db, ids=["a@planner.planner", "c@planner.planner"], by="email"
+    )
+
+    assert users["c@planner.planner"].direction_id is not None
+    assert tuple(users["a@planner.planner"].full_name) == ("A", "B", "C")
+    assert hasher.verify(users["a@planner.planner"].password, "secret")
+
+
+def test_import_database_errors(db, User, importer):
+    full_name = {"first_name": "A", "last_name": "B", "middle_name": "C"}
+    records = [
+        {"email": "a@planner.planner\n", "full_name": full_name},
+        {"email": "b@planner.planner", "full_name": full_name},
+        {"email": "c@planner.planner", "full_name": {**full_name, "last_name": ""}},
+        {"email": "d@planner.planner", "full_name": full_name},
+        {"email": "e@planner.planner", "full_name": full_name},
+    ]
+    rejects = io.StringIO()
+
+    report = importer.run(
+        db,
+        [
+            (line, {**record, "password": "secret", "role": "user"}, None)
+            for line, record in enumerate(records, 1)
+        ],
+        rejects,
+    )
+
+    assert (report.read, report.imported, report.rejected) == (5, 3, 2)
+
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+
+    assert [reject["line"] for reject in rejected] == [1, 3]
+    assert "last_name" in rejected[1]["error"]
+    assert set(
+        CRUDBase(User).get_many(
+            db,
+            ids=[f"{name}@planner.planner" for name in "abcde"],
+            by="email",
+        )
+    ) == {"b@planner.planner", "d@planner.planner", "e@planner.planner"}
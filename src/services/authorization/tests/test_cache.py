@@ -0,0 +1,67 @@
+import pytest
+
+from app.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_get_set(clock: Clock):
+    cache = TTLCache(clock=clock)
+
+    cache.set("admin", frozenset({"read_user"}))
+
+    assert cache.get("admin") == frozenset({"read_user"})
+    assert cache.get("user") is None
+
+
+def test_ttl(clock: Clock):
+    cache = TTLCache(ttl=10, clock=clock)
+
+    cache.set("admin", 1)
+    clock.now = 9.9
+
+    assert cache.get("admin") == 1
+
+    clock.now = 10
+
+    assert cache.get("admin") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction(clock: Clock):
+    cache = TTLCache(maxsize=2, clock=clock)
+
+    cache.set("admin", 1)
+    cache.set("user", 2)
+    cache.get("admin")
+    cache.set("guest", 3)
+
+    assert "admin" in cache
+    assert "user" not in cache
+    assert "guest" in cache
+
+
+def test_invalidate(clock: Clock):
+    cache = TTLCache(clock=clock)
+
+    cache.set("admin", 1)
+    cache.set("user", 2)
+    cache.invalidate("admin")
+
+    assert cache.get("admin") is None
+    assert cache.get("user") == 2
+
+    cache.clear()
+
+    assert len(cache) == 0
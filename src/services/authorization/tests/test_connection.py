@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+
+from app.config import DatabaseSettings
+from app.database.connection import make_async_engine, make_engine, pool_stats
+
+
+@pytest.fixture
+def settings(engine):
+    return DatabaseSettings(url=engine.url.render_as_string(hide_password=False))
+
+
+def test_echo_only_in_dev():
+    assert not DatabaseSettings().echo
+    assert DatabaseSettings(environment="dev").echo
+    assert not DatabaseSettings(environment="dev", echo=False).echo
+
+
+def test_lazy_loads_reported_only_in_dev():
+    assert DatabaseSettings().lazy_load_threshold is None
+    assert DatabaseSettings(environment="dev").lazy_load_threshold == 10
+    assert DatabaseSettings(lazy_load_threshold=5).lazy_load_threshold == 5
+
+
+def test_make_engine(settings: DatabaseSettings):
+    settings.pool_size = 3
+    settings.max_overflow = 2
+    settings.statement_timeout = 1500
+
+    engine = make_engine(settings)
+
+    with engine.connect() as connection:
+        statement_timeout = connection.execute(text("SHOW statement_timeout"))
+
+        assert statement_timeout.scalar() == "1500ms"
+
+    assert not engine.echo
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+
+    engine.dispose()
+
+
+def test_make_async_engine(settings: DatabaseSettings):
+    settings.statement_timeout = 1500
+
+    async def main():
+        engine = make_async_engine(settings)
+
+        async with engine.connect() as connection:
+            statement_timeout = await connection.execute(text("SHOW statement_timeout"))
+
+        await engine.dispose()
+
+        return statement_timeout.scalar()
+
+    assert asyncio.run(main()) == "1500ms"
+
+
+def test_pool_stats(settings: DatabaseSettings):
+    settings.pool_size = 1
+    settings.max_overflow = 1
+    settings.pool_timeout = 0.1
+
+    engine = make_engine(settings)
+
+    with engine.connect(), engine.connect():
+        stats = pool_stats(engine)
+
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+
+        with pytest.raises(TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_max"] >= 0.1
+
+    engine.dispose()
+
+    assert pool_stats(engine)["checkouts"] == 2
@@ -1,7 +1,14 @@
+from unittest import mock
+
 import pytest
-from sqlalchemy import Column, String
+from psycopg2 import extensions
+from sqlalchemy import Column, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
 from sqlalchemy.orm import Session, close_all_sessions
 
+from app.config import DatabaseSettings
+from app.database import custom_types
+from app.database.connection import make_engine
 from app.database.custom_types import CompositeType
 
 
@@ -60,3 +67,103 @@ class TestCompositeType:
         user = db.query(User).filter_by(id=user.id).first()
 
         assert user.full_name.first_name == "FirstTest"
+
+
+class TestCompositeTypeProcessors:
+    @pytest.fixture
+    def full_name(self):
+        return CompositeType(
+            "full_name",
+            [
+                Column("first_name", String),
+                Column("last_name", String),
+                Column("middle_name", String),
+            ],
+        )
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            ("First", "Last", "Middle"),
+            ["First", "Last", "Middle"],
+            {"middle_name": "Middle", "first_name": "First", "last_name": "Last"},
+        ],
+    )
+    def test_bind_processor(self, full_name, value):
+        process = full_name.bind_processor(psycopg2.dialect())
+
+        assert process(value) == ("First", "Last", "Middle")
+        assert process(None) is None
+
+    def test_bind_processor_single_column(self):
+        composite = CompositeType("code", [Column("value", String)])
+        process = composite.bind_processor(psycopg2.dialect())
+
+        assert process({"value": "x"}) == ("x",)
+        assert process(["x"]) == ("x",)
+
+    def test_result_processor(self, full_name):
+        assert full_name.result_processor(psycopg2.dialect(), None) is None
+
+        process = full_name.result_processor(asyncpg.dialect(), None)
+        value = process(("First", "Last", "Middle"))
+
+        assert value.last_name == "Last"
+        assert process(None) is None
+
+
+class TestCompositeTypeRegistration:
+    @pytest.fixture(scope="class")
+    def table(self):
+        return Table(
+            "registered_user",
+            MetaData(schema="dev"),
+            Column("id", Integer, primary_key=True),
+            Column(
+                "full_name",
+                CompositeType(
+                    "registered_full_name",
+                    [Column("first_name", String), Column("last_name", String)],
+                ),
+            ),
+        )
+
+    @pytest.fixture(scope="class", autouse=True)
+    def init_database(self, request, engine, table):
+        table.metadata.create_all(engine)
+
+        with engine.begin() as connection:
+            connection.execute(
+                table.insert().values(id=1, full_name=("FirstTest", "LastTest"))
+            )
+
+        request.addfinalizer(lambda: table.metadata.drop_all(engine))
+
+    def test_registered_on_connect(self, engine, table):
+        # Simulate a process started against an existing schema.
+        caster = custom_types._casters.pop("dev.registered_full_name")
+        extensions.string_types.pop(caster.oid)
+
+        settings = DatabaseSettings(url=engine.url.render_as_string(False))
+        new_engine = make_engine(settings)
+
+        with new_engine.connect() as connection:
+            full_name = connection.execute(select(table.c.full_name)).scalar_one()
+
+        assert full_name.first_name == "FirstTest"
+        assert custom_types._casters["dev.registered_full_name"].oid == caster.oid
+
+        # New connections register the cached caster without a catalog lookup.
+        with mock.patch.object(custom_types, "register_composite") as lookup:
+            with new_engine.connect() as first, new_engine.connect() as second:
+                for connection in (first, second):
+                    full_name = connection.execute(
+                        select(table.c.full_name)
+                    ).scalar_one()
+
+                    assert full_name.last_name == "LastTest"
+
+        assert "dev.registered_full_name" not in {
+            call.args[0] for call in lookup.call_args_list
+        }
+        new_engine.dispose()
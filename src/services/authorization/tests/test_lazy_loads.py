@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, event, select
+from sqlalchemy.orm import Session, close_all_sessions, relationship, selectinload
+
+from app.database.lazy_loads import LazyLoadDetector, NPlusOneError
+
+
+@pytest.fixture(scope="module")
+def Role(Base):
+    class Role(Base):
+        name = Column(String, nullable=False)
+
+        users = relationship("User")
+
+    return Role
+
+
+@pytest.fixture(scope="module")
+def User(Base, Role):
+    class User(Base):
+        role_id = Column(Integer, ForeignKey("role.id"), nullable=False)
+
+    return User
+
+
+@pytest.fixture(autouse=True)
+def init_database(request, connection, db: Session, Base, Role, User):
+    Base.metadata.create_all(connection)
+
+    db.add_all(Role(name=f"role_{index}", users=[User()]) for index in range(3))
+    db.commit()
+
+    def teardown():
+        close_all_sessions()
+        Base.metadata.drop_all(connection)
+
+    request.addfinalizer(teardown)
+
+
+@pytest.fixture
+def detect(db: Session):
+    detectors = []
+
+    def detect(detector: LazyLoadDetector) -> LazyLoadDetector:
+        event.listen(db, "do_orm_execute", detector)
+        detectors.append(detector)
+
+        return detector
+
+    yield detect
+
+    for detector in detectors:
+        event.remove(db, "do_orm_execute", detector)
+
+    db.info.pop("lazy_loads", None)
+
+
+def test_counts_lazy_loads(db: Session, detect, Role):
+    detector = detect(LazyLoadDetector(threshold=2))
+
+    for role in db.execute(select(Role)).scalars():
+        assert len(role.users) == 1
+
+    assert detector.counts(db) == {"Role.users": 3}
+
+
+def test_ignores_eager_loads(db: Session, detect, Role):
+    detector = detect(LazyLoadDetector(threshold=2))
+
+    roles = db.execute(
+        select(Role)
+        .options(selectinload(Role.users))
+        .execution_options(populate_existing=True)
+    ).scalars()
+
+    for role in roles:
+        assert len(role.users) == 1
+
+    assert not detector.counts(db)
+
+
+def test_threshold_logs(db: Session, detect, Role, caplog):
+    detect(LazyLoadDetector(threshold=2))
+
+    for role in db.execute(select(Role)).scalars():
+        role.users
+
+    assert "Role.users was lazily loaded more than 2 times" in caplog.text
+
+
+def test_threshold_raises(db: Session, detect, Role):
+    detect(LazyLoadDetector(threshold=2, raise_error=True))
+
+    with pytest.raises(NPlusOneError):
+        for role in db.execute(select(Role)).scalars():
+            role.users
@@ -0,0 +1,204 @@
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import Column, Integer, MetaData, String, create_engine, event, select
+from sqlalchemy.orm import as_declarative, close_all_sessions, sessionmaker
+
+from app.crud.base import CRUDBase
+from app.database.routing import ReplicaPool, RoutingSession
+
+
+# Stand-ins: the primary and both replicas are engines on the local server, told
+# apart by the statements each of them runs.
+@pytest.fixture
+def engines(engine):
+    engines = {
+        name: create_engine(engine.url, future=True)
+        for name in ("primary", "replica_one", "replica_two")
+    }
+    executed = []
+
+    for name, routed_engine in engines.items():
+        event.listen(
+            routed_engine,
+            "before_cursor_execute",
+            lambda *args, name=name: executed.append(name),
+        )
+
+    yield engines, executed
+
+    close_all_sessions()
+
+    for routed_engine in engines.values():
+        routed_engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def Item():
+    @as_declarative(metadata=MetaData(schema="dev"))
+    class Base:
+        id = Column(Integer, primary_key=True)
+
+    class Item(Base):
+        __tablename__ = "routed_item"
+
+        name = Column(String, nullable=False)
+
+    return Item
+
+
+@pytest.fixture(autouse=True)
+def init_database(commit_tables, engine, Item):
+    commit_tables(Item.metadata)
+
+    with engine.begin() as connection:
+        connection.execute(Item.__table__.insert(), [{"name": "one"}])
+
+
+class ItemCreate(BaseModel):
+    name: str
+
+
+def session_factory(engines, **kwargs):
+    replicas = ReplicaPool([engines["replica_one"], engines["replica_two"]], **kwargs)
+
+    return sessionmaker(
+        class_=RoutingSession,
+        primary=engines["primary"],
+        replicas=replicas,
+        future=True,
+    )
+
+
+def test_reads_round_robin(engines, Item):
+    engines, executed = engines
+    Session = session_factory(engines)
+
+    for _ in range(2):
+        with Session() as db:
+            db.execute(select(Item)).all()
+            db.execute(select(Item.name)).all()
+
+    # The first read also checked both replicas.
+    assert executed == [
+        "replica_one",
+        "replica_two",
+        "replica_one",
+        "replica_one",
+        "replica_two",
+        "replica_two",
+    ]
+
+
+def test_read_your_writes(engines, Item):
+    engines, executed = engines
+    Session = session_factory(engines, check_interval=60)
+    crud = CRUDBase(Item)
+
+    with Session() as db:
+        db.replicas.check()
+        executed.clear()
+
+        assert crud.get(db, id=1).name == "one"
+
+        item = crud.create(db, obj_in=ItemCreate(name="two"))
+
+        # Committed writes are read back from the primary too.
+        assert [item.name for item in crud.get_multi(db)] == ["one", "two"]
+        assert len(crud.get_many(db, ids=[1, item.id])) == 2
+        assert crud.project(db)
+        assert executed[0] == "replica_one"
+        assert set(executed[1:]) == {"primary"}
+
+    executed.clear()
+
+    with Session() as db:
+        assert crud.get(db, id=item.id).name == "two"
+        db.add(Item(name="three"))
+        db.flush()
+        assert crud.get(db, id=item.id).name == "two"
+        db.rollback()
+
+    assert executed[0] == "replica_two"
+    assert set(executed[1:]) == {"primary"}
+
+
+def test_locking_reads_use_primary(engines, Item):
+    engines, executed = engines
+    Session = session_factory(engines)
+
+    with Session() as db:
+        db.replicas.check()
+        executed.clear()
+        db.execute(select(Item).with_for_update()).all()
+        db.execute(select(Item)).all()
+
+    assert executed == ["primary", "primary"]
+
+
+def test_least_connections(engines, Item):
+    engines, executed = engines
+    Session = session_factory(engines, strategy="least_connections")
+
+    with Session() as busy:
+        busy.execute(select(Item)).all()
+        executed.clear()
+
+        with Session() as db:
+            db.execute(select(Item)).all()
+
+    assert executed == ["replica_two"]
+
+
+def test_fallback_to_primary(engine, engines, Item):
+    engines, executed = engines
+    unreachable = create_engine(
+        engine.url.set(port=1), future=True, connect_args={"connect_timeout": 1}
+    )
+    Session = sessionmaker(
+        class_=RoutingSession,
+        primary=engines["primary"],
+        replicas=ReplicaPool([unreachable, engines["replica_one"]]),
+        future=True,
+    )
+
+    with Session() as db:
+        db.execute(select(Item)).all()
+
+        assert db.replicas.available == [engines["replica_one"]]
+
+    class LaggingReplicaPool(ReplicaPool):
+        LAG_QUERY = select(10)
+
+    Session = sessionmaker(
+        class_=RoutingSession,
+        primary=engines["primary"],
+        replicas=LaggingReplicaPool([engines["replica_one"]], max_lag=5),
+        future=True,
+    )
+    executed.clear()
+
+    with Session() as db:
+        db.execute(select(Item)).all()
+
+    assert executed == ["replica_one", "primary"]
+
+
+def test_checks_after_interval(engines):
+    engines, executed = engines
+    now = [0.0]
+    replicas = ReplicaPool(
+        [engines["replica_one"]], check_interval=5, clock=lambda: now[0]
+    )
+
+    replicas.choose()
+    now[0] = 4
+    replicas.choose()
+    now[0] = 5
+    replicas.choose()
+
+    assert executed == ["replica_one", "replica_one"]
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        ReplicaPool([], strategy="random")
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from app.config import PasswordHashSettings
+from app.security import PasswordHasher
+
+
+def settings(**kwargs) -> PasswordHashSettings:
+    return PasswordHashSettings(
+        **{"time_cost": 1, "memory_cost": 8, "parallelism": 1, "workers": 2, **kwargs}
+    )
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(settings())
+
+    yield hasher
+
+    hasher.shutdown()
+
+
+def test_hash_verify(hasher: PasswordHasher):
+    hash = hasher.hash("planner")
+
+    assert hash.startswith("$argon2id$")
+    assert hasher.verify(hash, "planner")
+    assert not hasher.verify(hash, "wrong")
+    assert not hasher.verify("not a hash", "planner")
+
+
+def test_hash_many(hasher: PasswordHasher):
+    hashes = hasher.hash_many(["one", "two", "three"])
+
+    assert [hasher.verify(hash, "two") for hash in hashes] == [False, True, False]
+
+
+def test_async(hasher: PasswordHasher):
+    async def main():
+        hashes = await asyncio.gather(
+            hasher.hash_async("planner"), hasher.hash_async("planner")
+        )
+
+        return [await hasher.verify_async(hash, "planner") for hash in hashes]
+
+    assert asyncio.run(main()) == [True, True]
+
+
+def test_verify_and_update(hasher: PasswordHasher):
+    hash = hasher.hash("planner")
+
+    assert hasher.verify_and_update(hash, "planner") == (True, None)
+    assert hasher.verify_and_update(hash, "wrong") == (False, None)
+
+    stronger = PasswordHasher(settings(time_cost=2))
+
+    valid, new_hash = stronger.verify_and_update(hash, "planner")
+
+    assert valid
+    assert new_hash
+    assert stronger.check_needs_rehash(hash)
+    assert not stronger.check_needs_rehash(new_hash)
+
+    assert asyncio.run(stronger.verify_and_update_async(new_hash, "planner")) == (
+        True,
+        None,
+    )
+
+    stronger.shutdown()
+
+
+def test_process_executor():
+    hasher = PasswordHasher(settings(executor="process"))
+
+    hash = hasher.hash("planner")
+
+    assert hasher.verify(hash, "planner")
+
+    hasher.shutdown()
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        settings(executor="fiber")
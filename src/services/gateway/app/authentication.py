@@ -0,0 +1,94 @@
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.authorization import AuthorizationClient
+from app.cache import TTLCache
+from app.tokens import InvalidToken, TokenVerifier
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: str
+    permissions: frozenset[str]
+
+
+class Authenticator:
+    """
+    Resolves bearer tokens to principals: the token is verified locally and the
+    permissions of its subject are fetched from the authorization service. Both
+    outcomes are cached per token, and concurrent requests with a token that is
+    not cached share a single resolution.
+
+    :param ttl:
+        Seconds a principal is reused, never past the expiry of its token.
+    :param negative_ttl:
+        Seconds an invalid token is rejected without verifying it again. Invalid
+        tokens have a cache of their own, so they cannot evict principals.
+    """
+
+    def __init__(
+        self,
+        verifier: TokenVerifier,
+        authorization: AuthorizationClient,
+        *,
+        maxsize: int = 10_000,
+        ttl: float = 30.0,
+        negative_maxsize: int = 10_000,
+        negative_ttl: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.verifier = verifier
+        self.authorization = authorization
+
+        self.principals: TTLCache[str, Principal] = TTLCache(maxsize, ttl, clock)
+        self.invalid: TTLCache[str, str] = TTLCache(
+            negative_maxsize, negative_ttl, clock
+        )
+
+        self._resolving: dict[str, asyncio.Task[Principal]] = {}
+
+    async def authenticate(self, token: str) -> Principal:
+        """Return the principal of ``token``, raise InvalidToken if it is not valid."""
+        principal = self.principals.get(token)
+
+        if principal is not None:
+            return principal
+
+        error = self.invalid.get(token)
+
+        if error is not None:
+            raise InvalidToken(error)
+
+        task = self._resolving.get(token)
+
+        if task is None:
+            task = asyncio.ensure_future(self._resolve(token))
+            self._resolving[token] = task
+            task.add_done_callback(lambda _: self._resolving.pop(token, None))
+
+        # A cancelled request must not cancel the resolution others are waiting on.
+        return await asyncio.shield(task)
+
+    async def _resolve(self, token: str) -> Principal:
+        try:
+            claims = self.verifier.verify(token)
+        except InvalidToken as exc:
+            self.invalid.set(token, str(exc))
+            raise
+
+        user_id = claims["sub"]
+        principal = Principal(
+            user_id=user_id,
+            permissions=await self.authorization.permissions_for_user(user_id),
+        )
+
+        ttl = None
+
+        if "exp" in claims:
+            ttl = claims["exp"] + self.verifier.leeway - self.verifier.clock()
+
+        self.principals.set(token, principal, ttl)
+
+        return principal
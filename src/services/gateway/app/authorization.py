@@ -0,0 +1,27 @@
+from urllib.parse import quote
+
+import aiohttp
+
+
+class AuthorizationClient:
+    """
+    Fetches the permissions of users from the authorization service over the
+    pooled keep-alive connections of ``session``.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+        self.session = session
+        self.url = url.rstrip("/")
+
+    async def permissions_for_user(self, user_id: str) -> frozenset[str]:
+        async with self.session.get(
+            f"{self.url}/users/{quote(user_id, safe='')}/permissions"
+        ) as response:
+            # Unknown and inactive users have no permissions.
+            if response.status == 404:
+                return frozenset()
+
+            response.raise_for_status()
+            data = await response.json()
+
+        return frozenset(data["permissions"])
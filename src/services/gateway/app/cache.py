@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+
+Key = TypeVar("Key", bound=Hashable)
+Value = TypeVar("Value")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class TTLCache(Generic[Key, Value]):
+    """
+    LRU cache whose entries also expire. Used from the event loop only, so it is
+    not locked.
+
+    :param maxsize:
+        Number of entries kept before the least recently used one is evicted.
+    :param ttl:
+        Seconds an entry stays valid after it was set, unless set with a shorter
+        ``ttl`` of its own.
+    :param clock:
+        Monotonic time source, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be a positive integer.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+
+        self._data: OrderedDict[Key, tuple[float, Value]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Key) -> Value | None:
+        entry = self._data.get(key)
+
+        if entry is not None and entry[0] <= self.clock():
+            del self._data[key]
+            self.stats.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+
+        return entry[1]
+
+    def set(self, key: Key, value: Value, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+
+        if ttl <= 0:
+            return
+
+        self._data[key] = (self.clock() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Key) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
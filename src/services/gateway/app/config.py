@@ -0,0 +1,59 @@
+from pydantic import BaseModel, BaseSettings
+
+
+class Route(BaseModel):
+    """
+    :param url:
+        Upstream the path prefix is proxied to.
+    :param permission:
+        Permission the user needs, any authenticated user may pass if not set.
+    """
+
+    url: str
+    permission: str | None = None
+
+
+class GatewaySettings(BaseSettings):
+    """
+    Gateway configuration, read from ``GATEWAY_*`` environment variables.
+
+    :param token_secret:
+        HS256 key access tokens are signed with. Required, the gateway does not
+        start without it.
+    :param token_leeway:
+        Seconds of clock skew tolerated when checking ``exp`` and ``nbf``.
+    :param routes:
+        Upstreams by path prefix, as JSON in the environment. The longest matching
+        prefix wins.
+    :param token_cache_ttl:
+        Seconds the principal resolved from a token is reused, never past the
+        expiry of the token.
+    :param negative_cache_ttl:
+        Seconds an invalid token is rejected without verifying it again.
+    :param pool_limit:
+        Connections kept open to the authorization service and upstreams
+        together, unlimited if 0.
+    """
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+
+    token_secret: str
+    token_leeway: float = 30.0
+
+    authorization_url: str = "http://authorization:8000"
+    routes: dict[str, Route] = {}
+
+    token_cache_ttl: float = 30.0
+    token_cache_maxsize: int = 10_000
+    negative_cache_ttl: float = 10.0
+    negative_cache_maxsize: int = 10_000
+
+    pool_limit: int = 200
+    keepalive_timeout: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    chunk_size: int = 64 * 1024
+
+    class Config:
+        env_prefix = "GATEWAY_"
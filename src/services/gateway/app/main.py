@@ -1,6 +1,70 @@
-def hello_world() -> None:
-    print("Hello World!")
+from collections.abc import AsyncIterator
+
+import aiohttp
+from aiohttp import web
+
+from app.authentication import Authenticator
+from app.authorization import AuthorizationClient
+from app.config import GatewaySettings
+from app.proxy import Proxy
+from app.tokens import TokenVerifier
+
+
+PROXY = web.AppKey("proxy", Proxy)
+
+
+def create_app(settings: GatewaySettings) -> web.Application:
+    app = web.Application()
+
+    async def client_session(app: web.Application) -> AsyncIterator[None]:
+        # One pool of keep-alive connections for the authorization service and all
+        # upstreams. Bodies are passed through as they are, still compressed.
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.pool_limit,
+                keepalive_timeout=settings.keepalive_timeout,
+            ),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=settings.connect_timeout,
+                sock_read=settings.read_timeout,
+            ),
+            auto_decompress=False,
+        )
+
+        authenticator = Authenticator(
+            TokenVerifier(settings.token_secret, leeway=settings.token_leeway),
+            AuthorizationClient(session, settings.authorization_url),
+            maxsize=settings.token_cache_maxsize,
+            ttl=settings.token_cache_ttl,
+            negative_maxsize=settings.negative_cache_maxsize,
+            negative_ttl=settings.negative_cache_ttl,
+        )
+        proxy = Proxy(
+            settings.routes,
+            authenticator,
+            session,
+            chunk_size=settings.chunk_size,
+        )
+        app[PROXY] = proxy
+
+        yield
+
+        await session.close()
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        return await request.app[PROXY].handle(request)
+
+    app.cleanup_ctx.append(client_session)
+    app.router.add_route("*", "/{path:.*}", handle)
+
+    return app
+
+
+def main() -> None:
+    settings = GatewaySettings()
+
+    web.run_app(create_app(settings), host=settings.host, port=settings.port)
 
 
 if __name__ == "__main__":
-    hello_world()
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import re
+
+import aiohttp
+from aiohttp import web
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from app.authentication import Authenticator
+from app.config import Route
+from app.tokens import InvalidToken
+
+
+# Headers describing a single connection, which are not forwarded by proxies.
+HOP_BY_HOP_HEADERS = frozenset(
+    (
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "host",
+    )
+)
+
+USER_ID_HEADER = "X-User-Id"
+
+
+def forwarded_headers(headers: CIMultiDictProxy[str]) -> CIMultiDict[str]:
+    connection_headers = {
+        name.strip().lower()
+        for value in headers.getall("Connection", [])
+        for name in value.split(",")
+    }
+
+    return CIMultiDict(
+        (name, value)
+        for name, value in headers.items()
+        if name.lower() not in HOP_BY_HOP_HEADERS
+        and name.lower() not in connection_headers
+    )
+
+
+# Encoded characters an upstream may decode into a dot segment.
+DOT_SEGMENT_ESCAPES = re.compile("%2e|%2f|%5c", re.IGNORECASE)
+
+
+def has_dot_segment(raw_path: str) -> bool:
+    """
+    Whether a path has a ``.`` or ``..`` segment, plain or percent-encoded, which
+    an upstream resolving it would serve from outside the route matched.
+    """
+    path = DOT_SEGMENT_ESCAPES.sub(
+        lambda match: {"%2e": ".", "%2f": "/", "%5c": "/"}[match[0].lower()],
+        raw_path,
+    )
+
+    return any(segment in (".", "..") for segment in re.split(r"[/\\]", path))
+
+
+def error(status: int, detail: str) -> web.Response:
+    return web.json_response({"detail": detail}, status=status)
+
+
+class Proxy:
+    """
+    Authenticates requests with a local token check, authorizes them against the
+    permission of the matching route and streams them to its upstream and back.
+    """
+
+    def __init__(
+        self,
+        routes: dict[str, Route],
+        authenticator: Authenticator,
+        session: aiohttp.ClientSession,
+        *,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        # Longest prefixes first, so the most specific route wins.
+        self.routes = sorted(routes.items(), key=lambda item: -len(item[0]))
+        self.authenticator = authenticator
+        self.session = session
+        self.chunk_size = chunk_size
+
+    def match(self, path: str) -> tuple[str, Route] | None:
+        for prefix, route in self.routes:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix, route
+
+        return None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        # Matched and forwarded still percent-encoded: decoding first would turn
+        # %2F and %3F into a path separator and a query the route was not
+        # matched against.
+        path = request.rel_url.raw_path
+
+        if has_dot_segment(path):
+            return error(400, "Dot segments are not allowed in the path.")
+
+        matched = self.match(path)
+
+        if matched is None:
+            return error(404, "No route for this path.")
+
+        prefix, route = matched
+
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+
+        if scheme.lower() != "bearer" or not token:
+            return error(401, "Bearer token required.")
+
+        try:
+            principal = await self.authenticator.authenticate(token)
+        except InvalidToken as exc:
+            return error(401, str(exc))
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return error(503, "Authorization service unavailable.")
+
+        if route.permission is not None and (
+            route.permission not in principal.permissions
+        ):
+            return error(403, "Permission denied.")
+
+        return await self.forward(
+            request, route, path[len(prefix) :], principal.user_id
+        )
+
+    async def forward(
+        self, request: web.Request, route: Route, path: str, user_id: str
+    ) -> web.StreamResponse:
+        """Forward a request to ``path`` of the route, ``path`` being encoded."""
+        headers = forwarded_headers(request.headers)
+        headers[USER_ID_HEADER] = user_id
+
+        url = str(URL(route.url)).rstrip("/") + "/" + path.lstrip("/")
+        query = request.rel_url.raw_query_string
+
+        if query:
+            url += "?" + query
+
+        try:
+            upstream = await self.session.request(
+                request.method,
+                URL(url, encoded=True),
+                headers=headers,
+                data=request.content if request.body_exists else None,
+                allow_redirects=False,
+            )
+        except asyncio.TimeoutError:
+            return error(504, "Upstream timed out.")
+        except aiohttp.ClientError:
+            return error(502, "Upstream unavailable.")
+
+        # Once the response is prepared its status is sent, so a failure while
+        # streaming the body can only abort the connection.
+        async with upstream:
+            response = web.StreamResponse(
+                status=upstream.status,
+                reason=upstream.reason,
+                headers=forwarded_headers(upstream.headers),
+            )
+            await response.prepare(request)
+
+            async for chunk in upstream.content.iter_chunked(self.chunk_size):
+                await response.write(chunk)
+
+            await response.write_eof()
+
+        return response
@@ -0,0 +1,91 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+class InvalidToken(Exception):
+    pass
+
+
+def b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def b64decode(data: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidToken("Malformed token.") from exc
+
+
+class TokenVerifier:
+    """
+    Signs and verifies HS256 JSON web tokens locally, so authenticating a request
+    needs no call to the authorization service.
+
+    :param leeway:
+        Seconds of clock skew tolerated when checking ``exp`` and ``nbf``.
+    """
+
+    header = b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+
+    def __init__(
+        self,
+        secret: str,
+        *,
+        leeway: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.key = secret.encode()
+        self.leeway = leeway
+        self.clock = clock
+
+    def sign(self, claims: dict[str, Any]) -> str:
+        payload = b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        signing_input = f"{self.header}.{payload}"
+
+        return f"{signing_input}.{self._signature(signing_input)}"
+
+    def verify(self, token: str) -> dict[str, Any]:
+        """Return the claims of a valid token, with ``sub`` always set."""
+        try:
+            header, payload, signature = token.split(".")
+        except ValueError as exc:
+            raise InvalidToken("Malformed token.") from exc
+
+        expected = self._signature(f"{header}.{payload}")
+
+        if not hmac.compare_digest(signature.encode(), expected.encode()):
+            raise InvalidToken("Invalid token signature.")
+
+        try:
+            algorithm = json.loads(b64decode(header)).get("alg")
+            claims = json.loads(b64decode(payload))
+        except (AttributeError, UnicodeDecodeError, ValueError) as exc:
+            raise InvalidToken("Malformed token.") from exc
+
+        if algorithm != "HS256" or not isinstance(claims, dict):
+            raise InvalidToken("Malformed token.")
+
+        if not isinstance(claims.get("sub"), str):
+            raise InvalidToken("Token has no subject.")
+
+        now = self.clock()
+
+        if "exp" in claims and now > claims["exp"] + self.leeway:
+            raise InvalidToken("Token has expired.")
+
+        if "nbf" in claims and now < claims["nbf"] - self.leeway:
+            raise InvalidToken("Token is not valid yet.")
+
+        return claims
+
+    def _signature(self, signing_input: str) -> str:
+        return b64encode(
+            hmac.new(self.key, signing_input.encode(), hashlib.sha256).digest()
+        )
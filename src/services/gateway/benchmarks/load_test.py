@@ -0,0 +1,108 @@
+"""
+Load test the gateway against a local stub upstream and authorization service,
+all in this process. Reports latency percentiles and requests/sec.
+
+    python -m benchmarks.load_test --requests 20000 --concurrency 64
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.config import GatewaySettings, Route
+from app.main import create_app
+from app.tokens import TokenVerifier
+
+
+def stub_upstream(body_size: int) -> web.Application:
+    body = b"x" * body_size
+
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+
+        return web.Response(body=body, content_type="application/octet-stream")
+
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", handle)
+
+    return app
+
+
+def stub_authorization() -> web.Application:
+    async def user_permissions(request: web.Request) -> web.Response:
+        return web.json_response({"permissions": ["api.read"]})
+
+    app = web.Application()
+    app.router.add_get("/users/{user_id}/permissions", user_permissions)
+
+    return app
+
+
+async def load(args: argparse.Namespace) -> None:
+    verifier = TokenVerifier("secret")
+    tokens = [verifier.sign({"sub": f"user-{index}"}) for index in range(args.users)]
+
+    async with TestServer(stub_upstream(args.body_size)) as upstream, TestServer(
+        stub_authorization()
+    ) as authorization:
+        settings = GatewaySettings(
+            token_secret="secret",
+            authorization_url=str(authorization.make_url("/")),
+            routes={
+                "/api": Route(url=str(upstream.make_url("/")), permission="api.read")
+            },
+        )
+
+        async with TestServer(create_app(settings)) as gateway, aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=args.concurrency)
+        ) as session:
+            url = str(gateway.make_url("/api/items"))
+            latencies: list[float] = []
+            errors = 0
+            remaining = iter(range(args.requests))
+
+            async def worker() -> None:
+                nonlocal errors
+
+                for index in remaining:
+                    headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+                    start = time.perf_counter()
+
+                    async with session.get(url, headers=headers) as response:
+                        await response.read()
+
+                    latencies.append(time.perf_counter() - start)
+                    errors += response.status != 200
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            seconds = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100)
+
+    print(
+        f"{len(latencies)} requests, {args.concurrency} concurrent, "
+        f"{args.body_size} byte bodies, {errors} errors"
+    )
+    print(f"p50 {percentiles[49] * 1e3:>8.2f} ms")
+    print(f"p99 {percentiles[98] * 1e3:>8.2f} ms")
+    print(f"{len(latencies) / seconds:>12.0f} requests/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--body-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    asyncio.run(load(args))
+
+
+if __name__ == "__main__":
+    main()
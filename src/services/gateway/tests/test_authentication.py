@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.authentication import Authenticator, Principal
+from app.cache import CacheStats
+from app.tokens import InvalidToken, TokenVerifier
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubAuthorization:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def permissions_for_user(self, user_id: str) -> frozenset[str]:
+        self.calls.append(user_id)
+        # Let the other requests of a burst arrive while this one is in flight.
+        await asyncio.sleep(0.01)
+
+        return frozenset({"api.read"})
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def authorization() -> StubAuthorization:
+    return StubAuthorization()
+
+
+@pytest.fixture
+def authenticator(clock: Clock, authorization: StubAuthorization) -> Authenticator:
+    return Authenticator(
+        TokenVerifier("secret", leeway=5, clock=clock),
+        authorization,  # type: ignore
+        ttl=30,
+        negative_ttl=10,
+        clock=clock,
+    )
+
+
+def test_single_flight(
+    authenticator: Authenticator, authorization: StubAuthorization
+) -> None:
+    token = authenticator.verifier.sign({"sub": "user"})
+
+    async def burst() -> list[Principal]:
+        return await asyncio.gather(
+            *(authenticator.authenticate(token) for _ in range(100))
+        )
+
+    principals = asyncio.run(burst())
+
+    assert set(principals) == {Principal("user", frozenset({"api.read"}))}
+    assert authorization.calls == ["user"]
+    assert authenticator.principals.stats == CacheStats(misses=100)
+
+    asyncio.run(authenticator.authenticate(token))
+
+    assert authorization.calls == ["user"]
+    assert authenticator.principals.stats.hits == 1
+
+
+def test_negative_cache(authenticator: Authenticator, clock: Clock) -> None:
+    token = authenticator.verifier.sign({"sub": "user", "exp": 900})
+
+    for _ in range(3):
+        with pytest.raises(InvalidToken, match="expired"):
+            asyncio.run(authenticator.authenticate(token))
+
+    assert authenticator.invalid.stats == CacheStats(hits=2, misses=1)
+
+    clock.now += 10
+
+    with pytest.raises(InvalidToken):
+        asyncio.run(authenticator.authenticate(token))
+
+    assert authenticator.invalid.stats.expirations == 1
+
+
+def test_ttl_bounded_by_expiry(
+    authenticator: Authenticator, authorization: StubAuthorization, clock: Clock
+) -> None:
+    token = authenticator.verifier.sign({"sub": "user", "exp": 1010})
+
+    asyncio.run(authenticator.authenticate(token))
+
+    # The principal expires with its token, before the ttl of the cache.
+    clock.now += 16
+
+    with pytest.raises(InvalidToken, match="expired"):
+        asyncio.run(authenticator.authenticate(token))
+
+    assert authorization.calls == ["user"]
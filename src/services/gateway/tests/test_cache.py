@@ -0,0 +1,68 @@
+import pytest
+
+from app.cache import CacheStats, TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.stats == CacheStats(hits=3, misses=1, evictions=1)
+
+
+def test_expiry() -> None:
+    clock = Clock()
+    cache: TTLCache[str, int] = TTLCache(ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    cache.set("c", 3, ttl=60)
+    cache.set("d", 4, ttl=0)
+
+    clock.now = 5
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("d") is None
+
+    clock.now = 10
+    # A longer ttl of an entry is capped by the ttl of the cache.
+    assert cache.get("c") is None
+    assert len(cache) == 1
+    assert cache.stats == CacheStats(hits=1, misses=3, expirations=2)
+
+
+def test_invalidate() -> None:
+    cache: TTLCache[str, int] = TTLCache()
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
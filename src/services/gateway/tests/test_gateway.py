@@ -1,5 +1,20 @@
+import pytest
+from pydantic import ValidationError
+
 from app import __version__
+from app.config import GatewaySettings
 
 
 def test_version() -> None:
     assert __version__ == "0.1.0"
+
+
+def test_token_secret_required(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GATEWAY_TOKEN_SECRET", raising=False)
+
+    with pytest.raises(ValidationError):
+        GatewaySettings()
+
+    monkeypatch.setenv("GATEWAY_TOKEN_SECRET", "secret")
+
+    assert GatewaySettings().token_secret == "secret"
@@ -0,0 +1,217 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from yarl import URL
+
+from app.config import GatewaySettings, Route
+from app.main import create_app
+from app.tokens import TokenVerifier
+
+
+BODY = b"x" * (1024 * 1024)
+
+Test = Callable[[TestClient, dict[str, int]], Awaitable[None]]
+
+
+def upstream_app() -> web.Application:
+    async def echo(request: web.Request) -> web.StreamResponse:
+        body = await request.read()
+
+        if request.path.endswith("/large"):
+            response = web.StreamResponse(headers={"X-Upstream": "stub"})
+            await response.prepare(request)
+
+            for start in range(0, len(BODY), 100_000):
+                await response.write(BODY[start : start + 100_000])
+
+            await response.write_eof()
+
+            return response
+
+        return web.json_response(
+            {
+                "method": request.method,
+                "path": request.path,
+                "raw_path": request.rel_url.raw_path,
+                "query": dict(request.query),
+                "user_id": request.headers.get("X-User-Id"),
+                "body": len(body),
+            },
+            status=201 if request.method == "POST" else 200,
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", echo)
+
+    return app
+
+
+def authorization_app(calls: dict[str, int]) -> web.Application:
+    permissions = {"admin": ["api.read"], "user": []}
+
+    async def user_permissions(request: web.Request) -> web.Response:
+        user_id = request.match_info["user_id"]
+        calls[user_id] = calls.get(user_id, 0) + 1
+
+        if user_id not in permissions:
+            raise web.HTTPNotFound()
+
+        return web.json_response({"permissions": permissions[user_id]})
+
+    app = web.Application()
+    app.router.add_get("/users/{user_id}/permissions", user_permissions)
+
+    return app
+
+
+async def raw_status(client: TestClient, path: str, headers: dict[str, str]) -> int:
+    reader, writer = await asyncio.open_connection(client.host, client.port)
+    lines = [f"GET {path} HTTP/1.1", f"Host: {client.host}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+
+    status = int((await reader.readline()).split()[1])
+    writer.close()
+
+    return status
+
+
+@pytest.fixture
+def verifier() -> TokenVerifier:
+    return TokenVerifier("secret")
+
+
+@pytest.fixture
+def run(verifier: TokenVerifier) -> Callable[[Test], None]:
+    def run(test: Test) -> None:
+        async def main() -> None:
+            calls: dict[str, int] = {}
+
+            async with TestServer(upstream_app()) as upstream, TestServer(
+                authorization_app(calls)
+            ) as authorization:
+                settings = GatewaySettings(
+                    token_secret="secret",
+                    authorization_url=str(authorization.make_url("/")),
+                    routes={
+                        "/api": Route(
+                            url=str(upstream.make_url("/v1")), permission="api.read"
+                        ),
+                        "/public": Route(url=str(upstream.make_url("/"))),
+                    },
+                )
+
+                async with TestClient(TestServer(create_app(settings))) as client:
+                    await test(client, calls)
+
+        asyncio.run(main())
+
+    return run
+
+
+def test_proxy(run: Callable[[Test], None], verifier: TokenVerifier) -> None:
+    headers = {"Authorization": f"Bearer {verifier.sign({'sub': 'admin'})}"}
+
+    async def test(client: TestClient, calls: dict[str, int]) -> None:
+        response = await client.post(
+            "/api/items?limit=10", data=b"payload", headers=headers
+        )
+
+        assert response.status == 201
+        assert await response.json() == {
+            "method": "POST",
+            "path": "/v1/items",
+            "raw_path": "/v1/items",
+            "query": {"limit": "10"},
+            "user_id": "admin",
+            "body": 7,
+        }
+
+        response = await client.get("/api/large", headers=headers)
+
+        assert response.headers["X-Upstream"] == "stub"
+        assert await response.read() == BODY
+        # Permissions were fetched once and reused for the second request.
+        assert calls == {"admin": 1}
+
+    run(test)
+
+
+def test_proxy_encoded_path(
+    run: Callable[[Test], None], verifier: TokenVerifier
+) -> None:
+    headers = {"Authorization": f"Bearer {verifier.sign({'sub': 'admin'})}"}
+
+    async def test(client: TestClient, calls: dict[str, int]) -> None:
+        response = await client.get(
+            URL("/api/a%3Fb?x=1", encoded=True), headers=headers
+        )
+        body = await response.json()
+
+        assert body["raw_path"] == "/v1/a%3Fb"
+        assert body["query"] == {"x": "1"}
+
+        response = await client.get(URL("/api/a%2Fb", encoded=True), headers=headers)
+        body = await response.json()
+
+        assert body["raw_path"] == "/v1/a%2Fb"
+        assert body["query"] == {}
+
+        # An encoded separator does not make a path match a route.
+        response = await client.get(URL("/api%2Fitems", encoded=True), headers=headers)
+
+        assert response.status == 404
+
+        # Dot segments, which an upstream could resolve into another route. Sent
+        # as written, as the client would resolve them itself.
+        for path in [
+            "/public/../api/items",
+            "/public/%2e%2e/api/items",
+            "/public/..%2fapi/items",
+        ]:
+            assert await raw_status(client, path, headers) == 400
+
+    run(test)
+
+
+def test_authentication(run: Callable[[Test], None], verifier: TokenVerifier) -> None:
+    async def test(client: TestClient, calls: dict[str, int]) -> None:
+        assert (await client.get("/public/items")).status == 401
+
+        response = await client.get(
+            "/public/items", headers={"Authorization": "Bearer invalid"}
+        )
+
+        assert response.status == 401
+
+        token = verifier.sign({"sub": "unknown"})
+        response = await client.get(
+            "/public/items", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status == 200
+        # The token is resolved to a principal once, whatever route it is used on.
+        assert calls == {"unknown": 1}
+
+    run(test)
+
+
+def test_authorization(run: Callable[[Test], None], verifier: TokenVerifier) -> None:
+    async def test(client: TestClient, calls: dict[str, int]) -> None:
+        for user_id in ("user", "unknown"):
+            token = verifier.sign({"sub": user_id})
+            response = await client.get(
+                "/api/items", headers={"Authorization": f"Bearer {token}"}
+            )
+
+            assert response.status == 403
+
+        headers = {"Authorization": f"Bearer {verifier.sign({'sub': 'admin'})}"}
+
+        assert (await client.get("/other", headers=headers)).status == 404
+        assert (await client.get("/apiary", headers=headers)).status == 404
+
+    run(test)
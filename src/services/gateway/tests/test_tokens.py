@@ -0,0 +1,51 @@
+import pytest
+
+from app.tokens import InvalidToken, TokenVerifier, b64encode
+
+
+@pytest.fixture
+def verifier() -> TokenVerifier:
+    return TokenVerifier("secret", leeway=5, clock=lambda: 1000.0)
+
+
+def test_verify(verifier: TokenVerifier) -> None:
+    token = verifier.sign({"sub": "user", "exp": 1100})
+
+    assert verifier.verify(token) == {"sub": "user", "exp": 1100}
+
+
+def test_verify_leeway(verifier: TokenVerifier) -> None:
+    assert verifier.verify(verifier.sign({"sub": "user", "exp": 996}))
+
+    with pytest.raises(InvalidToken, match="expired"):
+        verifier.verify(verifier.sign({"sub": "user", "exp": 990}))
+
+    with pytest.raises(InvalidToken, match="not valid yet"):
+        verifier.verify(verifier.sign({"sub": "user", "nbf": 1010}))
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "a.b",
+        "a.b.c",
+        TokenVerifier("other").sign({"sub": "user"}),
+    ],
+)
+def test_verify_invalid(verifier: TokenVerifier, token: str) -> None:
+    with pytest.raises(InvalidToken):
+        verifier.verify(token)
+
+
+def test_verify_tampered(verifier: TokenVerifier) -> None:
+    header, _, signature = verifier.sign({"sub": "user"}).split(".")
+    payload = b64encode(b'{"sub":"admin"}')
+
+    with pytest.raises(InvalidToken, match="signature"):
+        verifier.verify(f"{header}.{payload}.{signature}")
+
+
+def test_verify_no_subject(verifier: TokenVerifier) -> None:
+    with pytest.raises(InvalidToken, match="subject"):
+        verifier.verify(verifier.sign({"exp": 1100}))